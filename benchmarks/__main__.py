@@ -0,0 +1,88 @@
+# benchmarks/__main__.py
+
+import argparse
+import sys
+
+from benchmarks.suite import (
+    PLANNERS,
+    PRESETS,
+    build_cases,
+    compare,
+    environment,
+    load_results,
+    run_suite,
+    write_csv,
+    write_json,
+)
+
+
+# Kullanım:
+#   python -m benchmarks                          # quick önayarı, tablo çıktısı
+#   python -m benchmarks --preset full --json sonuc.json --csv sonuc.csv
+#   python -m benchmarks --planners ga --deliveries 100 1000 --ga 20x10 50x30
+#   python -m benchmarks --compare onceki.json    # gerileme varsa çıkış kodu 1
+
+
+def parse_ga(value):
+    pop_size, _, generations = value.lower().partition("x")
+    try:
+        return int(pop_size), int(generations)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"GA ayarı POPxGEN biçiminde olmalı: {value}") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Planlayıcı ölçeklenme benchmark'ları")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--planners", nargs="+", choices=PLANNERS, default=list(PLANNERS))
+    parser.add_argument("--deliveries", nargs="+", type=int)
+    parser.add_argument("--drones", nargs="+", type=int)
+    parser.add_argument("--zones", nargs="+", type=int)
+    parser.add_argument("--ga", nargs="+", type=parse_ga, metavar="POPxGEN")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="süre için tekrar sayısı (en küçüğü)")
+    parser.add_argument("--no-memory", action="store_true", help="tepe bellek ölçümünü atla")
+    parser.add_argument("--all-sizes", action="store_true",
+                        help="planlayıcı başına boyut sınırlarını uygulama")
+    parser.add_argument("--json", help="sonuçları JSON olarak yaz")
+    parser.add_argument("--csv", help="sonuçları CSV olarak yaz")
+    parser.add_argument("--compare", help="önceki JSON sonuçlarıyla karşılaştır")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="süre gerilemesi eşiği (0.2 → %%20)")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(
+        args.preset, args.planners, args.deliveries, args.drones, args.zones, args.ga,
+        seed=args.seed, all_sizes=args.all_sizes
+    )
+
+    print(f"{'durum':<34} {'süre (sn)':>10} {'bellek (MB)':>12} {'eval/sn':>12} "
+          f"{'tamam':>7} {'enerji':>12} {'ihlal':>7}")
+
+    def progress(row):
+        peak = f"{row['peak_mb']:.1f}" if row["peak_mb"] is not None else "-"
+        rate = f"{row['evals_per_s']:.0f}" if row["evals_per_s"] is not None else "-"
+        print(f"{row['case']:<34} {row['wall_s']:>10.3f} {peak:>12} {rate:>12} "
+              f"{row['completed']:>7} {row['energy']:>12.2f} {row['violations']:>7}", flush=True)
+
+    results = run_suite(cases, repeat=args.repeat, memory=not args.no_memory, progress=progress)
+
+    if args.json:
+        write_json(results, args.json, environment())
+    if args.csv:
+        write_csv(results, args.csv)
+
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} gerileme:")
+            for reg in regressions:
+                print(f"  {reg['case']:<34} {reg['metric']:<11} {reg['baseline']} → {reg['current']}")
+            return 1
+        print("\nGerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
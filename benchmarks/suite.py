@@ -0,0 +1,286 @@
+# benchmarks/suite.py
+
+import csv
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.astar import a_star
+from core.greedy import greedy_plan
+from core.matrices import ScenarioMatrices
+from core.nofly import NoFlyZoneIndex
+from data.bulk import bulk_scenario
+from ga.optimizer import genetic_algorithm
+
+
+# Planlayıcıların senaryo boyutlarıyla ölçeklenmesini ölçen benchmark takımı.
+# Her durum (case) sabit seed'li bir bulk_scenario üzerinde bir planlayıcıyı
+# çalıştırır ve duvar süresi, tepe bellek, saniyedeki değerlendirme ve çözüm
+# kalitesini (completed, energy, violations) kaydeder.
+#
+# "Değerlendirme" (evals) planlayıcıya göre:
+#   - astar    : A* sorgusu (drone başlangıcı → teslimat)
+#   - greedy   : greedy döngüsündeki A* yol sorgusu (önbellek isabetleri dahil)
+#   - ga       : gerçekten yapılan rota fitness değerlendirmesi (önbellek ıskaları;
+#                erken durma ve önbellek isabetleri sayılmaz)
+#   - ga_fleet : filo bireyi değerlendirmesi (pop_size × çalışan nesil)
+
+PLANNERS = ("astar", "greedy", "ga", "ga_fleet")
+
+PRESETS = {
+    "quick": {
+        "deliveries": [20, 100, 500],
+        "drones": [5],
+        "zones": [3],
+        "ga": [(20, 10)],
+    },
+    "full": {
+        "deliveries": [20, 100, 1000, 10000],
+        "drones": [5, 20],
+        "zones": [3, 10],
+        "ga": [(20, 10), (50, 30)],
+    },
+}
+
+# Bu boyutun üstünde planlayıcı atlanır (all_sizes=True ile kapatılır):
+# tam graf A*–Greedy ve filo GA'sı büyük senaryolarda dakikalar sürer.
+MAX_DELIVERIES = {"greedy": 2000, "ga_fleet": 2000}
+
+# Seyrek A* grafına geçilen teslimat sayısı (greedy) ve komşu sayısı
+SPARSE_FROM = 500
+SPARSE_K = 8
+
+ASTAR_QUERIES = 20
+
+
+def build_cases(preset="quick", planners=PLANNERS, deliveries=None, drones=None, zones=None,
+                ga=None, seed=0, all_sizes=False):
+    """Önayar + geçersiz kılmalardan durum listesi (dict) kurar."""
+    grid = dict(PRESETS[preset])
+    for key, value in (("deliveries", deliveries), ("drones", drones), ("zones", zones), ("ga", ga)):
+        if value:
+            grid[key] = value
+
+    cases = []
+    for planner in planners:
+        ga_grid = grid["ga"] if planner in ("ga", "ga_fleet") else [(None, None)]
+        for n, m, z, (pop_size, generations) in itertools.product(
+            grid["deliveries"], grid["drones"], grid["zones"], ga_grid
+        ):
+            if not all_sizes and n > MAX_DELIVERIES.get(planner, n):
+                continue
+            case = {
+                "planner": planner,
+                "deliveries": n,
+                "drones": m,
+                "zones": z,
+                "pop_size": pop_size,
+                "generations": generations,
+                "seed": seed,
+            }
+            case["case"] = case_name(case)
+            cases.append(case)
+    return cases
+
+
+def case_name(case):
+    name = f"{case['planner']}/n{case['deliveries']}/d{case['drones']}/z{case['zones']}"
+    if case["pop_size"] is not None:
+        name += f"/p{case['pop_size']}g{case['generations']}"
+    return name
+
+
+def make_scenario(case):
+    """Duruma ait seed'li senaryo: (Scenario, NoFlyZoneIndex, ScenarioMatrices)."""
+    scenario = bulk_scenario(case["drones"], case["deliveries"], case["zones"], seed=case["seed"])
+    zone_index = NoFlyZoneIndex(scenario.no_fly_zones)
+    matrices = ScenarioMatrices.from_scenario(scenario.deliveries, scenario.drones)
+    return scenario, zone_index, matrices
+
+
+# 1. Planlayıcı çalıştırıcıları: (evals, completed, energy, violations)
+
+
+def _run_astar(case, scenario, zone_index, matrices):
+    deliveries, drones = scenario.deliveries, scenario.drones
+    rng = random.Random(case["seed"])
+    found = violations = 0
+    length = 0.0
+    for _ in range(ASTAR_QUERIES):
+        drone = drones[rng.randrange(len(drones))]
+        goal = deliveries[rng.randrange(len(deliveries))]
+        path = a_star(
+            drone["start_pos"], goal["pos"], deliveries, zone_index,
+            drone["max_weight"], drone["speed"], matrices
+        )
+        if path:
+            found += 1
+            for p, q in zip(path, path[1:]):
+                length += matrices.point_distance(p, q)
+                violations += bool(zone_index.segment_hits(p, q))
+    return ASTAR_QUERIES, found, length, violations
+
+
+def _run_greedy(case, scenario, zone_index, matrices):
+    astar_k = SPARSE_K if case["deliveries"] >= SPARSE_FROM else None
+    _, summary = greedy_plan(
+        scenario.deliveries, scenario.drones, zone_index, matrices=matrices, astar_k=astar_k
+    )
+    cache = summary["path_cache"]
+    return (cache["hits"] + cache["misses"], summary["total_completed"],
+            summary["total_energy"], summary["total_violations"])
+
+
+def _run_ga(case, scenario, zone_index, matrices, mode="per_drone"):
+    drone_results, summary = genetic_algorithm(
+        scenario.deliveries, scenario.drones, zone_index,
+        pop_size=case["pop_size"], generations=case["generations"], seed=case["seed"],
+        vectorized=mode == "per_drone",
+        mode=mode, matrices=matrices
+    )
+    # Gerçekten yapılan değerlendirmeler: erken durma ve fitness önbelleği
+    # isabetleri nominal pop_size × generations sayısından düşülür
+    if mode == "per_drone":
+        evals = sum(r["fitness_cache"]["misses"] for r in drone_results)
+    else:
+        generations = drone_results[0]["generations"] if drone_results else 0
+        evals = case["pop_size"] * generations
+    return (evals, summary["total_completed"], summary["total_energy"],
+            summary["total_violations"])
+
+
+RUNNERS = {
+    "astar": _run_astar,
+    "greedy": _run_greedy,
+    "ga": _run_ga,
+    "ga_fleet": lambda *args: _run_ga(*args, mode="fleet"),
+}
+
+
+def run_case(case, repeat=1, memory=True):
+    """
+    Durumu çalıştırır ve sonuç satırını döner. Süre `repeat` tekrarın en
+    küçüğüdür; her tekrar taze bir senaryo (zone indeksi, matrisler) ile
+    çalışır ki önbellekleri önceki tekrarda dolmuş ölçümler olmasın. Tepe
+    bellek (tracemalloc, MB) ayrı bir geçişte ölçülür ki izleme yükü süreye
+    karışmasın. Senaryo kurulumu ölçüme dahil değildir.
+    """
+    runner = RUNNERS[case["planner"]]
+
+    wall = float("inf")
+    for _ in range(max(1, repeat)):
+        scenario, zone_index, matrices = make_scenario(case)
+        t0 = time.perf_counter()
+        evals, completed, energy, violations = runner(case, scenario, zone_index, matrices)
+        wall = min(wall, time.perf_counter() - t0)
+
+    peak_mb = None
+    if memory:
+        # Önbellekli yapılar ilk geçişte dolduğu için taze senaryo kurulur
+        scenario, zone_index, matrices = make_scenario(case)
+        tracemalloc.start()
+        try:
+            runner(case, scenario, zone_index, matrices)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    row = dict(case)
+    row.update(
+        wall_s=wall,
+        peak_mb=peak_mb,
+        evals=evals,
+        evals_per_s=evals / wall if wall > 0 else None,
+        completed=completed,
+        energy=energy,
+        violations=violations,
+    )
+    return row
+
+
+def run_suite(cases, repeat=1, memory=True, progress=None):
+    """Tüm durumları sırayla çalıştırır; progress(row) her durumdan sonra çağrılır."""
+    results = []
+    for case in cases:
+        row = run_case(case, repeat=repeat, memory=memory)
+        results.append(row)
+        if progress is not None:
+            progress(row)
+    return results
+
+
+# 2. Çıktı ve karşılaştırma
+
+
+FIELDS = ("case", "planner", "deliveries", "drones", "zones", "pop_size", "generations", "seed",
+          "wall_s", "peak_mb", "evals", "evals_per_s", "completed", "energy", "violations")
+
+
+def environment():
+    """Sonuçları sürümler arası karşılaştırmak için çalışma ortamı bilgisi."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_json(results, path, meta=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta or environment(), "results": results}, f, indent=2)
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def load_results(path):
+    """write_json çıktısının sonuç satırları."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline, results, tolerance=0.2):
+    """
+    İki sonuç kümesini durum adına göre karşılaştırır. Dönen liste yalnızca
+    gerilemeleri içerir:
+      - duvar süresi baseline'ın (1 + tolerance) katını aşan durumlar,
+      - completed / violations değeri değişen ya da enerjisi farklı durumlar
+        (seed'li senaryolarda kalite değişmemelidir).
+    """
+    base = {row["case"]: row for row in baseline}
+    regressions = []
+    for row in results:
+        old = base.get(row["case"])
+        if old is None:
+            continue
+        if row["wall_s"] > old["wall_s"] * (1 + tolerance):
+            regressions.append({
+                "case": row["case"], "metric": "wall_s",
+                "baseline": old["wall_s"], "current": row["wall_s"],
+            })
+        for metric in ("completed", "violations", "energy"):
+            if not np.isclose(row[metric], old[metric], rtol=1e-9, atol=1e-9):
+                regressions.append({
+                    "case": row["case"], "metric": metric,
+                    "baseline": old[metric], "current": row[metric],
+                })
+    return regressions
@@ -1,10 +1,12 @@
 # core/astar.py
 
-from shapely.geometry import Polygon, LineString
 import heapq
-from math import dist
 
-def heuristic(p1, p2, no_fly_zones, current_time, drone_speed):
+from core.matrices import euclidean
+from core.nofly import as_zone_index
+from data.scenario import delivery_rows
+
+def heuristic(p1, p2, no_fly_zones, current_time, drone_speed, matrices=None):
     """
     A* tahmin fonksiyonu: 
       - base_distance = euclidean distance(p1, p2)
@@ -13,32 +15,30 @@ def heuristic(p1, p2, no_fly_zones, current_time, drone_speed):
 
     Parametreler:
       p1, p2         : (x, y) tuple
-      no_fly_zones   : [{"id", "coordinates":[(x1,y1),...], "active_time":(s,e)}, ...]
+      no_fly_zones   : NoFlyZoneIndex ya da ham zone listesi
+                       [{"id", "coordinates":[(x1,y1),...], "active_time":(s,e)}, ...]
       current_time   : mevcut düğüme ulaşılmış saatinci dakika (float)
       drone_speed    : m/s cinsinden hız (float)
+      matrices       : (opsiyonel) ScenarioMatrices; mesafe matristen okunur
     """
-    base_distance = dist(p1, p2)
-    penalty = 0
-
-    # Tij: p1→p2 arasındaki geometrik çizgi
-    path_line = LineString([p1, p2])
+    zone_index = as_zone_index(no_fly_zones)
+    if matrices is not None:
+        base_distance = matrices.point_distance(p1, p2)
+    else:
+        base_distance = euclidean(p1, p2)
 
     # Bu segmenti kat etmek için geçen tahmini zaman (dakika cinsinden)
     travel_time = base_distance / drone_speed / 60.0
     est_time = current_time + travel_time
 
-    for zone in no_fly_zones:
-        sz, ez = zone["active_time"]
-        # Sadece 'est_time' zone aktifse kesişimi kontrol et
-        if sz <= est_time <= ez:
-            poly = Polygon(zone["coordinates"])
-            if path_line.intersects(poly):
-                penalty += 1000
+    # Sadece 'est_time' anında aktif olup p1→p2 segmentini kesen her zone için ceza
+    penalty = 1000 * zone_index.violation_count(p1, p2, est_time)
 
     return base_distance + penalty
 
 
-def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_speed):
+def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_speed,
+           matrices=None, graph=None, start_time=0.0):
     """
     Dinamik no-fly zone’u (aktiflik zamanına göre) dikkate alan A*.
 
@@ -46,24 +46,39 @@ def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_spee
       start_pos      : (x, y) drone başlangıç koordinatı
       goal_pos       : (x, y) hedef teslimat noktası
       deliveries     : [ {"id", "pos":(x,y), "weight", "priority", "time_window"}, ... ]
-      no_fly_zones   : [ {"id", "coordinates":[(x1,y1),...], "active_time":(s,e)}, ... ]
+      no_fly_zones   : NoFlyZoneIndex ya da ham zone listesi
+                       [ {"id", "coordinates":[(x1,y1),...], "active_time":(s,e)}, ... ]
       max_weight     : drone’un taşıyabileceği maksimum ağırlık (float)
       drone_speed    : m/s cinsinden drone hızı (float)
+      matrices       : (opsiyonel) ScenarioMatrices; kenar mesafeleri her düğüm
+                       açılışında matristen tek satır olarak okunur
+      graph          : (opsiyonel) build_graph(k=...) ile kurulan SparseGraph;
+                       verilirse komşular tüm teslimatlar yerine graf kenarları
+                       (+ hedefe doğrudan kenar) olur, açılış maliyeti ~k
+      start_time     : kalkış anı (dakika); dinamik zone aktifliği buna göre
+                       değerlendirilir (varsayılan 0.0)
 
     Dönen veri:
       Eğer hedefe ulaşılabiliyorsa, [(x1,y1), (x2,y2), …] şeklinde döner; 
       aksi hâlde [] döner.
     """
 
+    # Geometri indeksi arama başına bir kez kurulur (zaten indeksse aynen kullanılır)
+    no_fly_zones = as_zone_index(no_fly_zones)
+
+    # Kapasiteye uyan teslimatlar (id, pos, weight, priority) olarak arama başına
+    # bir kez alınır (DeliveryTable'da kapasite sınıfı başına hazır)
+    candidates = delivery_rows(deliveries, max_weight) if graph is None else None
+
     # Frontier: (f_score, current_pos, current_time)
     frontier = []
-    # İlk düğümün g_cost = 0, current_time = 0
-    initial_h = heuristic(start_pos, goal_pos, no_fly_zones, 0.0, drone_speed)
-    heapq.heappush(frontier, (initial_h, start_pos, 0.0))
+    # İlk düğümün g_cost = 0, current_time = start_time
+    initial_h = heuristic(start_pos, goal_pos, no_fly_zones, start_time, drone_speed, matrices)
+    heapq.heappush(frontier, (initial_h, start_pos, start_time))
 
     came_from = { start_pos: None }
     cost_so_far = { start_pos: 0.0 }      # g_cost
-    time_so_far = { start_pos: 0.0 }      # gelebilme zamanı (dakika)
+    time_so_far = { start_pos: start_time }   # gelebilme zamanı (dakika)
 
     while frontier:
         current_f, current_pos, current_time = heapq.heappop(frontier)
@@ -72,18 +87,29 @@ def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_spee
         if current_pos == goal_pos:
             break
 
-        # Tüm teslimat noktalarına (komşulara) bak
-        for d in deliveries:
-            next_pos = d["pos"]
-            weight = d["weight"]
-            priority_level = d["priority"]
+        # Mevcut düğümden tüm teslimatlara mesafe satırı (matris varsa)
+        if matrices is not None:
+            row = matrices.row(current_pos)
+
+        # Komşular: seyrek graf varsa onun kenarları, yoksa kapasiteye uyan tüm teslimatlar
+        if graph is not None:
+            neighbours = [
+                (d["id"], d["pos"], d["weight"], d["priority"])
+                for d in graph.neighbours(current_pos, goal_pos)
+            ]
+        else:
+            neighbours = candidates
 
+        for did, next_pos, weight, priority_level in neighbours:
             # Drone kapasitesini aşanları ele
             if weight > max_weight:
                 continue
 
             # Mevcut konumdan bir sonraki pozisyona
-            d_euclid = dist(current_pos, next_pos)
+            if matrices is not None:
+                d_euclid = row.item(matrices.index_of[did])
+            else:
+                d_euclid = euclidean(current_pos, next_pos)
             # Kenar maliyeti (g_increment): distance*weight + priority*100
             g_increment = d_euclid * weight + (priority_level * 100)
 
@@ -92,16 +118,10 @@ def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_spee
             new_time = current_time + travel_time
 
             # No-fly segment cezası (küçük bir ek cezayı g(n) tarafına ekleyelim)
+            # (bu segmenti katettiğimiz anda aktif bir zone'u kesiyorsa tek sefer)
             edge_penalty = 0
-            path_line = LineString([current_pos, next_pos])
-            for zone in no_fly_zones:
-                sz, ez = zone["active_time"]
-                # Eğer bu segmenti katettiğimiz anda zone aktifse
-                if sz <= new_time <= ez:
-                    poly = Polygon(zone["coordinates"])
-                    if path_line.intersects(poly):
-                        edge_penalty += 500
-                        break
+            if no_fly_zones.violation_count(current_pos, next_pos, new_time):
+                edge_penalty = 500
 
             new_cost = cost_so_far[current_pos] + g_increment + edge_penalty
 
@@ -111,7 +131,7 @@ def a_star(start_pos, goal_pos, deliveries, no_fly_zones, max_weight, drone_spee
                 time_so_far[next_pos] = new_time
 
                 # Heuristic: kalan mesafe + dinamik no-fly cezası
-                h = heuristic(next_pos, goal_pos, no_fly_zones, new_time, drone_speed)
+                h = heuristic(next_pos, goal_pos, no_fly_zones, new_time, drone_speed, matrices)
                 priority = new_cost + h
                 heapq.heappush(frontier, (priority, next_pos, new_time))
 
@@ -0,0 +1,44 @@
+# core/cost.py
+
+# GA (calculate_energy_and_violations) ve A*–Greedy planlayıcısının ortak
+# maliyet / kısıt çekirdeği: iki algoritma aynı değerlendirme koduyla ölçülür.
+
+RECHARGE_MINUTES = 15.0  # batarya yetmediğinde eklenen şarj molası (dakika)
+
+
+def delivery_step(current_pos, next_pos, weight, time_window, segment_distance,
+                  remaining_battery, current_time, battery, speed, zone_index):
+    """
+    Drone'un current_pos → next_pos segmentini uçup teslimatı yapmasını
+    simüle eder:
+      - enerji ihtiyacı = segment_distance × weight; batarya yetmezse
+        RECHARGE_MINUTES şarj molası eklenir ve batarya (kapasite: battery) dolar,
+      - geçiş süresi = segment_distance / speed (dakikaya çevrilmiş),
+      - varışta (new_time) aktif olup segmenti kesen her no-fly zone bir ihlal,
+      - time_window dışında varış bir ihlal, içinde varış bir tamamlanan teslimat.
+
+    Argümanlar skalerdir; çağıran taraf teslimat/drone alanlarını (dict ya da
+    dizi tabanlı senaryodan) döngü dışında bir kez okur.
+
+    Geri döner: (energy_needed, remaining_battery, new_time, violations, completed)
+    completed 0 ya da 1'dir.
+    """
+    energy_needed = segment_distance * weight
+
+    if energy_needed > remaining_battery:
+        current_time += RECHARGE_MINUTES
+        remaining_battery = battery
+    remaining_battery -= energy_needed
+
+    new_time = current_time + (segment_distance / speed) / 60.0
+
+    violations = zone_index.violation_count(current_pos, next_pos, new_time)
+
+    tw_start, tw_end = time_window
+    if not (tw_start <= new_time <= tw_end):
+        violations += 1
+        completed = 0
+    else:
+        completed = 1
+
+    return energy_needed, remaining_battery, new_time, violations, completed
@@ -1,11 +1,12 @@
 # core/csp_constraints.py
 
-from shapely.geometry import Polygon, LineString
+from core.nofly import as_zone_index
+from data.scenario import delivery_lookup
 
 def drone_capacity_check(route, deliveries, drone):
 
-    # Kolay arama için ID→teslimat objesi map’i oluştur
-    delivery_dict = { d["id"]: d for d in deliveries }
+    # Kolay arama için ID→teslimat objesi map’i (DeliveryTable'da hazır)
+    delivery_dict = delivery_lookup(deliveries)
 
     for did in route:
         d = delivery_dict.get(did)
@@ -20,7 +21,8 @@ def drone_capacity_check(route, deliveries, drone):
 
 def no_fly_violation(route, deliveries, drone, no_fly_zones):
 
-    delivery_dict = { d["id"]: d for d in deliveries }
+    delivery_dict = delivery_lookup(deliveries)
+    zone_index = as_zone_index(no_fly_zones)
 
     # İlk segment: “drone start_pos” → route[0] teslimat noktası pos’u
     current_pos = drone["start_pos"]
@@ -31,12 +33,9 @@ def no_fly_violation(route, deliveries, drone, no_fly_zones):
             return False
 
         next_pos = d["pos"]
-        # Eğer çizgi no-fly poligonu kesiyorsa ihlal var
-        line = LineString([current_pos, next_pos])
-        for zone in no_fly_zones:
-            polygon = Polygon(zone["coordinates"])
-            if line.intersects(polygon):
-                return False
+        # Eğer çizgi no-fly poligonu kesiyorsa ihlal var (aktiflik zamanından bağımsız)
+        if zone_index.segment_hits(current_pos, next_pos):
+            return False
 
         current_pos = next_pos
 
@@ -1,8 +1,59 @@
 # core/graph.py
 
-import math
+from core.matrices import euclidean
+from core.nofly import as_zone_index
+from core.spatial import GridIndex
 
-def build_graph(deliveries):
+
+class SparseGraph(dict):
+    """
+    build_graph(k=...) çıktısı. Sözlük kısmı tam graf ile aynı formattadır
+    ({id: [(id2, mesafe), ...]}); ek olarak A*'ın komşu kaynağı olarak
+    kullanabilmesi için şunları taşır:
+      - by_id     : {id: teslimat dict}
+      - id_at_pos : {(x, y): id}
+      - grid      : teslimat konumları üzerinde GridIndex (graf dışı başlangıç
+                    noktaları için k-en-yakın sorgusu)
+      - k         : komşu sayısı
+    """
+
+    def __init__(self, nodes, k):
+        super().__init__((d["id"], []) for d in nodes)
+        self.nodes = list(nodes)
+        self.k = k
+        self.by_id = {d["id"]: d for d in self.nodes}
+        self.id_at_pos = {}
+        for d in self.nodes:
+            self.id_at_pos.setdefault(tuple(d["pos"]), d["id"])
+        self.grid = GridIndex(d["pos"] for d in self.nodes)
+
+    def add_edge(self, id_a, id_b, d_ab):
+        """Yönsüz kenar ekler (zaten varsa tekrar eklemez)."""
+        if id_a == id_b or any(nid == id_b for nid, _ in self[id_a]):
+            return
+        self[id_a].append((id_b, d_ab))
+        self[id_b].append((id_a, d_ab))
+
+    def neighbours(self, pos, goal_pos=None):
+        """
+        pos konumundan açılacak komşu teslimatlar (dict listesi). pos bir graf
+        düğümü ise kenarları, değilse k en yakın teslimat kullanılır. goal_pos
+        verilirse hedef teslimat (tam graftaki doğrudan kenar gibi) her zaman eklenir.
+        """
+        node = self.id_at_pos.get(tuple(pos))
+        if node is not None:
+            ids = [nid for nid, _ in self[node]]
+        else:
+            ids = [self.nodes[j]["id"] for _, j in self.grid.nearest(pos, self.k)]
+        if goal_pos is not None:
+            goal = self.id_at_pos.get(tuple(goal_pos))
+            if goal is not None and goal != node and goal not in ids:
+                ids.append(goal)
+        return [self.by_id[nid] for nid in ids]
+
+
+def build_graph(deliveries, matrices=None, k=None, max_weight=None, no_fly_zones=None,
+                corner_k=4):
     """
     deliveries: list of dict, her dict:
       {
@@ -20,12 +71,19 @@ def build_graph(deliveries):
         …
       }
     Böylece “adjacency list (komşuluk listesi)” elde edilmiş oluyor.
-    """
 
-    def euclidean(a, b):
-        dx = a[0] - b[0]
-        dy = a[1] - b[1]
-        return math.hypot(dx, dy)
+    matrices (core.matrices.ScenarioMatrices) verilirse mesafeler yeniden
+    hesaplanmaz, matristen okunur.
+
+    Seyrek mod (k verilirse): tam O(n²) graf yerine SparseGraph döner:
+      - her teslimat ızgara indeksiyle bulunan k en yakın teslimata bağlanır,
+      - max_weight verilirse bu ağırlığı aşan teslimatlar grafa alınmaz,
+      - no_fly_zones verilirse her zone köşesinin corner_k en yakın teslimatı
+        arasında, hiçbir zone'u kesmeyen (görünür) kenarlar eklenir; böylece
+        zone çevresinden dolaşan geçişler de grafta bulunur.
+    """
+    if k is not None:
+        return _build_sparse_graph(deliveries, matrices, k, max_weight, no_fly_zones, corner_k)
 
     # Başlangıçta her ID için boş liste oluştur
     graph = { d["id"]: [] for d in deliveries }
@@ -39,9 +97,41 @@ def build_graph(deliveries):
             id_j = deliveries[j]["id"]
             pos_j = deliveries[j]["pos"]
 
-            d_ij = euclidean(pos_i, pos_j)
+            if matrices is not None:
+                d_ij = matrices.distance.item(matrices.index_of[id_i], matrices.index_of[id_j])
+            else:
+                d_ij = euclidean(pos_i, pos_j)
             # İki yönlü ekle
             graph[id_i].append((id_j, d_ij))
             graph[id_j].append((id_i, d_ij))
 
     return graph
+
+
+def _build_sparse_graph(deliveries, matrices, k, max_weight, no_fly_zones, corner_k):
+    nodes = [d for d in deliveries if max_weight is None or d["weight"] <= max_weight]
+    graph = SparseGraph(nodes, k)
+
+    def edge_length(a, b):
+        if matrices is not None:
+            return matrices.distance.item(matrices.index_of[a["id"]], matrices.index_of[b["id"]])
+        return euclidean(a["pos"], b["pos"])
+
+    # k en yakın komşu kenarları (kendisi dahil k+1 sorgulanır)
+    for i, d in enumerate(nodes):
+        for _, j in graph.grid.nearest(d["pos"], k + 1):
+            if j != i:
+                graph.add_edge(d["id"], nodes[j]["id"], edge_length(d, nodes[j]))
+
+    # Zone köşeleri çevresindeki görünürlük kenarları
+    if no_fly_zones is not None:
+        zone_index = as_zone_index(no_fly_zones)
+        for zone in zone_index:
+            for corner in zone["coordinates"]:
+                near = [nodes[j] for _, j in graph.grid.nearest(corner, corner_k)]
+                for a_i, a in enumerate(near):
+                    for b in near[a_i + 1:]:
+                        if not zone_index.segment_hits(a["pos"], b["pos"]):
+                            graph.add_edge(a["id"], b["id"], edge_length(a, b))
+
+    return graph
@@ -0,0 +1,190 @@
+# core/greedy.py
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.astar import a_star
+from core.cost import delivery_step
+from core.graph import build_graph
+from core.matrices import ScenarioMatrices
+from core.nofly import as_zone_index
+from core.path_cache import PathCache
+from core.spatial import GridIndex
+
+
+# A*–Greedy temel planlayıcısı: her drone, başlangıcından itibaren kapasitesine
+# uyan en yakın teslimata A* ile gider; maliyet ve kısıtlar GA ile aynı
+# çekirdekten (core.cost.delivery_step) hesaplanır.
+
+
+def plan_drone(drone, deliveries, no_fly_zones, matrices, graph=None, path_cache=None):
+    """
+    Tek bir drone için “en yakın teslimat” greedy rotası.
+
+    Geri döner:
+      {"drone_id", "route_ids", "energy", "violations", "completed", "time"}
+
+    graph verilirse A* komşuları bu graftan (ör. seyrek kNN grafı) alınır;
+    path_cache (PathCache) verilirse tekrarlanan A* sorguları önbellekten gelir.
+    """
+    zone_index = as_zone_index(no_fly_zones)
+    max_w = drone["max_weight"]
+    speed = drone["speed"]
+    current_pos = drone["start_pos"]
+    current_time = 0.0             # dakika cinsinden
+    battery = drone["battery"]
+    remaining_battery = battery
+    route_taken = []
+    total_energy = 0.0
+    violations = 0
+    completed = 0
+
+    def find_path(start, goal, depart_time):
+        compute = lambda: a_star(
+            start, goal, deliveries, zone_index, max_w, speed, matrices, graph,
+            start_time=depart_time
+        )
+        if path_cache is None:
+            return compute()
+        return path_cache.get_path(zone_index, start, goal, max_w, speed, depart_time, compute)
+
+    t0 = time.time()
+    # Ağırlık kapasitesini aşmayan teslimatlar bir kez süzülüp ızgara indeksine
+    # konur; planlanan ya da ulaşılamayan teslimat indeksten silinir
+    candidates = [d for d in deliveries if d["weight"] <= max_w]
+    candidate_index = GridIndex([d["pos"] for d in candidates])
+
+    while True:
+        # Mevcut konumdan en yakın teslimat (eşit mesafede liste sırası önce gelen)
+        hit = candidate_index.nearest(current_pos, 1)
+        if not hit:
+            break
+        nearest_idx = hit[0][1]
+        nearest = candidates[nearest_idx]
+
+        # A* hedefe hiç ulaşamıyorsa bu teslimat atlanır
+        if not find_path(current_pos, nearest["pos"], current_time):
+            candidate_index.remove(nearest_idx)
+            continue
+
+        # Mesafe yalnızca son segment için (matrisin mevcut konum satırından)
+        dist_to = matrices.row(current_pos).item(matrices.index_of[nearest["id"]])
+        energy_needed, remaining_battery, current_time, seg_violations, seg_completed = delivery_step(
+            current_pos, nearest["pos"], nearest["weight"], nearest["time_window"], dist_to,
+            remaining_battery, current_time, battery, speed, zone_index
+        )
+        total_energy += energy_needed
+        violations += seg_violations
+        completed += seg_completed
+
+        route_taken.append(nearest["id"])
+        candidate_index.remove(nearest_idx)
+        current_pos = nearest["pos"]
+
+    return {
+        "drone_id": drone["id"],
+        "route_ids": route_taken,
+        "energy": total_energy,
+        "violations": violations,
+        "completed": completed,
+        "time": time.time() - t0
+    }
+
+
+# Paralel çalıştırma: senaryo verisi worker başına bir kez (initializer ile)
+# gönderilir; seyrek graflar ve yol önbelleği worker içinde yaşar.
+_worker_scenario = {}
+
+# Görev başına toplanan yol önbelleği sayaçları
+_CACHE_COUNTERS = ("hits", "misses", "evictions")
+
+
+def _init_worker(deliveries, no_fly_zones, matrices, astar_k, path_cache_size, path_cache_bucket):
+    _worker_scenario.update(
+        deliveries=deliveries,
+        no_fly_zones=as_zone_index(no_fly_zones),
+        matrices=matrices,
+        astar_k=astar_k,
+        graphs={},
+        path_cache=PathCache(maxsize=path_cache_size, time_bucket=path_cache_bucket),
+    )
+
+
+def _scenario_graph(sc, max_weight):
+    """Aynı max_weight sınıfındaki droneler seyrek A* grafını paylaşır."""
+    if sc["astar_k"] is None:
+        return None
+    graph = sc["graphs"].get(max_weight)
+    if graph is None:
+        graph = build_graph(
+            sc["deliveries"], sc["matrices"], k=sc["astar_k"], max_weight=max_weight,
+            no_fly_zones=sc["no_fly_zones"]
+        )
+        sc["graphs"][max_weight] = graph
+    return graph
+
+
+def _plan_drone_task(drone):
+    """Worker tarafı: drone sonucunu ve bu görevdeki önbellek sayaç artışlarını döner."""
+    sc = _worker_scenario
+    cache = sc["path_cache"]
+    before = cache.stats()
+    result = plan_drone(
+        drone, sc["deliveries"], sc["no_fly_zones"], sc["matrices"],
+        _scenario_graph(sc, drone["max_weight"]), cache
+    )
+    after = cache.stats()
+    return result, {key: after[key] - before[key] for key in _CACHE_COUNTERS}
+
+
+def greedy_plan(deliveries, drones, no_fly_zones, matrices=None, astar_k=None,
+                path_cache_size=1024, path_cache_bucket=5.0, workers=None):
+    """
+    Tüm droneler için A*–Greedy planı.
+
+    Parametreler:
+      - matrices   : ScenarioMatrices (verilmezse kurulur)
+      - astar_k    : None → A* tam graf; sayı → k-en-yakın komşulu seyrek graf
+      - path_cache_size, path_cache_bucket : LRU yol önbelleği ayarları
+      - workers    : None/1 → sıralı; >1 → droneler bir ProcessPoolExecutor
+                     üzerinde paralel planlanır (her worker kendi önbelleğini tutar)
+
+    Geri döner: (results, summary)
+      - results : drone başına plan_drone sözlükleri (drones sırasıyla)
+      - summary : total_completed, total_energy, total_violations, total_time
+                  ve "path_cache" altında önbellek istatistikleri
+                  (hits, misses, evictions, hit_rate; tüm worker'ların toplamı)
+    """
+    no_fly_zones = as_zone_index(no_fly_zones)
+    if matrices is None:
+        matrices = ScenarioMatrices.from_scenario(deliveries, drones)
+
+    start_time_all = time.time()
+    initargs = (deliveries, no_fly_zones, matrices, astar_k, path_cache_size, path_cache_bucket)
+    if workers is not None and workers > 1 and len(drones) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+        try:
+            outcomes = list(pool.map(_plan_drone_task, drones))
+        finally:
+            pool.shutdown()
+    else:
+        _init_worker(*initargs)
+        try:
+            outcomes = [_plan_drone_task(drone) for drone in drones]
+        finally:
+            _worker_scenario.clear()
+    results = [result for result, _ in outcomes]
+
+    cache_stats = {key: sum(counts[key] for _, counts in outcomes) for key in _CACHE_COUNTERS}
+    lookups = cache_stats["hits"] + cache_stats["misses"]
+    cache_stats["hit_rate"] = cache_stats["hits"] / lookups if lookups else 0.0
+    elapsed_all = time.time() - start_time_all
+
+    summary = {
+        "total_completed": sum(r["completed"] for r in results),
+        "total_energy": sum(r["energy"] for r in results),
+        "total_violations": sum(r["violations"] for r in results),
+        "total_time": elapsed_all,
+        "path_cache": cache_stats
+    }
+    return results, summary
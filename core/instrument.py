@@ -0,0 +1,288 @@
+# core/instrument.py
+
+import cProfile
+import functools
+import importlib
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import ModuleType, SimpleNamespace
+
+
+# Sıcak yol ölçümü: sayaç + süre ölçerler.
+#
+# Kapalıyken sıfır maliyetlidir: hiçbir fonksiyon sarılmaz, kod yolları
+# değişmez. enable() hedef fonksiyonları (tüm modüllerdeki `from x import f`
+# kopyaları dahil) sayan ve süre ölçen sarmalayıcılarla değiştirir; disable()
+# orijinalleri geri koyar. Süreler kapsayıcıdır (a_star, içindeki heuristic
+# sürelerini de içerir) ve sarmalayıcı yükünü içerir. Yalnızca ana süreçteki
+# çağrılar sayılır (workers > 1 ile worker süreçleri ölçülmez).
+
+TARGETS = {
+    "a_star": ("core.astar", "a_star"),
+    "heuristic": ("core.astar", "heuristic"),
+    "a_star.heap": ("core.astar", "heapq"),
+    "zone_check": ("core.nofly", "NoFlyZoneIndex.violation_count"),
+    "geometry": ("core.nofly", "NoFlyZoneIndex._compute_mask"),
+    "delivery_step": ("core.cost", "delivery_step"),
+    "fitness_function": ("ga.optimizer", "fitness_function"),
+    "delta_evaluate": ("ga.delta", "DeltaEvaluator.evaluate"),
+    "batch_evaluate": ("ga.batch", "BatchEvaluator.evaluate"),
+    "crossover": ("ga.optimizer", "crossover"),
+    "mutate": ("ga.optimizer", "mutate"),
+}
+
+# Modül hedeflerinde (ör. a_star'ın kullandığı heapq) sarılan fonksiyonlar
+MODULE_FUNCTIONS = ("heappush", "heappop")
+
+_stats = {}      # ad → [çağrı sayısı, toplam süre (sn)]
+_patches = []    # (sahip nesne, öznitelik adı, orijinal değer)
+
+
+def is_enabled():
+    return bool(_patches)
+
+
+def _timed(name, func):
+    stat = _stats.setdefault(name, [0, 0.0])
+    perf = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        t0 = perf()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stat[0] += 1
+            stat[1] += perf() - t0
+
+    return wrapper
+
+
+def _resolve(module_name, qualname):
+    owner = importlib.import_module(module_name)
+    *path, attr = qualname.split(".")
+    for part in path:
+        owner = getattr(owner, part)
+    return owner, attr
+
+
+def _patch(owner, attr, value):
+    _patches.append((owner, attr, getattr(owner, attr)))
+    setattr(owner, attr, value)
+
+
+def enable(targets=None):
+    """
+    Hedefleri (varsayılan: TARGETS'ın tamamı) ölçüm sarmalayıcılarıyla
+    değiştirir. Zaten açıksa önce kapatılır.
+    """
+    if is_enabled():
+        disable()
+    for name in targets or TARGETS:
+        owner, attr = _resolve(*TARGETS[name])
+        original = getattr(owner, attr)
+
+        if isinstance(original, ModuleType):
+            # Modülün kendisini değil, yalnızca bu modüldeki kullanımını sar
+            proxy = SimpleNamespace(**{
+                n: getattr(original, n) for n in dir(original) if not n.startswith("_")
+            })
+            for fname in MODULE_FUNCTIONS:
+                if hasattr(proxy, fname):
+                    setattr(proxy, fname, _timed(f"{name}.{fname}", getattr(original, fname)))
+            _patch(owner, attr, proxy)
+            continue
+
+        wrapper = _timed(name, original)
+        _patch(owner, attr, wrapper)
+        if isinstance(owner, type):
+            continue
+        # `from modül import f` ile alınmış kopyaları da değiştir
+        for module in list(sys.modules.values()):
+            namespace = getattr(module, "__dict__", None)
+            if module is owner or not namespace:
+                continue
+            for key, value in list(namespace.items()):
+                if value is original:
+                    _patch(module, key, wrapper)
+
+
+def disable():
+    """Tüm sarmalayıcıları kaldırır (ters sırada); sayaçlar korunur."""
+    while _patches:
+        owner, attr, original = _patches.pop()
+        setattr(owner, attr, original)
+
+
+def reset():
+    """Sayaçları sıfırlar (açık sarmalayıcılar aynı sayaçlara yazmaya devam eder)."""
+    for stat in _stats.values():
+        stat[0] = 0
+        stat[1] = 0.0
+
+
+@contextmanager
+def instrumented(targets=None):
+    """with instrumented(): ... bloğu boyunca ölçümü açar."""
+    enable(targets)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def summary():
+    """Toplam süreye göre azalan [{"name", "calls", "total_s", "mean_us"}, ...]."""
+    rows = [
+        {
+            "name": name,
+            "calls": calls,
+            "total_s": total,
+            "mean_us": total / calls * 1e6 if calls else 0.0,
+        }
+        for name, (calls, total) in _stats.items()
+        if calls
+    ]
+    rows.sort(key=lambda r: -r["total_s"])
+    return rows
+
+
+def format_summary(rows=None):
+    rows = summary() if rows is None else rows
+    lines = [f"  {'ölçüm':<24} {'çağrı':>10} {'toplam (sn)':>12} {'ort. (µs)':>10}"]
+    for r in rows:
+        lines.append(f"  {r['name']:<24} {r['calls']:>10} {r['total_s']:>12.3f} {r['mean_us']:>10.1f}")
+    return "\n".join(lines)
+
+
+# Faz bazlı profil: "cprofile" (deterministik) ya da "sampling" (örnekleyici)
+
+
+class Sampler:
+    """
+    Ana iş parçacığının çağrı yığınını `interval` saniyede bir örnekleyen
+    hafif profil aracı. Her fonksiyon için kendi (yığının tepesi) ve kapsayıcı
+    (yığında herhangi bir yerde) örnek sayılarını tutar.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_counts[_frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = _frame_key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    self.total_counts[key] += 1
+                frame = frame.f_back
+
+    def report(self, limit=25):
+        lines = [f"{self.samples} örnek ({self.interval * 1000:.1f} ms aralık)",
+                 f"{'kendi %':>8} {'toplam %':>9}  fonksiyon"]
+        n = max(self.samples, 1)
+        for key, count in self.self_counts.most_common(limit):
+            lines.append(f"{100 * count / n:>8.1f} {100 * self.total_counts[key] / n:>9.1f}  {key}")
+        return "\n".join(lines)
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class PhaseProfiler:
+    """
+    Çalışma fazlarını sırayla profiller: start(ad) ... stop(). mode=None ise
+    hiçbir şey yapmaz (sıfır maliyet).
+      - "cprofile" : cProfile; out_dir verilirse <out_dir>/<ad>.prof yazılır
+      - "sampling" : Sampler; out_dir verilirse <out_dir>/<ad>.txt yazılır
+    Her faz için en pahalı `limit` fonksiyonun metin raporu `results`
+    listesine {"name", "report", "path"} olarak eklenir.
+    """
+
+    def __init__(self, mode=None, out_dir=None, limit=25):
+        if mode not in (None, "cprofile", "sampling"):
+            raise ValueError(f"Bilinmeyen profil modu: {mode}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.limit = limit
+        self.results = []
+        self._name = None
+        self._profiler = None
+
+    def start(self, name):
+        if self.mode is None:
+            return
+        if self._name is not None:
+            self.stop()
+        self._name = name
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = Sampler()
+            self._profiler.start()
+
+    def stop(self):
+        if self.mode is None or self._name is None:
+            return None
+        result = {"name": self._name, "report": None, "path": None}
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            buf = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=buf)
+            stats.sort_stats("cumulative").print_stats(self.limit)
+            result["report"] = buf.getvalue()
+            if self.out_dir is not None:
+                os.makedirs(self.out_dir, exist_ok=True)
+                result["path"] = os.path.join(self.out_dir, f"{self._name}.prof")
+                stats.dump_stats(result["path"])
+        else:
+            self._profiler.stop()
+            result["report"] = self._profiler.report(self.limit)
+            if self.out_dir is not None:
+                os.makedirs(self.out_dir, exist_ok=True)
+                result["path"] = os.path.join(self.out_dir, f"{self._name}.txt")
+                with open(result["path"], "w", encoding="utf-8") as f:
+                    f.write(result["report"] + "\n")
+        self.results.append(result)
+        self._name = None
+        self._profiler = None
+        return result
+
+    @contextmanager
+    def phase(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
@@ -0,0 +1,179 @@
+# core/matrices.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+from math import sqrt
+
+import numpy as np
+
+from data.scenario import DeliveryTable, DroneTable
+
+
+class ScenarioMatrices:
+    """
+    Senaryo başına bir kez (vektörel NumPy ile) hesaplanan mesafe
+    matrisleri. A*, GA (skaler ve toplu) ve greedy planlayıcı mesafeleri
+    yeniden hesaplamak yerine buradan okur.
+
+    Diziler (hepsi C-contiguous float64; teslimat indeksi = deliveries sırası):
+      - distance          : (n × n) teslimat → teslimat Öklid mesafesi
+      - depot_distance    : (m × n) drone başlangıcı → teslimat mesafesi
+      - speeds            : (m,) drone hızları (m/s)
+    Segment süresi (mesafe / hız / 60) planlayıcılarda mesafeden skaler
+    hesaplanır; ayrı süre matrisi tutulmaz.
+
+    `save(dir)` / `load(dir)` diziyi .npy olarak yazar ve memory-map ile açar;
+    `from_scenario(..., cache_dir=...)` aynı teslimat/drone kümesi için diskteki
+    matrisleri doğrudan kullanır.
+    """
+
+    ARRAYS = ("positions", "depot_positions", "speeds", "distance", "depot_distance")
+
+    def __init__(self, delivery_ids, drone_ids, positions, depot_positions, speeds,
+                 distance=None, depot_distance=None):
+        self.delivery_ids = list(delivery_ids)
+        self.drone_ids = list(drone_ids)
+        self.index_of = {did: i for i, did in enumerate(self.delivery_ids)}
+        self.drone_index = {did: k for k, did in enumerate(self.drone_ids)}
+        self.positions = positions
+        self.depot_positions = depot_positions
+        self.speeds = speeds
+
+        if distance is None:
+            distance = pairwise_distance(positions, positions)
+        if depot_distance is None:
+            depot_distance = pairwise_distance(depot_positions, positions)
+        self.distance = distance
+        self.depot_distance = depot_distance
+
+        # Konum → (tür, indeks) eşlemesi: point_distance için
+        self._point_index = {}
+        for k, p in enumerate(map(tuple, depot_positions.tolist())):
+            self._point_index.setdefault(p, ("s", k))
+        for i, p in enumerate(map(tuple, positions.tolist())):
+            self._point_index[p] = ("d", i)
+
+    @classmethod
+    def from_scenario(cls, deliveries, drones, cache_dir=None):
+        """
+        deliveries/drones listelerinden matrisleri kurar. cache_dir verilirse
+        konum+hız içeriğine göre anahtarlanmış alt dizinden memory-map ile
+        yükler; yoksa hesaplayıp oraya yazar.
+        """
+        if isinstance(deliveries, DeliveryTable):
+            # Dizi tabanlı senaryo: sütunlar doğrudan kullanılır
+            positions = np.asarray(deliveries.positions, dtype=float)
+            delivery_ids = deliveries.ids.tolist()
+        else:
+            positions = np.array([d["pos"] for d in deliveries], dtype=float).reshape(-1, 2)
+            delivery_ids = [d["id"] for d in deliveries]
+        if isinstance(drones, DroneTable):
+            depot_positions = np.asarray(drones.start_pos, dtype=float)
+            speeds = np.asarray(drones.speed, dtype=float)
+            drone_ids = drones.ids.tolist()
+        else:
+            depot_positions = np.array([dr["start_pos"] for dr in drones], dtype=float).reshape(-1, 2)
+            speeds = np.array([dr["speed"] for dr in drones], dtype=float)
+            drone_ids = [dr["id"] for dr in drones]
+
+        if cache_dir is None:
+            return cls(delivery_ids, drone_ids, positions, depot_positions, speeds)
+
+        key = cache_key(positions, depot_positions, speeds)
+        path = os.path.join(cache_dir, key)
+        if os.path.isdir(path):
+            return cls.load(path, delivery_ids, drone_ids)
+        matrices = cls(delivery_ids, drone_ids, positions, depot_positions, speeds)
+        if not matrices.save(path):
+            # Başka bir süreç aynı önbelleği önce yazdı: onu kullan
+            return cls.load(path, delivery_ids, drone_ids)
+        return matrices
+
+    def save(self, path):
+        """
+        Dizileri `path` altına .npy dosyaları olarak yazar. Süreç başına
+        benzersiz bir geçici dizine yazılıp tek adımda yerine konur. `path`
+        bu arada başka bir süreç tarafından yazılmışsa geçici dizin atılır ve
+        False döner.
+        """
+        parent = os.path.dirname(path) or "."
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=parent)
+        try:
+            for name in self.ARRAYS:
+                np.save(os.path.join(tmp_path, name + ".npy"), getattr(self, name))
+            # Yarım yazılmış önbellek okunmasın diye tek adımda yerine koy
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if os.path.isdir(path):
+                return False
+            raise
+        return True
+
+    @classmethod
+    def load(cls, path, delivery_ids, drone_ids, mmap_mode="r"):
+        """`save` ile yazılmış matrisleri memory-map ile açar."""
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+            for name in cls.ARRAYS
+        }
+        return cls(delivery_ids, drone_ids, **arrays)
+
+    def row(self, p):
+        """
+        p konumundan tüm teslimatlara mesafe satırı (n,). p bir teslimat ya da
+        drone başlangıcı ise matris satırı döner, değilse satır hesaplanır.
+        """
+        a = self._point_index.get(tuple(p))
+        if a is None:
+            return pairwise_distance(np.array([p], dtype=float), self.positions)[0]
+        if a[0] == "d":
+            return self.distance[a[1]]
+        return self.depot_distance[a[1]]
+
+    def point_distance(self, p, q):
+        """
+        İki konum arasındaki mesafe: iki uç da teslimat/drone başlangıcı ise
+        matristen okunur, değilse doğrudan hesaplanır.
+        """
+        a = self._point_index.get(tuple(p))
+        b = self._point_index.get(tuple(q))
+        if a is not None and b is not None:
+            if a[0] == "d" and b[0] == "d":
+                return self.distance.item(a[1], b[1])
+            if a[0] == "s" and b[0] == "d":
+                return self.depot_distance.item(a[1], b[1])
+            if a[0] == "d" and b[0] == "s":
+                return self.depot_distance.item(b[1], a[1])
+        return euclidean(p, q)
+
+
+def euclidean(p, q):
+    """
+    İki nokta arasındaki Öklid mesafesi. pairwise_distance ile aynı işlem
+    sırası (sqrt(dx*dx + dy*dy)) kullanılır; böylece matristen okunan ve
+    doğrudan hesaplanan mesafeler bit düzeyinde aynıdır (math.hypot /
+    np.hypot farklı algoritmalar kullandığından ulp düzeyinde ayrışır).
+    """
+    dx = p[0] - q[0]
+    dy = p[1] - q[1]
+    return sqrt(dx * dx + dy * dy)
+
+
+def pairwise_distance(a, b):
+    """(len(a) × len(b)) Öklid mesafe matrisi (bkz. euclidean)."""
+    dx = a[:, 0][:, None] - b[:, 0][None, :]
+    dy = a[:, 1][:, None] - b[:, 1][None, :]
+    return np.ascontiguousarray(np.sqrt(dx * dx + dy * dy))
+
+
+def cache_key(positions, depot_positions, speeds):
+    """Konum ve hız içeriğinden türetilen önbellek anahtarı."""
+    h = hashlib.sha1()
+    for arr in (positions, depot_positions, speeds):
+        h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+        h.update(b"|")
+    return h.hexdigest()
@@ -0,0 +1,217 @@
+# core/nofly.py
+
+from bisect import bisect_left, bisect_right
+
+from shapely import STRtree
+from shapely.geometry import Polygon, LineString
+from shapely.prepared import prep
+
+
+class ActiveTimeIndex:
+    """
+    Zone aktiflik aralıkları (active_time) için sıralı kırılma noktası indeksi.
+
+    Tüm başlangıç/bitiş zamanları sıralanır; ardışık iki kırılma noktası
+    arasındaki açık aralıkta ve her kırılma noktasının tam üzerinde aktif küme
+    sabittir. Bu "zaman kovaları" (slot) için aktif zone kümesi ilk sorguda
+    hesaplanıp önbelleğe alınır; sonraki sorgular bisect ile O(log n + k).
+
+    Parametreler:
+      intervals : [(start, end), ...]  — zone sırasıyla, `start <= t <= end` aktif
+    """
+
+    def __init__(self, intervals):
+        self.intervals = [tuple(iv) for iv in intervals]
+        self.breakpoints = sorted({x for iv in self.intervals for x in iv})
+        # Başlangıca göre sıralı zone indeksleri (slot hesaplamasında aday daraltma)
+        self._by_start = sorted(range(len(self.intervals)), key=lambda i: self.intervals[i][0])
+        self._starts = [self.intervals[i][0] for i in self._by_start]
+        self._cache = {}
+
+    def slot(self, t):
+        """
+        t'nin düştüğü zaman kovası: kırılma noktası i'nin tam üzeri için 2*i+1,
+        (bp[i-1], bp[i]) açık aralığı için 2*i.
+        """
+        i = bisect_left(self.breakpoints, t)
+        if i < len(self.breakpoints) and self.breakpoints[i] == t:
+            return 2 * i + 1
+        return 2 * i
+
+    def active_mask(self, t):
+        """t anında aktif zone'ların bit maskesi (bit i ↔ zone i)."""
+        key = self.slot(t)
+        mask = self._cache.get(key)
+        if mask is None:
+            # Kovadaki her t için küme aynı olduğundan t ile hesaplamak yeterli
+            n_started = bisect_right(self._starts, t)
+            mask = 0
+            for i in self._by_start[:n_started]:
+                if t <= self.intervals[i][1]:
+                    mask |= 1 << i
+            self._cache[key] = mask
+        return mask
+
+
+class NoFlyZoneIndex:
+    """
+    Senaryo başına bir kez kurulan no-fly zone geometri indeksi.
+
+    Her segment kontrolünde her zone için yeniden Polygon üretmek yerine:
+      - prepared (hazırlanmış) shapely geometrileri,
+      - bounding box'lar,
+      - bbox aday araması için bir STRtree
+      - active_time aralıkları için bir ActiveTimeIndex
+      - segment → kesişen zone bit maskesi önbelleği
+    burada tutulur. A*, GA, CSP kontrolleri ve görselleştirme ham zone listesi
+    yerine bu nesneyi kabul eder.
+
+    Nesne, ham liste gibi de davranır (len, iterasyon, indeksleme): mevcut
+    `for zone in no_fly_zones` kullanımları değişmeden çalışır.
+
+    Parametreler:
+      no_fly_zones : [{"id", "coordinates":[(x1,y1),...], "active_time":(s,e)}, ...]
+    """
+
+    def __init__(self, no_fly_zones):
+        self.zones = list(no_fly_zones)
+        self.polygons = [Polygon(zone["coordinates"]) for zone in self.zones]
+        self.prepared = [prep(poly) for poly in self.polygons]
+        self.bounds = [poly.bounds for poly in self.polygons]
+        self.tree = STRtree(self.polygons) if self.polygons else None
+        self.time_index = ActiveTimeIndex(zone["active_time"] for zone in self.zones)
+
+        # Zone kümesi her değiştiğinde artar; yol önbellekleri bununla geçersizleşir
+        self.version = 0
+
+        # Segment → kesişen zone bit maskesi önbelleği ve sayaçları
+        self._segment_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __reduce__(self):
+        # Süreçler arası aktarımda yalnızca ham zone listesi gönderilir; geometri,
+        # STRtree ve önbellekler alıcı tarafta yeniden kurulur
+        return (NoFlyZoneIndex, (self.zones,))
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    def __getitem__(self, i):
+        return self.zones[i]
+
+    def add_zone(self, zone):
+        """
+        Çalışırken yeni bir zone ekler (indeksi len(self) - 1 olur) ve `version`
+        değerini artırır. Segment önbelleği atılmaz: bbox'ı yeni zone'unkiyle
+        çakışan önbellekli segmentler için yalnızca yeni zone test edilip maskeye
+        yeni bit eklenir.
+        """
+        poly = Polygon(zone["coordinates"])
+        prepared = prep(poly)
+        bit = 1 << len(self.zones)
+        self.zones.append(zone)
+        self.polygons.append(poly)
+        self.prepared.append(prepared)
+        self.bounds.append(poly.bounds)
+        self.tree = STRtree(self.polygons)
+        self.time_index = ActiveTimeIndex(z["active_time"] for z in self.zones)
+
+        minx, miny, maxx, maxy = poly.bounds
+        for key, mask in self._segment_cache.items():
+            (x1, y1), (x2, y2) = key
+            if max(x1, x2) < minx or min(x1, x2) > maxx or max(y1, y2) < miny or min(y1, y2) > maxy:
+                continue
+            if prepared.intersects(LineString(key)):
+                self._segment_cache[key] = mask | bit
+
+        self.version += 1
+        return len(self.zones) - 1
+
+    def segment_mask(self, p1, p2):
+        """
+        p1→p2 segmentini kesen zone'ların bit maskesi (aktiflik zamanından
+        bağımsız). Segment başına geometri testi yalnızca ilk sorguda yapılır;
+        sonuç (yöne bakılmaksızın) uç noktalara göre önbelleğe alınır.
+        """
+        p1, p2 = tuple(p1), tuple(p2)
+        key = (p1, p2) if p1 <= p2 else (p2, p1)
+        mask = self._segment_cache.get(key)
+        if mask is not None:
+            self.cache_hits += 1
+            return mask
+
+        self.cache_misses += 1
+        mask = self._compute_mask(p1, p2)
+        self._segment_cache[key] = mask
+        return mask
+
+    def _compute_mask(self, p1, p2):
+        """Önbellek ıskasında geometri testi: STRtree adayları + prepared.intersects."""
+        mask = 0
+        if self.tree is not None:
+            line = LineString([p1, p2])
+            for i in self.tree.query(line):
+                if self.prepared[i].intersects(line):
+                    mask |= 1 << int(i)
+        return mask
+
+    def violation_count(self, p1, p2, t):
+        """
+        p1→p2 segmentini kesen ve t anında aktif olan zone sayısı.
+        Önbellek dolduktan sonra geometri çağrısı yapmaz: yalnızca bir sözlük
+        araması ve aktiflik maskesiyle AND.
+        """
+        active = self.time_index.active_mask(t)
+        if not active:
+            return 0
+        return (self.segment_mask(p1, p2) & active).bit_count()
+
+    def segment_hits(self, p1, p2, t=None):
+        """
+        p1→p2 segmentini kesen zone'ları (orijinal sırada) döner.
+
+        t verilirse yalnızca o anda aktif olan zone'lar sayılır
+        (mevcut `sz <= t <= ez` semantiği); t=None ise aktiflik zamanı
+        dikkate alınmaz (CSP ve görselleştirme kontrolleri gibi).
+        """
+        if t is None:
+            mask = self.segment_mask(p1, p2)
+        else:
+            active = self.time_index.active_mask(t)
+            if not active:
+                return []
+            mask = self.segment_mask(p1, p2) & active
+        return [self.zones[i] for i in _bit_indices(mask)]
+
+    def cache_stats(self):
+        """Segment önbelleği isabet/ıska sayaçları."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._segment_cache),
+            "hit_rate": self.cache_hits / total if total else 0.0,
+        }
+
+
+def _bit_indices(mask):
+    """Bit maskesindeki 1 bitlerinin indekslerini artan sırada üretir."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def as_zone_index(no_fly_zones):
+    """
+    Ham zone listesini NoFlyZoneIndex'e çevirir; zaten indeks ise aynen döner.
+    Sıcak döngülerde her çağrıda yeniden kurulmaması için indeksi bir kez
+    oluşturup aşağıya onu geçirin.
+    """
+    if isinstance(no_fly_zones, NoFlyZoneIndex):
+        return no_fly_zones
+    return NoFlyZoneIndex(no_fly_zones)
@@ -0,0 +1,83 @@
+# core/path_cache.py
+
+from collections import OrderedDict
+
+
+class PathCache:
+    """
+    Tekrarlanan A* sorguları için LRU yol önbelleği.
+
+    Anahtar: (başlangıç, hedef, kapasite sınıfı = max_weight, hız,
+    kuantize kalkış zamanı). Aynı kovaya düşen kalkış zamanları aynı yolu
+    paylaşır (time_bucket=None → tam zaman eşleşmesi). Önbellek bir senaryonun
+    teslimat kümesine bağlıdır; no-fly zone indeksi değiştiğinde (farklı nesne
+    ya da `version` artışı) tüm yollar geçersizleşir.
+
+    Parametreler:
+      maxsize     : tutulacak en fazla yol sayısı (aşılınca en eski kullanılan atılır)
+      time_bucket : kalkış zamanı kuantizasyon adımı (dakika)
+    """
+
+    def __init__(self, maxsize=1024, time_bucket=5.0):
+        self.maxsize = maxsize
+        self.time_bucket = time_bucket
+        self._entries = OrderedDict()
+        self._zones = None
+        self._zone_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _check_zones(self, zone_index):
+        if zone_index is not self._zones or zone_index.version != self._zone_version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self._zones = zone_index
+            self._zone_version = zone_index.version
+
+    def key(self, start, goal, max_weight, speed, depart_time):
+        if self.time_bucket:
+            slot = int(depart_time // self.time_bucket)
+        else:
+            slot = depart_time
+        return (tuple(start), tuple(goal), max_weight, speed, slot)
+
+    def get_path(self, zone_index, start, goal, max_weight, speed, depart_time, compute):
+        """
+        Önbellekteki yolu döner; yoksa `compute()` ile hesaplayıp saklar.
+        Dönen liste kopyadır (önbellekteki yol değiştirilemez).
+        """
+        self._check_zones(zone_index)
+        key = self.key(start, goal, max_weight, speed, depart_time)
+        path = self._entries.get(key)
+        if path is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(path)
+
+        self.misses += 1
+        path = compute()
+        self._entries[key] = tuple(path)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return list(path)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,331 @@
+# core/replanner.py
+
+import heapq
+import time
+
+from core.cost import delivery_step
+from core.nofly import as_zone_index
+from ga.delta import DeltaEvaluator
+from ga.memetic import LocalSearch
+from ga.optimizer import distance
+
+
+class Replanner:
+    """
+    Uçuş sırasında değişen senaryolar için artımlı planlayıcı.
+
+    Plan, drone başına bir teslimat sırasıdır. Her teslimat en fazla bir
+    drone'a atanır. Değişiklikte run_scenario baştan çalıştırılmaz. Mevcut
+    plan, mesafe matrisleri ve no-fly geometri indeksi (segment önbelleğiyle)
+    korunur. Yalnızca etkilenen dronelerin rotaları onarılır:
+      - add_delivery    : en ucuz ekleme (tüm uygun dronelerde), ardından o
+                          dronun rotasına yerel arama (2-opt / Or-opt),
+      - cancel_delivery : teslimat rotadan çıkarılır, rota yerel aramayla onarılır,
+      - add_zone        : zone indekse eklenir (`version` artar). Kalan
+                          segmentleri yeni zone'u kesen teslimatlar en ucuz
+                          eklemeyle yeniden yerleştirilir, etkilenen rotalar
+                          yerel aramayla onarılır,
+      - advance_time    : saat ilerler. Başlamış (yola çıkılmış) segmentler
+                          ve teslimatlar kesinleşir (committed) ve artık
+                          değiştirilmez.
+    Her çağrı güncel planı (bkz. plan()) döner. Yerel arama
+    `latency_target_s` süresi dolunca kesilir. Dönen planda çağrının süresi
+    ("latency_s") ve hedefe uyup uymadığı ("within_target") da yer alır.
+
+    Maliyet, GA fitness'ıdır (core.cost.delivery_step çekirdeği): tamamlanan
+    × 50 − enerji × 0.1 − ihlal × 1000. Kalan rota, dronun kesinleşmiş son
+    durumundan (konum, zaman, kalan batarya) itibaren değerlendirilir. Zaman
+    birimi dakikadır.
+
+    Parametreler:
+      routes               : başlangıç planı {drone_id: [teslimat_id, ...]};
+                             verilmezse teslimatlar en ucuz eklemeyle dağıtılır
+      matrices             : ScenarioMatrices; en ucuz ekleme taramasında bilinen
+                             teslimatlar arası mesafeler buradan okunur
+      latency_target_s     : çağrı başına süre hedefi (saniye)
+      local_search_k       : yerel aramada teslimat başına komşu sayısı
+      local_search_evals   : onarım başına en fazla tam değerlendirme
+      insertion_candidates : en ucuz eklemede tam değerlendirilecek aday sayısı
+    """
+
+    def __init__(self, deliveries, drones, no_fly_zones, routes=None, matrices=None,
+                 latency_target_s=0.05, local_search_k=8, local_search_evals=64,
+                 insertion_candidates=8):
+        self.deliveries = {}
+        for d in deliveries:
+            self.deliveries[d["id"]] = _delivery(d)
+        self.drones = [dict(drone) for drone in drones]
+        self._drone = {drone["id"]: drone for drone in self.drones}
+        self.zone_index = as_zone_index(no_fly_zones)
+        self.matrices = matrices
+        self.latency_target_s = latency_target_s
+        self.local_search_k = local_search_k
+        self.local_search_evals = local_search_evals
+        self.insertion_candidates = insertion_candidates
+
+        self.now = 0.0
+        self.routes = {}      # drone_id → değiştirilebilir kalan rota
+        self.committed = {}   # drone_id → kesinleşmiş (teslim edilmiş / yoldaki) teslimatlar
+        self.origin = {}      # drone_id → kalan rotanın başladığı (konum, zaman, batarya)
+        self.totals = {}      # drone_id → kesinleşmiş kısmın [enerji, ihlal, tamamlanan]
+        for drone in self.drones:
+            did = drone["id"]
+            self.routes[did] = []
+            self.committed[did] = []
+            self.origin[did] = (tuple(drone["start_pos"]), 0.0, drone["battery"])
+            self.totals[did] = [0.0, 0, 0]
+        self.unassigned = []
+
+        if routes is not None:
+            for drone_id, route in routes.items():
+                self.routes[drone_id] = [x for x in route if x in self.deliveries]
+            assigned = {x for route in self.routes.values() for x in route}
+            self.unassigned = [x for x in self.deliveries if x not in assigned]
+        else:
+            order = sorted(self.deliveries.values(), key=lambda d: (d["time_window"][0], d["id"]))
+            for d in order:
+                if self._insert(d["id"]) is None:
+                    self.unassigned.append(d["id"])
+
+    # 1. Olay API'si
+
+    def add_delivery(self, delivery):
+        """Yeni teslimatı en ucuz konuma ekler ve o dronun rotasını onarır."""
+        start = time.perf_counter()
+        deadline = start + self.latency_target_s
+        d = _delivery(delivery)
+        if d["id"] in self.deliveries:
+            raise ValueError(f"Teslimat zaten planda: {d['id']}")
+        self.deliveries[d["id"]] = d
+        drone_id = self._insert(d["id"])
+        if drone_id is None:
+            self.unassigned.append(d["id"])
+        else:
+            self._repair(drone_id, deadline)
+        return self.plan(start)
+
+    def cancel_delivery(self, delivery_id):
+        """
+        Kesinleşmemiş bir teslimatı plandan çıkarır ve rotayı onarır.
+        Kesinleşmiş (teslim edilmiş ya da yoldaki) teslimatlar iptal edilemez.
+        """
+        start = time.perf_counter()
+        deadline = start + self.latency_target_s
+        if delivery_id not in self.deliveries:
+            raise ValueError(f"Bilinmeyen teslimat: {delivery_id}")
+        for drone_id, done in self.committed.items():
+            if delivery_id in done:
+                raise ValueError(f"Teslimat kesinleşmiş, iptal edilemez: {delivery_id}")
+
+        del self.deliveries[delivery_id]
+        if delivery_id in self.unassigned:
+            self.unassigned.remove(delivery_id)
+        for drone_id, route in self.routes.items():
+            if delivery_id in route:
+                route.remove(delivery_id)
+                self._repair(drone_id, deadline)
+                break
+        return self.plan(start)
+
+    def add_zone(self, zone):
+        """
+        Zone'u geometri indeksine ekler. Kalan segmentlerinden biri yeni zone'u
+        kesen teslimatlar en ucuz eklemeyle (başka bir drone'a da olabilir)
+        yeniden yerleştirilir ve etkilenen rotalar onarılır.
+        """
+        start = time.perf_counter()
+        deadline = start + self.latency_target_s
+        bit = 1 << self.zone_index.add_zone(zone)
+
+        moved = []
+        affected = set()
+        for drone in self.drones:
+            drone_id = drone["id"]
+            route = self.routes[drone_id]
+            prev = self.origin[drone_id][0]
+            crossing = set()
+            for k, did in enumerate(route):
+                pos = self.deliveries[did]["pos"]
+                if self.zone_index.segment_mask(prev, pos) & bit:
+                    crossing.add(did)
+                    if k:
+                        crossing.add(route[k - 1])
+                prev = pos
+            if crossing:
+                affected.add(drone_id)
+                self.routes[drone_id] = [x for x in route if x not in crossing]
+                moved.extend(x for x in route if x in crossing)
+
+        for did in moved:
+            drone_id = self._insert(did)
+            if drone_id is None:
+                self.unassigned.append(did)
+            else:
+                affected.add(drone_id)
+        for drone_id in sorted(affected, key=str):
+            self._repair(drone_id, deadline)
+        return self.plan(start)
+
+    def advance_time(self, minutes):
+        """
+        Saati `minutes` dakika ilerletir. Her dronun yola çıktığı segmentler
+        (başlangıç zamanı < yeni saat) ve hedef teslimatları kesinleşir.
+        """
+        start = time.perf_counter()
+        self.now += minutes
+        for drone in self.drones:
+            self._commit(drone)
+        return self.plan(start)
+
+    # 2. Plan
+
+    def plan(self, start=None):
+        """
+        Güncel plan:
+          {"time", "drones": [{"drone_id", "route", "committed", "energy",
+           "violations", "completed", "fitness"}, ...], "unassigned",
+           "zone_version", "latency_s", "within_target"}
+        Drone metrikleri kesinleşmiş kısım + kalan rotanın değerlendirmesidir.
+        start (time.perf_counter()) verilirse latency_s çağrının süresidir.
+        """
+        drones = []
+        for drone in self.drones:
+            drone_id = drone["id"]
+            route = self.routes[drone_id]
+            (_, energy, violations, completed), _ = self._evaluator(drone).evaluate(route)
+            done_energy, done_violations, done_completed = self.totals[drone_id]
+            energy += done_energy
+            violations += done_violations
+            completed += done_completed
+            drones.append({
+                "drone_id": drone_id,
+                "route": list(route),
+                "committed": list(self.committed[drone_id]),
+                "energy": energy,
+                "violations": violations,
+                "completed": completed,
+                "fitness": (completed * 50) - (energy * 0.1) - (violations * 1000),
+            })
+        latency = time.perf_counter() - start if start is not None else None
+        return {
+            "time": self.now,
+            "drones": drones,
+            "unassigned": list(self.unassigned),
+            "zone_version": self.zone_index.version,
+            "latency_s": latency,
+            "within_target": latency is None or latency <= self.latency_target_s,
+        }
+
+    # 3. Onarım yardımcıları
+
+    def _evaluator(self, drone, extra=()):
+        """Dronun kalan rotası (+ extra) için kesinleşmiş durumdan başlayan DeltaEvaluator."""
+        drone_id = drone["id"]
+        pos, t, battery = self.origin[drone_id]
+        ids = list(self.routes[drone_id]) + list(extra)
+        view = {
+            "start_pos": pos,
+            "battery": drone["battery"],
+            "speed": drone["speed"],
+            "max_weight": drone["max_weight"],
+        }
+        return DeltaEvaluator(
+            [self.deliveries[x] for x in ids], view, self.zone_index,
+            start_time=t, start_battery=battery
+        )
+
+    def _dist(self, p, q):
+        if self.matrices is not None:
+            return self.matrices.point_distance(p, q)
+        return distance(p, q)
+
+    def _insert(self, delivery_id):
+        """
+        En ucuz ekleme. Önce tüm uygun dronelerdeki tüm konumlar enerji farkıyla
+        O(1)'de taranır. En iyi `insertion_candidates` aday tam değerlendirilir
+        (fitness farkı). Teslimat en iyi konuma eklenir ve drone_id döner.
+        Kapasitesi yeten drone yoksa None döner.
+        """
+        d = self.deliveries[delivery_id]
+        pos, weight = d["pos"], d["weight"]
+        screened = []
+        for drone in self.drones:
+            if weight > drone["max_weight"]:
+                continue
+            drone_id = drone["id"]
+            route = self.routes[drone_id]
+            prev = self.origin[drone_id][0]
+            for p, did in enumerate(route):
+                nxt = self.deliveries[did]
+                gain = (self._dist(prev, pos) * weight
+                        + (self._dist(pos, nxt["pos"]) - self._dist(prev, nxt["pos"])) * nxt["weight"])
+                screened.append((gain, p, drone_id))
+                prev = nxt["pos"]
+            screened.append((self._dist(prev, pos) * weight, len(route), drone_id))
+        if not screened:
+            return None
+
+        best = None
+        base = {}
+        for gain, p, drone_id in heapq.nsmallest(self.insertion_candidates, screened,
+                                                 key=lambda c: c[0]):
+            if drone_id not in base:
+                ev = self._evaluator(self._drone[drone_id], extra=[delivery_id])
+                base[drone_id] = (ev,) + ev.evaluate(self.routes[drone_id])
+            ev, base_scores, base_record = base[drone_id]
+            route = self.routes[drone_id]
+            scores, _ = ev.evaluate(route[:p] + [delivery_id] + route[p:], (base_record,))
+            delta = scores[0] - base_scores[0]
+            if best is None or delta > best[0]:
+                best = (delta, p, drone_id)
+
+        _, p, drone_id = best
+        self.routes[drone_id].insert(p, delivery_id)
+        return drone_id
+
+    def _repair(self, drone_id, deadline):
+        """Dronun kalan rotasına süre sınırlı 2-opt / Or-opt yerel araması."""
+        route = self.routes[drone_id]
+        if len(route) < 3 or time.perf_counter() >= deadline:
+            return 0
+        ev = self._evaluator(self._drone[drone_id])
+        search = LocalSearch(ev, None, self.local_search_k, self.local_search_evals)
+        new_route, _, _, moves = search.improve(route, None, deadline)
+        self.routes[drone_id] = list(new_route)
+        return moves
+
+    def _commit(self, drone):
+        """Yeni saate kadar yola çıkılmış segmentleri kesinleştirir."""
+        drone_id = drone["id"]
+        route = self.routes[drone_id]
+        pos, t, battery = self.origin[drone_id]
+        totals = self.totals[drone_id]
+        k = 0
+        while k < len(route) and t < self.now:
+            d = self.deliveries[route[k]]
+            energy, battery, t, violations, completed = delivery_step(
+                pos, d["pos"], d["weight"], d["time_window"], distance(pos, d["pos"]),
+                battery, t, drone["battery"], drone["speed"], self.zone_index
+            )
+            totals[0] += energy
+            totals[1] += violations
+            totals[2] += completed
+            pos = d["pos"]
+            k += 1
+        self.committed[drone_id].extend(route[:k])
+        del route[:k]
+        # Boşta bekleyen drone, yeni bir rota alırsa şimdiki zamandan başlar
+        if not route:
+            t = max(t, self.now)
+        self.origin[drone_id] = (pos, t, battery)
+
+
+def _delivery(d):
+    """Teslimatı (dict ya da satır görünümü) değiştirilebilir bir dict'e çevirir."""
+    return {
+        "id": d["id"],
+        "pos": tuple(d["pos"]),
+        "weight": d["weight"],
+        "priority": d.get("priority", 1),
+        "time_window": tuple(d["time_window"]),
+    }
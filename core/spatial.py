@@ -0,0 +1,127 @@
+# core/spatial.py
+
+from math import floor, sqrt
+
+
+class GridIndex:
+    """
+    Noktalar için tekdüze ızgara (uniform grid) uzaysal indeksi.
+
+    Her nokta, `cell_size` boyutlu hücresine yerleştirilir; en yakın komşu
+    sorguları sorgu noktasının hücresinden başlayıp halka halka genişler ve
+    daha uzak halkalar mevcut k'ıncı en iyi mesafeyi geçemeyeceği anda durur.
+    Dengeli dağılımlarda sorgu maliyeti ~O(k)'dır.
+
+    Noktalar `remove(i)` ile silinebilir (hücre listesinden çıkarma, ~O(1)).
+    Kalan nokta sayısı son kurulumdakinin dörtte birine düşünce ızgara kalan
+    noktalar için daha iri hücrelerle yeniden kurulur; böylece seyrekleşen
+    ızgarada boş halka taraması büyümez (amortize O(1) silme).
+
+    Parametreler:
+      points    : [(x, y), ...]  — indeks = liste sırası
+      cell_size : hücre kenarı; verilmezse hücre başına ~2 nokta düşecek şekilde seçilir
+    """
+
+    def __init__(self, points, cell_size=None):
+        self.points = [tuple(p) for p in points]
+        self.alive = [True] * len(self.points)
+        self._fixed_cell_size = cell_size
+        self._build(range(len(self.points)))
+
+    def _build(self, indices):
+        indices = list(indices)
+        n = len(indices)
+        if n:
+            xs = [self.points[i][0] for i in indices]
+            ys = [self.points[i][1] for i in indices]
+            self.min_x, self.min_y = min(xs), min(ys)
+            self.max_x, self.max_y = max(xs), max(ys)
+        else:
+            self.min_x = self.min_y = self.max_x = self.max_y = 0.0
+        cell_size = self._fixed_cell_size
+        if cell_size is None:
+            area = max(self.max_x - self.min_x, 1.0) * max(self.max_y - self.min_y, 1.0)
+            cell_size = sqrt(2.0 * area / max(n, 1))
+        self.cell_size = float(cell_size)
+
+        self.cells = {}
+        for i in indices:
+            self.cells.setdefault(self._cell(self.points[i]), []).append(i)
+        self.count = n
+        self._built_count = n
+
+    def __len__(self):
+        return self.count
+
+    def remove(self, i):
+        """i indeksli noktayı indeksten siler (zaten silinmişse bir şey yapmaz)."""
+        if not self.alive[i]:
+            return
+        self.alive[i] = False
+        cell = self._cell(self.points[i])
+        bucket = self.cells[cell]
+        bucket.remove(i)
+        if not bucket:
+            del self.cells[cell]
+        self.count -= 1
+        if self._fixed_cell_size is None and 0 < self.count < self._built_count // 4:
+            self._build(j for bucket in self.cells.values() for j in bucket)
+
+    def _cell(self, p):
+        return (floor(p[0] / self.cell_size), floor(p[1] / self.cell_size))
+
+    def _max_ring(self, cx, cy):
+        """Sorgu hücresinden tüm noktaları kapsamaya yeten halka sayısı."""
+        lo_x, lo_y = self._cell((self.min_x, self.min_y))
+        hi_x, hi_y = self._cell((self.max_x, self.max_y))
+        return max(abs(cx - lo_x), abs(hi_x - cx), abs(cy - lo_y), abs(hi_y - cy))
+
+    def _ring(self, cx, cy, r):
+        """(cx, cy) merkezli r'inci halkadaki dolu hücrelerin içerikleri."""
+        cells = self.cells
+        if r == 0:
+            bucket = cells.get((cx, cy))
+            if bucket:
+                yield bucket
+            return
+        for x in range(cx - r, cx + r + 1):
+            for y in (cy - r, cy + r):
+                bucket = cells.get((x, y))
+                if bucket:
+                    yield bucket
+        for y in range(cy - r + 1, cy + r):
+            for x in (cx - r, cx + r):
+                bucket = cells.get((x, y))
+                if bucket:
+                    yield bucket
+
+    def nearest(self, p, k=1):
+        """
+        p'ye en yakın k noktayı [(dist², indeks), ...] olarak (mesafe, sonra
+        indeks sırasıyla) döner.
+        """
+        if not self.count or k <= 0:
+            return []
+        px, py = p[0], p[1]
+        cx, cy = self._cell(p)
+        max_ring = self._max_ring(cx, cy)
+        points = self.points
+        found = []
+        r = 0
+        while r <= max_ring:
+            for bucket in self._ring(cx, cy, r):
+                for i in bucket:
+                    q = points[i]
+                    dx = q[0] - px
+                    dy = q[1] - py
+                    found.append((dx * dx + dy * dy, i))
+            # r'inci halka tarandıktan sonra kalan noktalar en az r*cell_size uzakta
+            # (eşitlikte indeks sırası korunsun diye katı karşılaştırma)
+            if len(found) >= k:
+                found.sort()
+                bound = r * self.cell_size
+                if found[k - 1][0] < bound * bound:
+                    break
+            r += 1
+        found.sort()
+        return found[:k]
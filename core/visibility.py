@@ -0,0 +1,142 @@
+# core/visibility.py
+
+import heapq
+from math import dist
+
+from core.nofly import as_zone_index
+
+
+class VisibilityGraph:
+    """
+    Aktif no-fly zone poligonlarının köşelerinden kurulan görünürlük grafı
+    üzerinde engelsiz en kısa yol planlayıcısı.
+
+    - Düğümler: aktif zone köşeleri, `clearance` kadar dışa ötelenmiş olarak
+      (köşeye değen bir segment shapely'de "intersects" sayıldığı için).
+    - Kenarlar tembel doğrulanır: bir kenar yalnızca A* onu iyileştirici bir
+      aday olarak ele aldığında kontrol edilir. Kontrol, NoFlyZoneIndex'in
+      zamandan bağımsız segment → zone maskesi önbelleğini kullanır; bu yüzden
+      kenar sonuçları hiçbir zaman geçersizleşmez, aktiflik değişince yalnızca
+      yeni aktif maske ile AND yapılır.
+    - Düğüm kümeleri aktif zone maskesine göre önbelleğe alınır: zone aktifliği
+      değiştiğinde yalnızca yeni maskenin düğüm listesi kurulur.
+    - Zone indeksi çalışırken değişirse (NoFlyZoneIndex.add_zone, `version`
+      artışı) graf artımlı güncellenir: yalnızca yeni zone'ların köşeleri
+      eklenir. Mevcut bitler değişmediğinden önbellekli düğüm kümeleri
+      geçerli kalır; segment maskeleri indeks tarafından yamalanır.
+
+    Aynı nesne bir senaryonun tüm sorgularında yeniden kullanılmalıdır.
+
+    Parametreler:
+      no_fly_zones : NoFlyZoneIndex ya da ham zone listesi
+      clearance    : köşelerin dışa öteleme mesafesi
+    """
+
+    def __init__(self, no_fly_zones, clearance=1e-3):
+        self.zone_index = as_zone_index(no_fly_zones)
+        self.clearance = clearance
+        self.zone_vertices = [
+            _offset_vertices(poly, clearance) for poly in self.zone_index.polygons
+        ]
+        self._zone_version = self.zone_index.version
+        self._nodes = {}
+        self.edge_checks = 0
+        self.queries = 0
+
+    def _sync_zones(self):
+        """Zone indeksine sonradan eklenen zone'ların köşelerini ekler."""
+        zone_index = self.zone_index
+        if zone_index.version == self._zone_version:
+            return
+        for poly in zone_index.polygons[len(self.zone_vertices):]:
+            self.zone_vertices.append(_offset_vertices(poly, self.clearance))
+        self._zone_version = zone_index.version
+
+    def nodes(self, active_mask):
+        """Aktif maskedeki zone'ların (ötelenmiş) köşeleri."""
+        self._sync_zones()
+        nodes = self._nodes.get(active_mask)
+        if nodes is None:
+            nodes = []
+            for i, vertices in enumerate(self.zone_vertices):
+                if active_mask >> i & 1:
+                    nodes.extend(vertices)
+            self._nodes[active_mask] = nodes
+        return nodes
+
+    def edge_clear(self, p, q, active_mask):
+        """p→q segmenti aktif maskedeki hiçbir zone'u kesmiyorsa True."""
+        self.edge_checks += 1
+        return not (self.zone_index.segment_mask(p, q) & active_mask)
+
+    def shortest_path(self, start, goal, t=0.0):
+        """
+        start → goal arasında, t anında aktif zone'ları kesmeyen en kısa
+        poligonal yol: [start, köşe1, ..., goal]. Bulunamazsa [] döner.
+
+        start ya da goal bir aktif zone'un içindeyse o zone'dan kaçınmak mümkün
+        olmadığından, o zone'lar bu sorgu için engel sayılmaz.
+        """
+        self.queries += 1
+        self._sync_zones()
+        start, goal = tuple(start), tuple(goal)
+        zone_index = self.zone_index
+        active = zone_index.time_index.active_mask(t)
+        if active:
+            active &= ~(zone_index.segment_mask(start, start) | zone_index.segment_mask(goal, goal))
+
+        if start == goal:
+            return [start]
+        if self.edge_clear(start, goal, active):
+            return [start, goal]
+
+        nodes = [goal] + self.nodes(active)
+        g_cost = {start: 0.0}
+        came_from = {start: None}
+        closed = set()
+        frontier = [(dist(start, goal), start)]
+
+        while frontier:
+            _, u = heapq.heappop(frontier)
+            if u in closed:
+                continue
+            if u == goal:
+                path = []
+                while u is not None:
+                    path.append(u)
+                    u = came_from[u]
+                path.reverse()
+                return path
+            closed.add(u)
+
+            g_u = g_cost[u]
+            for v in nodes:
+                if v in closed or v == u:
+                    continue
+                new_cost = g_u + dist(u, v)
+                if new_cost >= g_cost.get(v, float("inf")):
+                    continue
+                # Tembel doğrulama: yalnızca iyileştiren aday kenarlar kontrol edilir
+                if not self.edge_clear(u, v, active):
+                    continue
+                g_cost[v] = new_cost
+                came_from[v] = u
+                heapq.heappush(frontier, (new_cost + dist(v, goal), v))
+
+        return []
+
+    def stats(self):
+        """Sorgu / kenar kontrolü sayaçları ve paylaşılan segment önbelleği durumu."""
+        return {
+            "queries": self.queries,
+            "edge_checks": self.edge_checks,
+            "node_sets": len(self._nodes),
+            "segment_cache": self.zone_index.cache_stats(),
+        }
+
+
+def _offset_vertices(poly, clearance):
+    """Poligon köşelerini `clearance` kadar dışa öteler (mitre birleşimli buffer)."""
+    grown = poly.buffer(clearance, join_style="mitre")
+    coords = list(grown.exterior.coords)[:-1]
+    return [tuple(c) for c in coords]
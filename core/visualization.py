@@ -2,7 +2,8 @@
 
 import json
 import os
-from shapely.geometry import Polygon, LineString
+
+from core.nofly import as_zone_index
 
 # Öncelikle sabit anlamda bazı renk paletini tanımlayalım
 DRONE_COLORS = [
@@ -30,7 +31,8 @@ def generate_leaflet_html(drone_routes, deliveries, no_fly_zones, output_filenam
     - drone_routes    : [[(x1,y1),(x2,y2),...], [(x1',y1'),...], ...]
                         Her öğe bir drone'un noktalar listesi (rotayı oluşturan koordinatlar).
     - deliveries      : [ {"id":..., "pos":(x,y), "weight":..., "priority":..., "time_window":(...)}, ... ]
-    - no_fly_zones    : [ {"id":..., "coordinates":[(x1,y1),(x2,y2),...] , "active_time":(...)}, ... ]
+    - no_fly_zones    : NoFlyZoneIndex ya da ham liste
+                        [ {"id":..., "coordinates":[(x1,y1),(x2,y2),...] , "active_time":(...)}, ... ]
     - output_filename : Oluşturulacak HTML dosya adı (ör. "senaryo_1_routes.html")
     """
 
@@ -44,11 +46,8 @@ def generate_leaflet_html(drone_routes, deliveries, no_fly_zones, output_filenam
     #    - Her drone için, rotayı oluşturan ardışık nokta çifti (segment) üzerinde test edeceğiz.
     #    - Eğer segment no‐fly poligonuyla kesişmiyorsa, bu segmenti “çizilebilir” kabul edeceğiz.
 
-    # 2.a) Önce no‐fly poligonlarını shapely Polygon modeline dönüştürelim:
-    shapely_zones = []
-    for zone in no_fly_zones:
-        coords = zone["coordinates"]
-        shapely_zones.append(Polygon(coords))
+    # 2.a) No‐fly poligonları için (hazır değilse) geometri indeksini kuralım:
+    zone_index = as_zone_index(no_fly_zones)
 
     # 2.b) drone_segments_list, her drone için bir liste (list of safe segments) tutacak:
     #      drone_segments_list[i] = [ [(x1,y1),(x2,y2)], [(x2,y2),(x3,y3)], ... ] — safe segmentler
@@ -60,14 +59,8 @@ def generate_leaflet_html(drone_routes, deliveries, no_fly_zones, output_filenam
         for i in range(len(route) - 1):
             p1 = route[i]
             p2 = route[i + 1]
-            segment_line = LineString([p1, p2])
             # Segment’in no‐fly içinde kesişip kesişmediğini kontrol edelim
-            intersects_any = False
-            for poly in shapely_zones:
-                if segment_line.intersects(poly):
-                    intersects_any = True
-                    break
-            if not intersects_any:
+            if not zone_index.segment_hits(p1, p2):
                 # Bu segment güvenli → saklayalım
                 safe_segments.append([p1, p2])
         drone_segments_list.append(safe_segments)
@@ -0,0 +1,154 @@
+# data/bulk.py
+
+import numpy as np
+
+from data.scenario import DeliveryTable, DroneTable, Scenario
+
+
+# data/veriler.py'deki rastgele üreticilerin NumPy Generator tabanlı toplu
+# (vektörel) sürümleri. Dağılımlar aynıdır:
+#   - drone    : max_weight U(2, 6) (0.1'e yuvarlı), battery 10000–20000,
+#                speed U(5, 12) (0.1'e yuvarlı), start_pos 0–100 tamsayı
+#   - teslimat : pos 0–100 tamsayı, weight U(0.5, 4.5) (0.1'e yuvarlı),
+#                priority 1–5, time_window start 0–60, end start+10 – start+60
+#   - zone     : sol alt köşe 0–80, genişlik/yükseklik 10–20, active_time (0, 120)
+# Aynı seed aynı senaryoyu üretir (random modülünün dizisiyle aynı değildir).
+#
+# output="dicts" mevcut dict listelerini, output="arrays" dizi tabanlı
+# DeliveryTable / DroneTable döner (zone'lar her zaman dict listesidir).
+
+
+def make_rng(seed=None):
+    """seed: None, tamsayı ya da hazır bir np.random.Generator."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def bulk_drones(n, seed=None, output="dicts"):
+    rng = make_rng(seed)
+    table = DroneTable(
+        np.arange(1, n + 1),
+        max_weight=np.round(rng.uniform(2.0, 6.0, n), 1),
+        battery=rng.integers(10000, 20000, n, endpoint=True),
+        speed=np.round(rng.uniform(5.0, 12.0, n), 1),
+        start_pos=rng.integers(0, 100, (n, 2), endpoint=True),
+    )
+    return _emit(table, output)
+
+
+def bulk_deliveries(n, seed=None, output="dicts", hotspots=None, hotspot_fraction=0.7,
+                    hotspot_sigma=8.0):
+    """
+    n teslimat üretir.
+
+    hotspots verilirse teslimatların `hotspot_fraction` kadarı yoğunluk
+    merkezleri çevresinde (normal dağılım, sigma = hotspot_sigma) kümelenir,
+    kalanı alana düzgün dağılır. hotspots: merkez sayısı (merkezler rastgele)
+    ya da [(x, y), ...] merkez listesi. Konumlar 0–100 aralığına kırpılıp
+    tamsayıya yuvarlanır.
+    """
+    rng = make_rng(seed)
+    positions = rng.integers(0, 100, (n, 2), endpoint=True)
+    if hotspots is not None:
+        if np.isscalar(hotspots):
+            centres = rng.uniform(0, 100, (int(hotspots), 2))
+        else:
+            centres = np.asarray(hotspots, dtype=float).reshape(-1, 2)
+        if len(centres):
+            clustered = rng.random(n) < hotspot_fraction
+            k = int(clustered.sum())
+            which = rng.integers(0, len(centres), k)
+            offsets = rng.normal(0.0, hotspot_sigma, (k, 2))
+            positions[clustered] = np.clip(np.rint(centres[which] + offsets), 0, 100).astype(positions.dtype)
+
+    start = rng.integers(0, 60, n, endpoint=True)
+    end = start + rng.integers(10, 60, n, endpoint=True)
+    table = DeliveryTable(
+        np.arange(1, n + 1),
+        positions=positions,
+        weights=np.round(rng.uniform(0.5, 4.5, n), 1),
+        priorities=rng.integers(1, 5, n, endpoint=True),
+        window_start=start,
+        window_end=end,
+    )
+    return _emit(table, output)
+
+
+def bulk_no_fly_zones(n, seed=None, max_overlap=None, max_tries=100):
+    """
+    n dikdörtgen no-fly zone üretir (dict listesi).
+
+    max_overlap verilirse (0–1), kabul edilen her zone çiftinin kesişim alanı
+    küçük olanın alanının bu oranını aşamaz (0 → örtüşmesiz). Adaylar toplu
+    çekilir ve sırayla süzülür; `max_tries` tur sonunda n zone'a ulaşılamazsa
+    ValueError fırlatılır.
+    """
+    rng = make_rng(seed)
+    if max_overlap is None:
+        rects = _draw_rects(rng, n)
+    else:
+        rects = np.empty((0, 4), dtype=np.int64)
+        for _ in range(max_tries):
+            if len(rects) >= n:
+                break
+            for cand in _draw_rects(rng, 2 * (n - len(rects))):
+                if _overlap_ok(cand, rects, max_overlap):
+                    rects = np.vstack([rects, cand])
+                    if len(rects) == n:
+                        break
+        if len(rects) < n:
+            raise ValueError(
+                f"max_overlap={max_overlap} ile {n} zone yerleştirilemedi ({len(rects)} yerleşti)"
+            )
+
+    zones = []
+    for i, (x, y, w, h) in enumerate(rects.tolist(), 1):
+        zones.append({
+            "id": i,
+            "coordinates": [(x, y), (x + w, y), (x + w, y + h), (x, y + h)],
+            "active_time": (0, 120)
+        })
+    return zones
+
+
+def bulk_scenario(n_drones, n_deliveries, n_zones, seed=None, output="arrays", **options):
+    """
+    Tek seed'den tam senaryo. output="arrays" → Scenario, "dicts" →
+    (drones, deliveries, no_fly_zones) dict listeleri. options: hotspots,
+    hotspot_fraction, hotspot_sigma, max_overlap.
+    """
+    rng = make_rng(seed)
+    zone_options = {k: options.pop(k) for k in ("max_overlap",) if k in options}
+    drones = bulk_drones(n_drones, rng, output)
+    deliveries = bulk_deliveries(n_deliveries, rng, output, **options)
+    zones = bulk_no_fly_zones(n_zones, rng, **zone_options)
+    if output == "arrays":
+        return Scenario(deliveries, drones, zones)
+    return drones, deliveries, zones
+
+
+def _draw_rects(rng, n):
+    """(n × 4) [x, y, w, h] dikdörtgenleri."""
+    xy = rng.integers(0, 80, (n, 2), endpoint=True)
+    wh = rng.integers(10, 20, (n, 2), endpoint=True)
+    return np.hstack([xy, wh])
+
+
+def _overlap_ok(cand, rects, max_overlap):
+    if not len(rects):
+        return True
+    x, y, w, h = cand
+    ix = np.minimum(x + w, rects[:, 0] + rects[:, 2]) - np.maximum(x, rects[:, 0])
+    iy = np.minimum(y + h, rects[:, 1] + rects[:, 3]) - np.maximum(y, rects[:, 1])
+    inter = np.clip(ix, 0, None) * np.clip(iy, 0, None)
+    smaller = np.minimum(w * h, rects[:, 2] * rects[:, 3])
+    return bool(np.all(inter <= max_overlap * smaller))
+
+
+def _emit(table, output):
+    if output == "arrays":
+        return table
+    if output == "dicts":
+        return table.to_dicts()
+    raise ValueError(f"Bilinmeyen çıktı biçimi: {output}")
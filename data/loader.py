@@ -0,0 +1,402 @@
+# data/loader.py
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from itertools import islice
+from math import isfinite
+
+import numpy as np
+
+from data.scenario import DeliveryTable
+
+
+# Büyük teslimat manifestlerinin (CSV / JSON Lines / GeoJSON) akış halinde
+# okunması. Kayıtlar üreteçlerle tek tek ayrıştırılıp doğrulanır, parçalar
+# (chunk) halinde doğrudan DeliveryTable sütunlarına yazılır; ara dict
+# listesi kurulmaz.
+#
+# Desteklenen biçimler (teslimat başına bir kayıt):
+#   - CSV     : başlık satırı id,x,y,weight,priority,tw_start,tw_end
+#   - JSONL   : her satır {"id", "pos": [x, y], "weight", "priority", "time_window": [s, e]}
+#   - GeoJSON : FeatureCollection; her Feature bir Point geometrisi ve
+#               properties içinde id (ya da feature "id"), weight, priority,
+#               time_window (ya da tw_start / tw_end)
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".geojson": "geojson",
+    ".json": "geojson",
+}
+
+CSV_COLUMNS = ("id", "x", "y", "weight", "priority", "tw_start", "tw_end")
+
+# Önbellek biçimi değişirse artırılır (eski önbellekler kullanılmaz)
+CACHE_VERSION = 2
+CACHE_ARRAYS = ("ids", "positions", "weights", "priorities", "window_start", "window_end")
+
+
+class ManifestError(ValueError):
+    """Manifestte geçersiz kayıt; mesaj dosya konumunu (satır / feature) içerir."""
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    fmt = FORMATS.get(ext)
+    if fmt is None:
+        raise ManifestError(f"Bilinmeyen manifest biçimi: {path}")
+    return fmt
+
+
+# 1. Ham kayıt üreteçleri: (konum, kayıt) çiftleri
+
+
+def iter_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or ())]
+        if missing:
+            raise ManifestError(f"{path}: eksik CSV sütunları: {', '.join(missing)}")
+        for row in reader:
+            yield f"satır {reader.line_num}", {
+                "id": row["id"],
+                "pos": (row["x"], row["y"]),
+                "weight": row["weight"],
+                "priority": row["priority"],
+                "time_window": (row["tw_start"], row["tw_end"]),
+            }
+
+
+def iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield f"satır {line_num}", json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ManifestError(f"{path}: satır {line_num}: geçersiz JSON ({exc.msg})") from None
+
+
+def iter_geojson(path, chunk_chars=1 << 16):
+    """
+    FeatureCollection'ın "features" dizisini dosyanın tamamını belleğe almadan,
+    `chunk_chars` karakterlik okumalarla Feature Feature ayrıştırır.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            data = f.read(chunk_chars)
+            if not data:
+                eof = True
+            buf = buf[pos:] + data
+            pos = 0
+
+        # "features": [ başlangıcını bul
+        while True:
+            key = buf.find('"features"')
+            bracket = buf.find("[", key) if key >= 0 else -1
+            if bracket >= 0:
+                pos = bracket + 1
+                break
+            if eof:
+                raise ManifestError(f"{path}: 'features' dizisi bulunamadı")
+            if key < 0:
+                # Anahtar okuma sınırında bölünmüş olabilir: sonunu tut
+                buf = buf[-len('"features"'):]
+            fill()
+
+        index = 0
+        while True:
+            # Boşluk ve virgülleri atla
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                fill()
+            if pos >= len(buf):
+                raise ManifestError(f"{path}: 'features' dizisi kapanmadan dosya bitti")
+            if buf[pos] == "]":
+                return
+            try:
+                feature, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ManifestError(f"{path}: feature {index}: geçersiz JSON ({exc.msg})") from None
+                fill()
+                continue
+            pos = end
+            yield f"feature {index}", _feature_record(feature)
+            index += 1
+            if pos > chunk_chars:
+                buf = buf[pos:]
+                pos = 0
+
+
+def _feature_record(feature):
+    if not isinstance(feature, dict):
+        return feature
+    props = feature.get("properties") or {}
+    geometry = feature.get("geometry") or {}
+    record = dict(props)
+    record.setdefault("id", feature.get("id"))
+    if geometry.get("type") == "Point":
+        record["pos"] = geometry.get("coordinates")
+    if "time_window" not in record and "tw_start" in record:
+        record["time_window"] = (record.get("tw_start"), record.get("tw_end"))
+    return record
+
+
+READERS = {"csv": iter_csv, "jsonl": iter_jsonl, "geojson": iter_geojson}
+
+
+# 2. Doğrulama
+
+
+def validate_record(record):
+    """
+    Ham kaydı (id, x, y, weight, priority, tw_start, tw_end) demetine çevirir.
+    Geçersiz kayıtta hatanın nedenini içeren ValueError fırlatır.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("kayıt bir nesne değil")
+    did = record.get("id")
+    if did is None or did == "":
+        raise ValueError("id eksik")
+    if isinstance(did, bool) or not isinstance(did, (int, float, str)):
+        raise ValueError(f"id sayı ya da metin olmalı ({did!r})")
+    if isinstance(did, str):
+        did = did.strip()
+        if did.lstrip("-").isdigit():
+            did = int(did)
+    elif isinstance(did, float) and did.is_integer():
+        did = int(did)
+
+    pos = record.get("pos")
+    if pos is None:
+        raise ValueError("konum (pos / x, y) eksik")
+    if not isinstance(pos, (list, tuple)) or len(pos) < 2:
+        raise ValueError(f"konum (pos) [x, y] çifti olmalı ({pos!r})")
+    x, y = _number(pos[0], "x"), _number(pos[1], "y")
+
+    weight = _number(record.get("weight"), "weight")
+    if weight <= 0:
+        raise ValueError(f"weight pozitif olmalı ({weight})")
+
+    priority = _number(record.get("priority"), "priority")
+    if not priority.is_integer():
+        raise ValueError(f"priority tamsayı olmalı ({priority})")
+
+    window = record.get("time_window")
+    if window is None:
+        raise ValueError("time_window eksik")
+    if not isinstance(window, (list, tuple)) or len(window) != 2:
+        raise ValueError(f"time_window [başlangıç, bitiş] çifti olmalı ({window!r})")
+    tw_start, tw_end = _number(window[0], "tw_start"), _number(window[1], "tw_end")
+    if tw_start > tw_end:
+        raise ValueError(f"time_window başlangıcı bitişinden büyük ({tw_start} > {tw_end})")
+
+    return did, x, y, weight, int(priority), tw_start, tw_end
+
+
+def _number(value, name):
+    if value is None or value == "":
+        raise ValueError(f"{name} eksik")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} sayı değil ({value!r})") from None
+    if not isfinite(number):
+        raise ValueError(f"{name} sonlu değil ({value!r})")
+    return number
+
+
+def iter_valid(path, fmt=None, errors="raise", report=None):
+    """
+    Doğrulanmış teslimat demetleri üreteci (tekrarlanan id'ler de geçersiz
+    sayılır). errors="skip" ise geçersiz kayıtlar atlanır ve report["skipped"]
+    artırılır; "raise" ise ManifestError fırlatılır.
+    """
+    fmt = fmt or detect_format(path)
+    seen = set()
+    for where, record in READERS[fmt](path):
+        try:
+            row = validate_record(record)
+            if row[0] in seen:
+                raise ValueError(f"tekrarlanan id ({row[0]!r})")
+        except ValueError as exc:
+            if errors != "skip":
+                raise ManifestError(f"{path}: {where}: {exc}") from None
+            if report is not None:
+                report["skipped"] += 1
+            continue
+        seen.add(row[0])
+        yield row
+
+
+# 3. Sütunlara yazma
+
+
+def iter_chunks(iterable, chunk_size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_table(rows, chunk_size=65536):
+    """
+    Doğrulanmış demet akışından (bkz. iter_valid) DeliveryTable kurar: her
+    parça doğrudan NumPy sütun parçalarına çevrilir, sonda birleştirilir.
+    """
+    ids, numeric = [], []
+    for chunk in iter_chunks(rows, chunk_size):
+        ids.extend(row[0] for row in chunk)
+        numeric.append(np.array([row[1:] for row in chunk], dtype=float).reshape(-1, 6))
+
+    values = np.concatenate(numeric) if numeric else np.empty((0, 6))
+    return DeliveryTable(
+        _id_array(ids),
+        positions=np.ascontiguousarray(values[:, 0:2]),
+        weights=np.ascontiguousarray(values[:, 2]),
+        priorities=values[:, 3].astype(np.int64),
+        window_start=np.ascontiguousarray(values[:, 4]),
+        window_end=np.ascontiguousarray(values[:, 5]),
+    )
+
+
+def _id_array(ids):
+    if all(type(did) is int for did in ids):
+        return np.array(ids, dtype=np.int64)
+    return np.array([str(did) for did in ids])
+
+
+# 4. Binary önbellek (memory-map)
+
+
+def cache_key(path, fmt, errors):
+    """Dosya yolu, boyutu, değişiklik zamanı ve okuma ayarlarından önbellek anahtarı."""
+    st = os.stat(path)
+    h = hashlib.sha1()
+    h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{fmt}|{errors}|{CACHE_VERSION}".encode())
+    return h.hexdigest()
+
+
+def save_table(table, path, skipped=0):
+    """
+    Tablo sütunlarını `path` altına .npy olarak yazar. Kayıt ve atlanan kayıt
+    sayıları meta.json'a yazılır (önbellekten yüklemede rapor için).
+    Süreç başına benzersiz bir geçici dizine yazılıp tek adımda yerine konur.
+    `path` bu arada başka bir süreç tarafından yazılmışsa geçici dizin atılır
+    ve False döner.
+    """
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=parent)
+    try:
+        for name in CACHE_ARRAYS:
+            np.save(os.path.join(tmp_path, name + ".npy"), getattr(table, name))
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"records": len(table), "skipped": skipped}, f)
+        # Yarım yazılmış önbellek okunmasın diye tek adımda yerine koy
+        os.replace(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if os.path.isdir(path):
+            return False
+        raise
+    return True
+
+
+def load_table(path, mmap_mode="r"):
+    """
+    `save_table` ile yazılmış sütunları memory-map ile açar.
+    Geri döner: (table, meta) — meta: {"records", "skipped"}
+    """
+    arrays = {
+        name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+        for name in CACHE_ARRAYS
+    }
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return DeliveryTable(arrays.pop("ids"), **arrays), meta
+
+
+# 5. Giriş noktası
+
+
+def load_deliveries(path, fmt=None, chunk_size=65536, errors="raise", cache_dir=None):
+    """
+    Teslimat manifestini DeliveryTable olarak yükler.
+
+    Parametreler:
+      - fmt        : "csv" | "jsonl" | "geojson" (None → uzantıdan)
+      - chunk_size : sütunlara tek seferde yazılan kayıt sayısı
+      - errors     : "raise" (ilk geçersiz kayıtta ManifestError) ya da "skip"
+      - cache_dir  : verilirse ayrıştırılmış sütunlar dosya yolu, boyutu ve
+                     değişiklik zamanına (+ okuma ayarlarına) göre
+                     anahtarlanmış alt dizine yazılır; sonraki yüklemeler
+                     ayrıştırma yapmadan memory-map ile açılır
+
+    Geri döner: (table, report)
+      report: {"path", "format", "records", "skipped", "bytes", "seconds",
+               "records_per_s", "mb_per_s", "cached"}
+    """
+    fmt = fmt or detect_format(path)
+    report = {
+        "path": path,
+        "format": fmt,
+        "records": 0,
+        "skipped": 0,
+        "bytes": os.path.getsize(path),
+        "seconds": 0.0,
+        "records_per_s": 0.0,
+        "mb_per_s": 0.0,
+        "cached": False,
+    }
+    t0 = time.perf_counter()
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, cache_key(path, fmt, errors))
+    if cache_path is not None and os.path.isdir(cache_path):
+        table, meta = load_table(cache_path)
+        report["skipped"] = meta["skipped"]
+        report["cached"] = True
+    else:
+        table = build_table(iter_valid(path, fmt, errors, report), chunk_size)
+        if cache_path is not None:
+            save_table(table, cache_path, report["skipped"])
+
+    elapsed = time.perf_counter() - t0
+    report["records"] = len(table)
+    report["seconds"] = elapsed
+    if elapsed > 0:
+        report["records_per_s"] = len(table) / elapsed
+        report["mb_per_s"] = report["bytes"] / 1e6 / elapsed
+    return table, report
+
+
+def format_report(report):
+    """Yükleme raporunun tek satırlık özeti."""
+    source = "önbellek" if report["cached"] else report["format"]
+    return (
+        f"{report['path']}: {report['records']} teslimat ({report['skipped']} atlandı), "
+        f"{report['seconds']:.2f} sn, {report['records_per_s']:,.0f} kayıt/sn, "
+        f"{report['mb_per_s']:.1f} MB/sn [{source}]"
+    )
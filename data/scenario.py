@@ -0,0 +1,338 @@
+# data/scenario.py
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+
+# Senaryo verisinin dizi tabanlı (struct-of-arrays) gösterimi.
+#
+# Teslimat ve drone alanları satır başına bir dict yerine sütun başına bir
+# NumPy dizisinde tutulur; dış ID'ler yoğun 0..n-1 indekslere eşlenir.
+# Mevcut kod dict beklediği için her satır, dizilerden okuyan salt-okunur bir
+# görünümle (DeliveryView / DroneView) sunulur: d["pos"], d["weight"],
+# d.get(...), dict(d) gibi kullanımlar aynen çalışır. Görünümler saklanmaz,
+# her erişimde üretilir (iki alanlı küçük bir nesne).
+
+
+class _RowView(Mapping):
+    """Tablonun i'inci satırının dict uyumlu, salt-okunur görünümü."""
+
+    __slots__ = ("table", "index")
+    FIELDS = ()
+    _GETTERS = {}
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        getter = self._GETTERS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self.table, self.index)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        # Süreçler arası gönderimde tüm tablo yerine düz dict
+        return (dict, (dict(self),))
+
+
+class DeliveryView(_RowView):
+    __slots__ = ()
+    FIELDS = ("id", "pos", "weight", "priority", "time_window")
+    _GETTERS = {
+        "id": lambda t, i: t.ids.item(i),
+        "pos": lambda t, i: (t.positions.item(i, 0), t.positions.item(i, 1)),
+        "weight": lambda t, i: t.weights.item(i),
+        "priority": lambda t, i: t.priorities.item(i),
+        "time_window": lambda t, i: (t.window_start.item(i), t.window_end.item(i)),
+    }
+
+
+class DroneView(_RowView):
+    __slots__ = ()
+    FIELDS = ("id", "max_weight", "battery", "speed", "start_pos")
+    _GETTERS = {
+        "id": lambda t, i: t.ids.item(i),
+        "max_weight": lambda t, i: t.max_weight.item(i),
+        "battery": lambda t, i: t.battery.item(i),
+        "speed": lambda t, i: t.speed.item(i),
+        "start_pos": lambda t, i: (t.start_pos.item(i, 0), t.start_pos.item(i, 1)),
+    }
+
+
+class _Table(Sequence):
+    """
+    Satır görünümlerinden oluşan dizi gibi davranan sütun tablosu.
+      - table[i]        : i'inci satırın görünümü (dilimler görünüm listesi döner)
+      - table.index_of  : {dış ID: yoğun indeks}
+      - table.by_id     : {dış ID: görünüm} gibi davranan eşleme (get / [] / in)
+    """
+
+    VIEW = _RowView
+    COLUMNS = ()
+
+    def __init__(self, ids, **columns):
+        self.ids = np.asarray(ids)
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.index_of = {did: i for i, did in enumerate(self.ids.tolist())}
+        self.by_id = _ById(self)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.VIEW(self, j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.VIEW(self, i)
+
+    def __iter__(self):
+        view = self.VIEW
+        for i in range(len(self)):
+            yield view(self, i)
+
+    def to_dicts(self):
+        """Eski biçim: satır başına bir dict listesi."""
+        return [dict(row) for row in self]
+
+    def nbytes(self):
+        """Sütun dizilerinin toplam bellek kullanımı (bayt)."""
+        return self.ids.nbytes + sum(getattr(self, name).nbytes for name in self.COLUMNS)
+
+
+class _ById(Mapping):
+    """Dış ID → satır görünümü eşlemesi (görünümler istek anında üretilir)."""
+
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, did):
+        return self.table.VIEW(self.table, self.table.index_of[did])
+
+    def get(self, did, default=None):
+        i = self.table.index_of.get(did)
+        return default if i is None else self.table.VIEW(self.table, i)
+
+    def __contains__(self, did):
+        return did in self.table.index_of
+
+    def __iter__(self):
+        return iter(self.table.index_of)
+
+    def __len__(self):
+        return len(self.table.index_of)
+
+
+class DeliveryTable(_Table):
+    """
+    Teslimat sütunları:
+      positions (n × 2), weights (n,), priorities (n,), window_start (n,), window_end (n,)
+    """
+
+    VIEW = DeliveryView
+    COLUMNS = ("positions", "weights", "priorities", "window_start", "window_end")
+
+    def __init__(self, ids, **columns):
+        super().__init__(ids, **columns)
+        self._rows = {}
+        self._records = None
+
+    def __getstate__(self):
+        # Türetilmiş önbellekler süreçler arası gönderilmez
+        state = self.__dict__.copy()
+        state["_rows"] = {}
+        state["_records"] = None
+        return state
+
+    def records(self):
+        """
+        {id: (pos, weight, time_window)} — maliyet çekirdeğinin sıcak döngüsü için
+        Python skalerleriyle, ilk çağrıda sütunlardan bir kez kurulur.
+        """
+        if self._records is None:
+            self._records = dict(zip(
+                self.ids.tolist(),
+                zip(
+                    map(tuple, self.positions.tolist()),
+                    self.weights.tolist(),
+                    zip(self.window_start.tolist(), self.window_end.tolist()),
+                ),
+            ))
+        return self._records
+
+    def to_dicts(self):
+        """Eski biçim: satır başına bir dict listesi (sütunlardan toplu kurulur)."""
+        return [
+            {"id": did, "pos": pos, "weight": w, "priority": p, "time_window": tw}
+            for did, pos, w, p, tw in zip(
+                self.ids.tolist(),
+                map(tuple, self.positions.tolist()),
+                self.weights.tolist(),
+                self.priorities.tolist(),
+                zip(self.window_start.tolist(), self.window_end.tolist()),
+            )
+        ]
+
+    def rows(self, max_weight=None):
+        """
+        Ağırlığı max_weight'i aşmayan teslimatların (id, pos, weight, priority)
+        demetleri (tablo sırasıyla). Kapasite sınıfı başına bir kez, dizi
+        süzgeciyle kurulup saklanır.
+        """
+        rows = self._rows.get(max_weight)
+        if rows is None:
+            if max_weight is None:
+                idx = np.arange(len(self))
+            else:
+                idx = np.flatnonzero(self.weights <= max_weight)
+            rows = list(zip(
+                self.ids[idx].tolist(),
+                map(tuple, self.positions[idx].tolist()),
+                self.weights[idx].tolist(),
+                self.priorities[idx].tolist(),
+            ))
+            self._rows[max_weight] = rows
+        return rows
+
+    @classmethod
+    def from_dicts(cls, deliveries):
+        deliveries = list(deliveries)
+        return cls(
+            [d["id"] for d in deliveries],
+            positions=_column([d["pos"] for d in deliveries]).reshape(-1, 2),
+            weights=np.array([d["weight"] for d in deliveries], dtype=float),
+            priorities=_column([d["priority"] for d in deliveries]),
+            window_start=_column([d["time_window"][0] for d in deliveries]),
+            window_end=_column([d["time_window"][1] for d in deliveries]),
+        )
+
+
+class DroneTable(_Table):
+    """Drone sütunları: max_weight, battery, speed (m,) ve start_pos (m × 2)."""
+
+    VIEW = DroneView
+    COLUMNS = ("max_weight", "battery", "speed", "start_pos")
+
+    def to_dicts(self):
+        return [
+            {"id": did, "max_weight": mw, "battery": b, "speed": sp, "start_pos": pos}
+            for did, mw, b, sp, pos in zip(
+                self.ids.tolist(),
+                self.max_weight.tolist(),
+                self.battery.tolist(),
+                self.speed.tolist(),
+                map(tuple, self.start_pos.tolist()),
+            )
+        ]
+
+    @classmethod
+    def from_dicts(cls, drones):
+        drones = list(drones)
+        return cls(
+            [dr["id"] for dr in drones],
+            max_weight=np.array([dr["max_weight"] for dr in drones], dtype=float),
+            battery=_column([dr["battery"] for dr in drones]),
+            speed=np.array([dr["speed"] for dr in drones], dtype=float),
+            start_pos=_column([dr["start_pos"] for dr in drones]).reshape(-1, 2),
+        )
+
+
+class Scenario:
+    """
+    Bir senaryonun dizi tabanlı kapsayıcısı:
+      - deliveries   : DeliveryTable (dict listesi yerine geçer)
+      - drones       : DroneTable
+      - no_fly_zones : zone dict listesi (az sayıda, geometri indeksi ayrıca kurulur)
+    """
+
+    def __init__(self, deliveries, drones, no_fly_zones=()):
+        self.deliveries = deliveries
+        self.drones = drones
+        self.no_fly_zones = list(no_fly_zones)
+
+    @classmethod
+    def from_dicts(cls, deliveries, drones, no_fly_zones=()):
+        return cls(
+            as_delivery_table(deliveries),
+            as_drone_table(drones),
+            no_fly_zones,
+        )
+
+    def to_dicts(self):
+        """(deliveries, drones, no_fly_zones) dict listeleri."""
+        return self.deliveries.to_dicts(), self.drones.to_dicts(), list(self.no_fly_zones)
+
+
+def as_delivery_table(deliveries):
+    """Zaten bir DeliveryTable ise aynen döner, değilse dict listesinden kurar."""
+    if isinstance(deliveries, DeliveryTable):
+        return deliveries
+    return DeliveryTable.from_dicts(deliveries)
+
+
+def as_drone_table(drones):
+    """Zaten bir DroneTable ise aynen döner, değilse dict listesinden kurar."""
+    if isinstance(drones, DroneTable):
+        return drones
+    return DroneTable.from_dicts(drones)
+
+
+def delivery_lookup(deliveries):
+    """
+    Teslimat ID → teslimat eşlemesi. DeliveryTable için hazır `by_id` döner
+    (her çağrıda sözlük kurulmaz); dict listesi için sözlük kurar.
+    """
+    by_id = getattr(deliveries, "by_id", None)
+    if by_id is not None:
+        return by_id
+    return {d["id"]: d for d in deliveries}
+
+
+def delivery_records(deliveries):
+    """
+    Teslimat ID → (pos, weight, time_window) eşlemesi. DeliveryTable'da
+    saklanan eşlemeyi döner; dict listesi için kurar.
+    """
+    records = getattr(deliveries, "records", None)
+    if records is not None:
+        return records()
+    return {d["id"]: (d["pos"], d["weight"], d["time_window"]) for d in deliveries}
+
+
+def delivery_rows(deliveries, max_weight=None):
+    """
+    Kapasiteye uyan teslimatlar için (id, pos, weight, priority) demet listesi.
+    DeliveryTable'da sınıf başına saklanan listeyi döner; dict listesi için kurar.
+    """
+    rows = getattr(deliveries, "rows", None)
+    if rows is not None:
+        return rows(max_weight)
+    return [
+        (d["id"], d["pos"], d["weight"], d["priority"])
+        for d in deliveries
+        if max_weight is None or d["weight"] <= max_weight
+    ]
+
+
+def _column(values):
+    """Değer listesinden sütun dizisi; tamsayı veriler tamsayı kalır (çıktılar değişmesin)."""
+    arr = np.asarray(values)
+    if arr.dtype.kind not in "iuf":
+        arr = arr.astype(float)
+    return arr
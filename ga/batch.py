@@ -0,0 +1,182 @@
+# ga/batch.py
+
+import numpy as np
+
+from core.matrices import pairwise_distance
+from core.nofly import as_zone_index
+
+
+class BatchEvaluator:
+    """
+    Tüm GA popülasyonunu tek seferde değerlendiren NumPy tabanlı fitness
+    hesaplayıcı. `calculate_energy_and_violations` + `fitness_function` ile
+    birebir aynı sonuçları üretir; ancak rota adımı başına tüm bireyler için
+    vektörel çalışır; geometri testleri NoFlyZoneIndex'in segment önbelleğinden
+    okunur.
+
+    Senaryo başına bir kez hazırlanan tablolar:
+      - _delivery_dist : n × n teslimat → teslimat mesafe matrisi
+      - _start_dist    : drone başlangıç konumu başına n uzunluklu mesafe satırı
+      - weights, tw_start, tw_end : teslimat dizileri (yoğun 0..n-1 indeks)
+      - zone_start, zone_end, _zone_bounds : zone aktiflik pencereleri ve bbox'ları
+
+    Segment → zone kesişimi için tablo tutulmaz (bellek n² × Z ile büyümez).
+    Her adımda popülasyonun segmentleri zone bbox'larıyla vektörel elenir.
+    Yalnızca bbox'ı bir zone'la çakışan segmentler için NoFlyZoneIndex'in
+    (önbellekli) segment bit maskesi okunur.
+    Zone indeksi sonradan değişirse (NoFlyZoneIndex.add_zone, `version` artışı)
+    zone dizileri bir sonraki evaluate() çağrısında yeniden kurulur.
+
+    Popülasyon, teslimat indekslerinden oluşan (pop_size × rota_uzunluğu)
+    tamsayı matrisi olarak verilir; `index_of` teslimat ID → indeks eşlemesidir.
+
+    matrices (ScenarioMatrices) verilirse mesafe tabloları yeniden hesaplanmaz,
+    doğrudan matrislerden alınır (teslimat sırası aynı olmalıdır).
+    """
+
+    def __init__(self, deliveries, no_fly_zones, matrices=None):
+        self.zone_index = as_zone_index(no_fly_zones)
+        self.delivery_ids = [d["id"] for d in deliveries]
+        self.index_of = {did: i for i, did in enumerate(self.delivery_ids)}
+        self.positions = [tuple(d["pos"]) for d in deliveries]
+        self._pos = np.array(self.positions, dtype=float).reshape(len(self.positions), 2)
+        self.weights = np.array([d["weight"] for d in deliveries], dtype=float)
+        self.tw_start = np.array([d["time_window"][0] for d in deliveries], dtype=float)
+        self.tw_end = np.array([d["time_window"][1] for d in deliveries], dtype=float)
+
+        # Teslimat → teslimat mesafeleri (drone'dan bağımsız) bir kez hesaplanır
+        self.matrices = matrices
+        if matrices is not None:
+            self._delivery_dist = np.asarray(matrices.distance)
+        else:
+            self._delivery_dist = pairwise_distance(self._pos, self._pos)
+        # Drone başlangıç konumuna göre mesafe satırları
+        self._start_dist = {}
+        self._init_zones()
+
+    def _init_zones(self):
+        """Zone aktiflik pencerelerini ve bbox dizisini kurar."""
+        self._zone_version = self.zone_index.version
+        zones = list(self.zone_index)
+        self.zone_start = np.array([z["active_time"][0] for z in zones], dtype=float)
+        self.zone_end = np.array([z["active_time"][1] for z in zones], dtype=float)
+        self._zone_bounds = np.array(self.zone_index.bounds, dtype=float).reshape(len(zones), 4)
+        self._zone_bits = 1 << np.arange(len(zones), dtype=object)
+        self._mask_rows = {}   # segment bit maskesi → (Z,) bool satırı
+
+    def _segment_zones(self, prev, nxt, start_pos):
+        """
+        (P × Z) segment → zone kesişim bayrakları. prev None ise segmentler
+        drone başlangıcından (start_pos) başlar.
+        """
+        b = self._pos[nxt]
+        if prev is None:
+            a = np.array(start_pos, dtype=float)[None, :]
+        else:
+            a = self._pos[prev]
+        lo = np.minimum(a, b)[:, None, :]
+        hi = np.maximum(a, b)[:, None, :]
+        zb = self._zone_bounds[None, :, :]
+        flags = ((lo[..., 0] <= zb[..., 2]) & (hi[..., 0] >= zb[..., 0])
+                 & (lo[..., 1] <= zb[..., 3]) & (hi[..., 1] >= zb[..., 1]))
+
+        # Bbox adaylarının kesin bayrakları segment maskesinden
+        rows = np.flatnonzero(flags.any(axis=1))
+        if rows.size:
+            positions = self.positions
+            segment_mask = self.zone_index.segment_mask
+            mask_rows = self._mask_rows
+            if prev is None:
+                sources = [start_pos] * rows.size
+            else:
+                sources = [positions[i] for i in prev[rows].tolist()]
+            exact = []
+            for p, j in zip(sources, nxt[rows].tolist()):
+                mask = segment_mask(p, positions[j])
+                row = mask_rows.get(mask)
+                if row is None:
+                    row = mask_rows[mask] = (mask & self._zone_bits) != 0
+                exact.append(row)
+            flags[rows] = exact
+        return flags
+
+    def _start_row(self, start_pos):
+        start_dist = self._start_dist.get(start_pos)
+        if start_dist is None:
+            if self.matrices is not None:
+                # Drone başlangıcı ise depot satırı, değilse vektörel hesaplanan satır
+                start_dist = np.asarray(self.matrices.row(start_pos), dtype=float)
+            else:
+                start_dist = pairwise_distance(np.array([start_pos], dtype=float), self._pos)[0]
+            self._start_dist[start_pos] = start_dist
+        return start_dist
+
+    def to_matrix(self, population):
+        """ID listelerinden oluşan popülasyonu indeks matrisine çevirir."""
+        index_of = self.index_of
+        return np.array([[index_of[did] for did in route] for route in population], dtype=np.intp)
+
+    def evaluate(self, pop, drone):
+        """
+        pop   : (P × L) teslimat indeks matrisi
+        drone : {"max_weight", "battery", "speed", "start_pos", ...}
+
+        Geri döner: (fitness, total_energy, violations, completed) dizileri (uzunluk P)
+        """
+        if self.zone_index.version != self._zone_version:
+            self._init_zones()
+        pop = np.asarray(pop, dtype=np.intp)
+        n_pop, length = pop.shape
+        start_pos = tuple(drone["start_pos"])
+        start_dist = self._start_row(start_pos)
+        weights = self.weights
+        battery_full = float(drone["battery"])
+        speed = drone["speed"]
+
+        prev = None   # None: drone başlangıcı
+        current_time = np.zeros(n_pop)
+        remaining_battery = np.full(n_pop, battery_full)
+        total_energy = np.zeros(n_pop)
+        violations = np.zeros(n_pop, dtype=np.int64)
+        completed = np.zeros(n_pop, dtype=np.int64)
+
+        for k in range(length):
+            nxt = pop[:, k]
+            if prev is None:
+                segment_distance = start_dist[nxt]
+            else:
+                segment_distance = self._delivery_dist[prev, nxt]
+            energy_needed = segment_distance * weights[nxt]
+
+            # Batarya yetmezse 15 dk şarj molası
+            recharge = energy_needed > remaining_battery
+            current_time = np.where(recharge, current_time + 15.0, current_time)
+            remaining_battery = np.where(recharge, battery_full, remaining_battery)
+
+            remaining_battery = remaining_battery - energy_needed
+            total_energy = total_energy + energy_needed
+
+            new_time = current_time + (segment_distance / speed) / 60.0
+
+            # Dinamik no-fly: segmenti kesen ve new_time anında aktif zone sayısı
+            if len(self.zone_start):
+                seg_zones = self._segment_zones(prev, nxt, start_pos)
+                active = (self.zone_start <= new_time[:, None]) & (new_time[:, None] <= self.zone_end)
+                violations += (seg_zones & active).sum(axis=1)
+
+            # Time window
+            in_window = (self.tw_start[nxt] <= new_time) & (new_time <= self.tw_end[nxt])
+            violations += ~in_window
+            completed += in_window
+
+            prev = nxt
+            current_time = new_time
+
+        # Kapasite ihlali olan rotalar skaler yoldaki gibi (0, 1, 0) döner
+        overweight = (weights[pop] > drone["max_weight"]).any(axis=1) if length else np.zeros(n_pop, bool)
+        total_energy[overweight] = 0.0
+        violations[overweight] = 1
+        completed[overweight] = 0
+
+        fitness = (completed * 50) - (total_energy * 0.1) - (violations * 1000)
+        return fitness, total_energy, violations, completed
@@ -0,0 +1,61 @@
+# ga/cache.py
+
+from collections import OrderedDict
+
+
+class FitnessCache:
+    """
+    GA fitness değerlendirmeleri için LRU önbellek.
+
+    Anahtar: (drone_id, rota tuple'ı). Değer: fitness_function çıktısı
+    (fitness, total_energy, violations, completed). Değerlendirme
+    deterministik olduğundan önbellek sonuçları değiştirmez; elitler ve
+    yinelenen çocuklar yeniden değerlendirilmez. Bir önbellek tek bir
+    senaryoya (teslimatlar + no-fly zone'lar) bağlıdır.
+
+    Parametreler:
+      maxsize : tutulacak en fazla rota sayısı (aşılınca en eski kullanılan atılır)
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    @staticmethod
+    def key(drone_id, route):
+        return (drone_id, tuple(route))
+
+    def get(self, key):
+        """Önbellekteki skorları döner; yoksa None."""
+        scores = self._entries.get(key)
+        if scores is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return scores
+
+    def put(self, key, scores):
+        self._entries[key] = scores
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+        }
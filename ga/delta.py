@@ -0,0 +1,134 @@
+# ga/delta.py
+
+from core.cost import delivery_step
+from core.nofly import as_zone_index
+from data.scenario import delivery_records
+from ga.optimizer import distance
+
+
+class DeltaEvaluator:
+    """
+    Tek bir drone için önek durumlu (prefix) fitness hesaplayıcı.
+    `fitness_function` ile birebir aynı sonuçları üretir. Farkı, her
+    değerlendirilen rotanın önek durumlarını tutmasıdır.
+
+    Rotanın k. önek durumu, ilk k teslimat simüle edildikten sonraki
+    (zaman, kalan batarya, toplam enerji, ihlal, tamamlanan) değerleridir.
+    Konum ve matris satırı rota[k-1]'den bilinir. Simülasyon yalnızca öneke
+    bağlıdır. Bu yüzden bir çocuk, ebeveynleriyle ortak en uzun önekin
+    sonundan devam edilerek değerlendirilir. Değişmeden aktarılan elitler
+    hiç yeniden simüle edilmez. Swap/OX çocukları yalnızca ilk farklı
+    indeksten itibaren simüle edilir.
+
+    evaluate() bir "kayıt" da döner: (rota kopyası, önek durumları listesi).
+    Kayıtlar sonraki nesilde çocukların `parents` argümanı olarak kullanılır.
+
+    start_time / start_battery verilirse simülasyon drone["start_pos"]'ta bu
+    zaman (dakika) ve kalan bataryayla başlar (uçuş ortasında yeniden planlama).
+    """
+
+    def __init__(self, deliveries, drone, no_fly_zones, matrices=None, start_time=0.0,
+                 start_battery=None):
+        self.records = delivery_records(deliveries)
+        self.zone_index = as_zone_index(no_fly_zones)
+        self.matrices = matrices
+        self.start_pos = drone["start_pos"]
+        self.battery = drone["battery"]
+        self.speed = drone["speed"]
+        # Kapasite kontrolü: rota yalnızca bu kümedeki ID'lerden oluşmalı
+        max_weight = drone["max_weight"]
+        self.valid = {did for did, rec in self.records.items() if rec[1] <= max_weight}
+        if start_battery is None:
+            start_battery = self.battery
+        self.initial = (start_time, start_battery, 0.0, 0, 0)
+
+    def evaluate(self, route, parents=()):
+        """
+        Geri döner: ((fitness, total_energy, violations, completed), kayıt)
+        parents: önceki evaluate() kayıtları (ebeveynler); None olanlar atlanır.
+        """
+        if not self.valid.issuperset(route):
+            # Geçersiz ID veya ağırlık aşımı → tek kapasite ihlali (önek yok)
+            return _scores((0.0, 0, 0.0, 1, 0)), None
+
+        n = len(route)
+        start, states = 0, None
+        for parent in parents:
+            if parent is None:
+                continue
+            ref, ref_states = parent
+            k = _common_prefix(route, ref)
+            if states is None or k > start:
+                start, states = k, ref_states
+            if start == n:
+                break
+
+        if states is None:
+            states = [self.initial]
+        else:
+            states = states[:start + 1]
+            if start == n:
+                return _scores(states[-1]), (route[:], states)
+
+        self._simulate(route, start, states)
+        return _scores(states[-1]), (route[:], states)
+
+    def _simulate(self, route, start, states):
+        """route[start:] adımlarını simüle edip önek durumlarını states'e ekler."""
+        records = self.records
+        zone_index = self.zone_index
+        matrices = self.matrices
+        battery = self.battery
+        speed = self.speed
+
+        current_time, remaining_battery, total_energy, violations, completed = states[start]
+        if start == 0:
+            current_pos = self.start_pos
+            current_idx = None
+        else:
+            current_pos = records[route[start - 1]][0]
+            current_idx = matrices.index_of[route[start - 1]] if matrices is not None else None
+
+        for did in route[start:]:
+            next_pos, weight, time_window = records[did]
+
+            if matrices is None:
+                segment_distance = distance(current_pos, next_pos)
+            else:
+                next_idx = matrices.index_of[did]
+                if current_idx is None:
+                    segment_distance = matrices.point_distance(current_pos, next_pos)
+                else:
+                    segment_distance = matrices.distance.item(current_idx, next_idx)
+                current_idx = next_idx
+
+            energy_needed, remaining_battery, current_time, seg_violations, seg_completed = (
+                delivery_step(
+                    current_pos, next_pos, weight, time_window, segment_distance,
+                    remaining_battery, current_time, battery, speed, zone_index
+                )
+            )
+            total_energy += energy_needed
+            violations += seg_violations
+            completed += seg_completed
+            current_pos = next_pos
+
+            states.append((current_time, remaining_battery, total_energy, violations, completed))
+
+
+def _common_prefix(a, b):
+    """a ve b'nin ortak en uzun önekinin uzunluğu."""
+    if a == b:
+        return len(a)
+    n = min(len(a), len(b))
+    k = 0
+    while k < n and a[k] == b[k]:
+        k += 1
+    return k
+
+
+def _scores(state):
+    """Önek durumundan fitness_function çıktısı."""
+    _, _, total_energy, violations, completed = state
+    fitness = (completed * 50) - (total_energy * 0.1) - (violations * 1000)
+    return fitness, total_energy, violations, completed
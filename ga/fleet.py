@@ -0,0 +1,202 @@
+# ga/fleet.py
+
+import random
+import time
+
+from core.csp_constraints import drone_capacity_check
+from core.nofly import as_zone_index
+from ga.optimizer import (
+    crossover,
+    fitness_function,
+    mutate,
+    population_diversity,
+    selection,
+    stop_reason,
+)
+
+
+# Filo düzeyinde GA: her birey hem teslimat → drone atamasını hem de her
+# dronun teslimat sırasını kodlar; her teslimat tam olarak bir kez planlanır.
+
+
+def feasible_drones(deliveries, drones):
+    """
+    Her teslimat için onu taşıyabilecek drone indekslerini döner (atama anında
+    `drone_capacity_check` ile filtrelenir): {delivery_id: [drone_idx, ...]}
+    """
+    feasible = {}
+    for d in deliveries:
+        feasible[d["id"]] = [
+            k for k, drone in enumerate(drones)
+            if drone_capacity_check([d["id"]], [d], drone)
+        ]
+    return feasible
+
+
+def decode(individual, n_drones):
+    """
+    Bireyi drone başına rotalara çözer. Birey: (order, assignment)
+      - order      : atanabilir teslimat ID'lerinin permütasyonu (dev tur)
+      - assignment : {delivery_id: drone_idx}
+    Her dronun rotası, dev turdaki kendi teslimatlarının sırasıdır.
+    """
+    order, assignment = individual
+    routes = [[] for _ in range(n_drones)]
+    for did in order:
+        routes[assignment[did]].append(did)
+    return routes
+
+
+def evaluate_fleet(individual, delivery_dict, drones, no_fly_zones, matrices=None):
+    """
+    Filo bireyinin toplam fitness'ı (drone fitness'larının toplamı) ve drone
+    başına (fitness, energy, violations, completed) listesi.
+    Her teslimat tek bir rotada yer aldığından maliyet teslimat sayısıyla ölçeklenir.
+    """
+    per_drone = []
+    total = 0.0
+    for drone, route in zip(drones, decode(individual, len(drones))):
+        route_deliveries = [delivery_dict[did] for did in route]
+        scores = fitness_function(route, route_deliveries, drone, no_fly_zones, matrices)
+        per_drone.append(scores)
+        total += scores[0]
+    return total, per_drone
+
+
+def _individual_key(individual):
+    order, assignment = individual
+    return tuple(order), tuple(assignment[did] for did in order)
+
+
+def random_individual(assignable, feasible, rng=random):
+    order = assignable[:]
+    rng.shuffle(order)
+    assignment = {did: rng.choice(feasible[did]) for did in assignable}
+    return order, assignment
+
+
+def fleet_crossover(parent1, parent2, rng=random):
+    """Sıra için OX, atama için uniform çaprazlama."""
+    order = crossover(parent1[0], parent2[0], rng)
+    assignment = {
+        did: (parent1[1][did] if rng.random() < 0.5 else parent2[1][did])
+        for did in order
+    }
+    return order, assignment
+
+
+def fleet_mutate(individual, feasible, mutation_rate=0.1, rng=random):
+    """Sırada swap mutasyonu + bir teslimatı başka uygun bir drone'a yeniden atama."""
+    order, assignment = individual
+    if len(order) > 1:
+        order = mutate(order, mutation_rate=mutation_rate, rng=rng)
+    if order and rng.random() < mutation_rate:
+        did = rng.choice(order)
+        assignment = dict(assignment)
+        assignment[did] = rng.choice(feasible[did])
+    return order, assignment
+
+
+def fleet_genetic_algorithm(deliveries, drones, no_fly_zones, pop_size=20, generations=10,
+                            seed=None, matrices=None, stop=None):
+    """
+    Filo düzeyinde ortak atama + sıralama GA'sı. genetic_algorithm ile aynı
+    şekilde (drone_results, summary) döner; farkları:
+      - her teslimat tek bir drone'a atanır (toplamlar çift sayılmaz),
+      - hiçbir dronun taşıyamadığı teslimatlar summary["unassigned"] altında listelenir,
+      - drone sonuçlarındaki "time", "generations", "stop_reason" ve "history"
+        ortak aramanındır (history: filo fitness'ının nesil başına
+        {"generation", "best", "mean", "diversity"} kaydı).
+    stop: ga.optimizer.stop_criteria çıktısı (None → tüm nesiller).
+    """
+    rng = random.Random(seed) if seed is not None else random
+    no_fly_zones = as_zone_index(no_fly_zones)
+    delivery_dict = {d["id"]: d for d in deliveries}
+
+    start_time_all = time.time()
+
+    feasible = feasible_drones(deliveries, drones)
+    assignable = [d["id"] for d in deliveries if feasible[d["id"]]]
+    unassigned = [d["id"] for d in deliveries if not feasible[d["id"]]]
+
+    population = [random_individual(assignable, feasible, rng) for _ in range(pop_size)]
+
+    best_individual = None
+    best_total = -float("inf")
+    best_per_drone = None
+    stall = 0
+    history = []
+    reason = None
+    generations_run = 0
+
+    for gen in range(1, generations + 1):
+        fitnesses = []
+        improved = False
+        for individual in population:
+            total, per_drone = evaluate_fleet(
+                individual, delivery_dict, drones, no_fly_zones, matrices
+            )
+            fitnesses.append(total)
+            if total > best_total:
+                improved = True
+                best_total = total
+                best_individual = individual
+                best_per_drone = per_drone
+
+        stall = 0 if improved else stall + 1
+        history.append({
+            "generation": gen,
+            "best": best_total,
+            "mean": sum(fitnesses) / len(fitnesses),
+            "diversity": population_diversity(population, key=_individual_key),
+        })
+
+        breeders, _ = selection(population, fitnesses, elit_rate=0.2)
+
+        new_pop = breeders[:]
+        while len(new_pop) < pop_size:
+            if len(breeders) > 1:
+                p1, p2 = rng.sample(breeders, 2)
+            else:
+                p1 = p2 = breeders[0]
+            child = fleet_crossover(p1, p2, rng) if len(assignable) > 1 else p1
+            child = fleet_mutate(child, feasible, mutation_rate=0.1, rng=rng)
+            new_pop.append(child)
+        population = new_pop
+
+        generations_run = gen
+        reason = stop_reason(stop, best_total, stall)
+        if reason is not None:
+            break
+
+    elapsed_all = time.time() - start_time_all
+
+    routes = decode(best_individual, len(drones)) if best_individual else [[] for _ in drones]
+    drone_results = []
+    for k, drone in enumerate(drones):
+        f_val, te, vio, comp = best_per_drone[k] if best_per_drone else (0.0, 0.0, 0, 0)
+        drone_results.append({
+            "drone_id": drone["id"],
+            "best_route": routes[k],
+            "best_fitness": f_val,
+            "energy": te,
+            "violations": vio,
+            "completed": comp,
+            "time": elapsed_all,
+            "generations": generations_run,
+            "stop_reason": reason or "generations",
+            "history": history
+        })
+
+    toplam_energy = sum(r["energy"] for r in drone_results)
+    summary = {
+        "total_deliveries": len(deliveries),
+        "total_completed": sum(r["completed"] for r in drone_results),
+        "total_energy": toplam_energy,
+        "avg_energy_per_drone": toplam_energy / len(drones) if drones else 0.0,
+        "total_violations": sum(r["violations"] for r in drone_results),
+        "total_time": elapsed_all,
+        "best_fitness": best_total,
+        "unassigned": unassigned
+    }
+    return drone_results, summary
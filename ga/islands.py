@@ -0,0 +1,117 @@
+# ga/islands.py
+
+import time
+
+from ga.optimizer import (
+    _worker_scenario,
+    cache_stats,
+    drone_result,
+    drone_rng,
+    init_evolution,
+    run_generations,
+)
+
+
+def _island_epoch_task(drone, state, generations, stop=None):
+    """Worker tarafı: bir adanın durumunu `generations` nesil ilerletir."""
+    sc = _worker_scenario
+    return run_generations(
+        state, drone, sc["deliveries"], sc["no_fly_zones"], generations, sc["evaluator"],
+        sc["matrices"], stop, sc["fitness_cache"], sc["local_search"]
+    )
+
+
+def migrate(states, migration_size):
+    """
+    Halka topolojisinde göç: ada k'nın son elit seçimindeki (selection) ilk
+    `migration_size` rota, ada (k+1)'in popülasyonunda çocukların yerine
+    (sondan başlayarak) geçer. Alıcının kendi elitleri korunur.
+    """
+    n = len(states)
+    if n < 2 or migration_size <= 0:
+        return states
+    outgoing = [[route[:] for route in st["breeders"][:migration_size]] for st in states]
+    for k, st in enumerate(states):
+        migrants = outgoing[(k - 1) % n]
+        room = len(st["population"]) - len(st["breeders"])
+        migrants = migrants[:max(0, room)]
+        if migrants:
+            st["population"][-len(migrants):] = migrants
+    return states
+
+
+def evolve_drone_islands(drone, deliveries, delivery_ids, no_fly_zones, pop_size, generations,
+                         islands, migration_interval, migration_size, seed,
+                         pool=None, evaluator=None, matrices=None, stop=None,
+                         fitness_cache=None, local_search=None, seed_routes=None,
+                         seed_fraction=0.2):
+    """
+    Tek bir drone için ada modeli GA'sı:
+      - `islands` alt popülasyon (her biri pop_size bireyli) bağımsız evrilir,
+      - her `migration_interval` nesilde elit rotalar halka şeklinde göç eder,
+      - pool verilirse her epoch'ta adalar ayrı süreçlerde çalışır (senaryo
+        verisi worker initializer'ı ile zaten gönderilmiştir; epoch başına yalnızca
+        ada durumu gider/gelir).
+
+    Ada k'nın RNG'si drone_rng(f"{seed}:{k}", drone_id) olduğundan sonuç
+    worker sayısından bağımsızdır. seed_routes verilirse her ada aynı
+    tohumlarla başlar (bkz. ga.optimizer.create_initial_population).
+
+    drone_results girdisine ek olarak "islands" anahtarı altında ada başına
+    yakınsama istatistikleri döner:
+      {"island", "best_fitness", "history": [epoch sonu en iyi fitness, ...]}
+
+    stop (bkz. ga.optimizer.stop_criteria) her adaya ayrı uygulanır; durmuş
+    adalar sonraki epoch'larda evrilmez (yalnızca göç alır/verir). Adalardan
+    biri hedef fitness'a ulaşınca ya da hepsi durunca evrim biter. Drone
+    sonucunun "history" / "generations" / "stop_reason" alanları en iyi adanınkidir;
+    "fitness_cache" tüm adaların toplamıdır.
+    """
+    start_time_drone = time.time()
+
+    states = [
+        init_evolution(
+            delivery_ids, pop_size, drone_rng(f"{seed}:{k}", drone["id"]), seed_routes,
+            seed_fraction
+        )
+        for k in range(islands)
+    ]
+    histories = [[] for _ in range(islands)]
+
+    remaining = generations
+    while remaining > 0:
+        step = min(migration_interval, remaining)
+        if pool is not None:
+            states = list(pool.map(
+                _island_epoch_task, [drone] * islands, states, [step] * islands, [stop] * islands
+            ))
+        else:
+            for st in states:
+                run_generations(
+                    st, drone, deliveries, no_fly_zones, step, evaluator, matrices, stop,
+                    fitness_cache, local_search
+                )
+        remaining -= step
+
+        for k, st in enumerate(states):
+            histories[k].append(st["best_fitness"])
+        reasons = [st["stop_reason"] for st in states]
+        if "target" in reasons or all(reasons):
+            break
+        if remaining > 0:
+            migrate(states, migration_size)
+
+    # En iyi ada (eşitlikte düşük indeks) drone sonucunu belirler
+    best = max(range(islands), key=lambda k: (states[k]["best_fitness"], -k))
+
+    end_time_drone = time.time()
+    result = drone_result(drone, states[best], end_time_drone - start_time_drone)
+    result["fitness_cache"] = cache_stats(
+        sum(st["cache_hits"] for st in states), sum(st["cache_misses"] for st in states)
+    )
+    result["local_search_moves"] = sum(st["local_search_moves"] for st in states)
+    result["islands"] = [
+        {"island": k, "best_fitness": st["best_fitness"], "history": histories[k]}
+        for k, st in enumerate(states)
+    ]
+    return result
@@ -0,0 +1,178 @@
+# ga/memetic.py
+
+import time
+
+from core.spatial import GridIndex
+from ga.optimizer import distance
+
+
+# Memetik yerel arama: GA elitlerine 2-opt ve Or-opt hamleleri uygulanır.
+#
+# Rotanın enerjisi E = Σ d(r[k-1], r[k]) × w[k] (r[-1] drone başlangıcı) olup
+# batarya/şarj durumundan bağımsızdır. Bu yüzden bir hamlenin enerji farkı ön
+# toplamlarla O(1)'de tam olarak hesaplanır:
+#   A[k] = Σ_{m≤k} d(r[m-1], r[m]) × w[m]     (ileri yön)
+#   B[k] = Σ_{1≤m≤k} d(r[m-1], r[m]) × w[m-1] (ters yön; 2-opt'ta ters çevrilen kesit)
+# Enerjiyi düşüren adaylar tam değerlendirmeyle (DeltaEvaluator, ilk değişen
+# indeksten itibaren) doğrulanır: zaman pencereleri ve no-fly ihlalleri
+# sıraya bağlı olduğundan hamle ancak fitness gerçekten artıyorsa kabul edilir.
+#
+# Adaylar komşu listelerinden üretilir: her teslimat için en yakın k teslimat.
+# Her hamle rotadaki a teslimatının hemen ardına komşusu c'yi getirir:
+#   - 2-opt  : a ile c arasındaki kesit ters çevrilir,
+#   - Or-opt : c'den başlayan 1–3 teslimatlık kesit a'nın ardına taşınır.
+
+OR_OPT_LENGTHS = (1, 2, 3)
+
+
+class LocalSearch:
+    """
+    Tek bir drone için 2-opt / Or-opt yerel araması.
+
+    delta: aynı drone ve senaryo için kurulmuş ga.delta.DeltaEvaluator
+    k: teslimat başına komşu sayısı
+    max_evals: improve() çağrısı başına en fazla tam değerlendirme sayısı
+    """
+
+    def __init__(self, delta, matrices=None, k=8, max_evals=64):
+        self.delta = delta
+        self.matrices = matrices
+        self.max_evals = max_evals
+        records = delta.records
+        self.weight = {did: rec[1] for did, rec in records.items()}
+        self.pos = {did: rec[0] for did, rec in records.items()}
+
+        ids = list(records)
+        grid = GridIndex([self.pos[did] for did in ids])
+        self.neighbours = {}
+        for did in ids:
+            near = [ids[j] for _, j in grid.nearest(self.pos[did], k + 1) if ids[j] != did]
+            self.neighbours[did] = near[:k]
+
+    def _dist(self, a, b):
+        """a → b mesafesi (a=None: drone başlangıcı)."""
+        matrices = self.matrices
+        if a is None:
+            if matrices is not None:
+                return matrices.point_distance(self.delta.start_pos, self.pos[b])
+            return distance(self.delta.start_pos, self.pos[b])
+        if matrices is not None:
+            return matrices.distance.item(matrices.index_of[a], matrices.index_of[b])
+        return distance(self.pos[a], self.pos[b])
+
+    def _prefix_sums(self, route):
+        weight = self.weight
+        A, B = [], []
+        a = b = 0.0
+        prev = None
+        for m, did in enumerate(route):
+            d = self._dist(prev, did)
+            a += d * weight[did]
+            if m:
+                b += d * weight[prev]
+            A.append(a)
+            B.append(b)
+            prev = did
+        return A, B
+
+    def _edge(self, route, A, m):
+        """m. kenarın (r[m-1] → r[m]) ileri yön enerjisi; m == n ise 0."""
+        if m >= len(route):
+            return 0.0
+        return A[m] - (A[m - 1] if m else 0.0)
+
+    def _two_opt_gain(self, route, A, B, i, j):
+        """route[i..j] ters çevrilirse enerji farkı (yeni − eski)."""
+        n = len(route)
+        prev = route[i - 1] if i else None
+        old = self._edge(route, A, i) + (A[j] - A[i]) + self._edge(route, A, j + 1)
+        new = self._dist(prev, route[j]) * self.weight[route[j]] + (B[j] - B[i])
+        if j + 1 < n:
+            new += self._dist(route[i], route[j + 1]) * self.weight[route[j + 1]]
+        return new - old
+
+    def _or_opt_gain(self, route, A, s, t, p):
+        """route[s..t] kesiti route[p]'nin ardına taşınırsa enerji farkı."""
+        n = len(route)
+        weight = self.weight
+        prev = route[s - 1] if s else None
+        old = self._edge(route, A, s) + self._edge(route, A, t + 1) + self._edge(route, A, p + 1)
+        new = self._dist(route[p], route[s]) * weight[route[s]]
+        if t + 1 < n:
+            new += self._dist(prev, route[t + 1]) * weight[route[t + 1]]
+        if p + 1 < n:
+            new += self._dist(route[t], route[p + 1]) * weight[route[p + 1]]
+        return new - old
+
+    def _candidates(self, route, A, B, where, i):
+        """route[i] için enerjiyi düşüren hamleler: (kazanç, yeni rota) üreteci."""
+        n = len(route)
+        a = route[i]
+        for c in self.neighbours.get(a, ()):
+            q = where.get(c)
+            if q is None or q == i + 1:
+                continue
+            # 2-opt: a → c kenarı için route[i+1..q] (ya da route[q+1..i]) ters çevrilir
+            if q > i + 1:
+                lo, hi = i + 1, q
+            elif q < i - 1:
+                lo, hi = q + 1, i
+            else:
+                lo = hi = None
+            if lo is not None:
+                gain = self._two_opt_gain(route, A, B, lo, hi)
+                if gain < 0:
+                    yield gain, route[:lo] + route[lo:hi + 1][::-1] + route[hi + 1:]
+            # Or-opt: route[q..q+L-1] kesiti a'nın ardına
+            for length in OR_OPT_LENGTHS:
+                t = q + length - 1
+                if t >= n or q <= i <= t:
+                    break
+                gain = self._or_opt_gain(route, A, q, t, i)
+                if gain < 0:
+                    segment = route[q:t + 1]
+                    rest = route[:q] + route[t + 1:]
+                    at = i + 1 if i < q else i + 1 - length
+                    rest[at:at] = segment
+                    yield gain, rest
+
+    def improve(self, route, record=None, deadline=None):
+        """
+        Rota konumlarını sırayla dolaşır; her konumda enerjiyi düşüren ilk aday
+        tam değerlendirilir ve fitness artıyorsa kabul edilir (ilk-iyileşme).
+        Arama, kabulden sonra aynı konumdan sürer ve rotanın tamamı iyileşmesiz
+        dolaşılınca ya da max_evals tam değerlendirme yapılınca biter.
+
+        Geri döner: (rota, skorlar, önek kaydı, kabul edilen hamle sayısı).
+        Kapasite ihlalli rotalar (kayıt yok) değiştirilmez. deadline
+        (time.perf_counter() değeri) verilirse arama o anda kesilir.
+        """
+        delta = self.delta
+        scores, record = delta.evaluate(route, (record,))
+        n = len(route)
+        if record is None or n < 3:
+            return route, scores, record, 0
+
+        evals = accepted = 0
+        A, B = self._prefix_sums(route)
+        where = {did: m for m, did in enumerate(route)}
+        i = idle = 0
+        while idle < n and evals < self.max_evals:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            for _, candidate in self._candidates(route, A, B, where, i):
+                cand_scores, cand_record = delta.evaluate(candidate, (record,))
+                evals += 1
+                if cand_scores[0] > scores[0]:
+                    route, scores, record = candidate, cand_scores, cand_record
+                    A, B = self._prefix_sums(route)
+                    where = {did: m for m, did in enumerate(route)}
+                    accepted += 1
+                    idle = -1
+                    break
+                if evals >= self.max_evals:
+                    break
+            else:
+                i = (i + 1) % n
+            idle += 1
+        return route, scores, record, accepted
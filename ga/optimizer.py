@@ -1,19 +1,25 @@
 # ga/optimizer.py
 
+import heapq
 import random
 import time
-from math import hypot
-from shapely.geometry import Polygon, LineString
+from concurrent.futures import ProcessPoolExecutor
+
+from core.cost import delivery_step
+from core.matrices import euclidean
+from core.nofly import as_zone_index
+from data.scenario import delivery_records
+from ga.cache import FitnessCache
 
 
 # 1. Yardımcı Fonksiyonlar
 
 
 def distance(p1, p2):
-    """İki nokta arasındaki Öklid mesafesi."""
-    return hypot(p1[0] - p2[0], p1[1] - p2[1])
+    """İki nokta arasındaki Öklid mesafesi (bkz. core.matrices.euclidean)."""
+    return euclidean(p1, p2)
 
-def calculate_energy_and_violations(route, deliveries, drone, no_fly_zones):
+def calculate_energy_and_violations(route, deliveries, drone, no_fly_zones, matrices=None):
     """
     Verilen rota boyunca:
       - Birikimli enerji tüketimini hesaplar
@@ -32,72 +38,64 @@ def calculate_energy_and_violations(route, deliveries, drone, no_fly_zones):
            bölgeyi kesiyorsa +1
          * Eğer teslimatın “time_window” dışına çıkarsa +1
     - completed_deliveries_count: time_window içinde başarılı teslimat sayısı
+
+    no_fly_zones bir NoFlyZoneIndex ya da ham zone listesi olabilir; sıcak
+    döngülerde indeksi bir kez kurup geçirmek gerekir. matrices (ScenarioMatrices)
+    verilirse segment mesafeleri önceden hesaplanmış matristen okunur.
     """
 
-    # ID → teslimat objesi sözlüğü
-    delivery_dict = {d["id"]: d for d in deliveries}
+    # ID → (pos, weight, time_window) eşlemesi (DeliveryTable'da hazır, yeniden kurulmaz)
+    records = delivery_records(deliveries)
+    zone_index = as_zone_index(no_fly_zones)
+    max_weight = drone["max_weight"]
+    battery = drone["battery"]
+    speed = drone["speed"]
 
     # 1) Kapasite kontrolü (CSP): rota içindeki tüm teslimatların ağırlığı ≤ max_weight olmalı
     for did in route:
-        d = delivery_dict.get(did)
-        if (d is None) or (d["weight"] > drone["max_weight"]):
+        rec = records.get(did)
+        if (rec is None) or (rec[1] > max_weight):
             # Geçersiz ID veya ağırlık aşımı → kapasite ihlali
             # Sadece 1 kere saymak yeterli
             return 0.0, 1, 0
 
     current_pos = drone["start_pos"]
-    remaining_battery = drone["battery"]
+    remaining_battery = battery
     current_time = 0.0  # dakika cinsinden simüle edilen zaman
 
     total_energy = 0.0
     violations = 0
     completed = 0
+    current_idx = None  # matris satırı (None: drone başlangıcı)
 
     for did in route:
-        d = delivery_dict.get(did)
-        if d is None:
+        rec = records.get(did)
+        if rec is None:
             # Geçersiz ID → violation
             violations += 1
             continue
 
-        next_pos = d["pos"]
-        weight = d["weight"]
-
-        # Euclidean mesafe
-        segment_distance = distance(current_pos, next_pos)
-
-        # Hesaplanan enerji ihtiyacı (distance × weight)
-        energy_needed = segment_distance * weight
-
-        # Batarya yetmezse, 15 dakika şarj molası ekle
-        if energy_needed > remaining_battery:
-            current_time += 15.0
-            remaining_battery = drone["battery"]
+        next_pos, weight, time_window = rec
 
-        # Enerjiyi düş ve birikimli enerjiye ekle
-        remaining_battery -= energy_needed
-        total_energy += energy_needed
-
-        # Geçiş için geçen süre (dakika)
-        travel_time = (segment_distance / drone["speed"]) / 60.0
-        new_time = current_time + travel_time
-
-        # Dinamik No-Fly Zone Kontrolü
-        path_line = LineString([current_pos, next_pos])
-        for zone in no_fly_zones:
-            sz, ez = zone["active_time"]
-            # Eğer tam bu yeni_time içinde zone aktifse kesişim kontrolü yap
-            if sz <= new_time <= ez:
-                poly = Polygon(zone["coordinates"])
-                if path_line.intersects(poly):
-                    violations += 1
-
-        # Time Window Kontrolü
-        tw_start, tw_end = d["time_window"]
-        if not (tw_start <= new_time <= tw_end):
-            violations += 1
+        # Euclidean mesafe (varsa önceden hesaplanmış matristen)
+        if matrices is None:
+            segment_distance = distance(current_pos, next_pos)
         else:
-            completed += 1
+            next_idx = matrices.index_of[did]
+            if current_idx is None:
+                segment_distance = matrices.point_distance(current_pos, next_pos)
+            else:
+                segment_distance = matrices.distance.item(current_idx, next_idx)
+            current_idx = next_idx
+
+        # Enerji, şarj molası, no-fly ve time-window kontrolü (ortak çekirdek)
+        energy_needed, remaining_battery, new_time, seg_violations, seg_completed = delivery_step(
+            current_pos, next_pos, weight, time_window, segment_distance,
+            remaining_battery, current_time, battery, speed, zone_index
+        )
+        total_energy += energy_needed
+        violations += seg_violations
+        completed += seg_completed
 
         # Pozisyon ve zamanı güncelle
         current_pos = next_pos
@@ -105,7 +103,7 @@ def calculate_energy_and_violations(route, deliveries, drone, no_fly_zones):
 
     return total_energy, violations, completed
 
-def fitness_function(route, deliveries, drone, no_fly_zones):
+def fitness_function(route, deliveries, drone, no_fly_zones, matrices=None):
     """
     PDF’deki Fitness formülü (Bölüm 4’den uyarlanmış):
       Fitness = (tamamlanan × 50)
@@ -115,7 +113,7 @@ def fitness_function(route, deliveries, drone, no_fly_zones):
     Geri döner: (fitness_value, total_energy, violations, completed)
     """
     total_energy, violations, completed = calculate_energy_and_violations(
-        route, deliveries, drone, no_fly_zones
+        route, deliveries, drone, no_fly_zones, matrices
     )
     fitness = (completed * 50) - (total_energy * 0.1) - (violations * 1000)
     return fitness, total_energy, violations, completed
@@ -124,14 +122,30 @@ def fitness_function(route, deliveries, drone, no_fly_zones):
 # 2. GA Yardımcıları
 
 
-def create_initial_population(delivery_ids, pop_size):
+def create_initial_population(delivery_ids, pop_size, rng=random, seed_routes=None,
+                              seed_fraction=0.2):
     """
     Rastgele permütasyonlardan oluşan başlangıç popülasyonunu üretir.
+    rng: `random` modülü ya da bir `random.Random` örneği (tekrarlanabilirlik için).
+
+    seed_routes (delivery_ids permütasyonları; bkz. ga.seeding.complete_route)
+    verilirse popülasyonun ~seed_fraction kadarı (en az 1 birey) tohumlardan
+    sırayla doldurulur: her tohumun ilk kopyası aynen, sonraki kopyaları tek
+    swap mutasyonuyla eklenir; kalan bireyler rastgeledir. Tohum yoksa RNG
+    dizisi ve popülasyon öncekiyle aynıdır.
     """
     pop = []
-    for _ in range(pop_size):
+    if seed_routes and seed_fraction > 0:
+        n_seeded = min(pop_size, max(1, round(seed_fraction * pop_size)))
+        for k in range(n_seeded):
+            route = seed_routes[k % len(seed_routes)]
+            if k < len(seed_routes) or len(route) < 2:
+                pop.append(route[:])
+            else:
+                pop.append(mutate(route, mutation_rate=1.0, rng=rng))
+    for _ in range(pop_size - len(pop)):
         candidate = delivery_ids[:]  # kopya
-        random.shuffle(candidate)
+        rng.shuffle(candidate)
         pop.append(candidate)
     return pop
 
@@ -139,114 +153,555 @@ def selection(population, fitnesses, elit_rate=0.2):
     """
     Elit selection: fitness’e göre en iyi %elit_rate bireyi seçer.
     Geri döner: (breeders, best_fit_value)
+    Eşit fitness'lı bireyler popülasyondaki sıralarını korur; tüm popülasyon
+    sıralanmaz, yalnızca ilk elite_count indeks seçilir.
     """
-    paired = list(zip(population, fitnesses))
-    paired.sort(key=lambda x: x[1], reverse=True)
-    elite_count = max(1, int(elit_rate * len(paired)))
-    breeders = [item[0] for item in paired[:elite_count]]
-    best_fit = paired[0][1]
+    elite_count = max(1, int(elit_rate * len(population)))
+    top = heapq.nlargest(elite_count, range(len(population)), key=fitnesses.__getitem__)
+    breeders = [population[k] for k in top]
+    best_fit = fitnesses[top[0]]
     return breeders, best_fit
 
-def crossover(parent1, parent2):
+def crossover(parent1, parent2, rng=random, out=None):
     """
-    Order Crossover (OX) uygulayarak yeni rota üretir.
+    Order Crossover (OX) uygulayarak yeni rota üretir: parent1[i..j] kesiti
+    yerinde kalır, kalan konumlar soldan sağa parent2'nin kesitte olmayan
+    elemanlarıyla (parent2 sırasıyla) doldurulur. Kesit üyeliği bir kümeyle
+    denetlendiği için O(n)'dir.
+
+    out verilirse (parent'larla aynı uzunlukta bir liste) çocuk yeni liste
+    ayırmak yerine onun üzerine yazılır ve out döner.
     """
     size = len(parent1)
-    i, j = sorted(random.sample(range(size), 2))
-    child = [None] * size
-    child[i:j+1] = parent1[i:j+1]
-    idx = 0
-    for x in parent2:
-        if x not in child:
-            while child[idx] is not None:
-                idx += 1
-            child[idx] = x
-    return child
-
-def mutate(route, mutation_rate=0.1):
+    i, j = sorted(rng.sample(range(size), 2))
+    segment = parent1[i:j+1]
+    in_segment = set(segment)
+    rest = [x for x in parent2 if x not in in_segment]
+    if out is None:
+        return rest[:i] + segment + rest[i:]
+    out[:i] = rest[:i]
+    out[i:j+1] = segment
+    out[j+1:] = rest[i:]
+    return out
+
+def mutate(route, mutation_rate=0.1, rng=random, inplace=False, kind="swap"):
     """
-    Swap mutasyonu: mutation_rate ile iki index yer değiştirir.
+    mutation_rate olasılıkla iki index (i, j) seçilir ve:
+      - kind="swap"      : route[i] ile route[j] yer değiştirir,
+      - kind="inversion" : route[min..max] kesiti ters çevrilir.
+    inplace=True ise route'un kendisi değiştirilir (kopya yok).
     """
-    r = route[:]
-    if random.random() < mutation_rate:
-        i, j = random.sample(range(len(r)), 2)
-        r[i], r[j] = r[j], r[i]
+    r = route if inplace else route[:]
+    if rng.random() < mutation_rate:
+        i, j = rng.sample(range(len(r)), 2)
+        if kind == "swap":
+            r[i], r[j] = r[j], r[i]
+        elif kind == "inversion":
+            if i > j:
+                i, j = j, i
+            r[i:j+1] = r[i:j+1][::-1]
+        else:
+            raise ValueError(f"Bilinmeyen mutasyon türü: {kind}")
     return r
 
 
 # 3. Genetic Algorithm (GA) Ana Fonksiyonu
 
 
-def genetic_algorithm(deliveries, drones, no_fly_zones, pop_size=20, generations=10):
+def drone_rng(seed, drone_id):
+    """
+    Drone başına deterministik RNG. Aynı (seed, drone_id) çifti, hangi süreçte
+    ve kaç worker ile çalışılırsa çalışılsın aynı rastgele diziyi üretir.
+    """
+    return random.Random(f"{seed}:{drone_id}")
+
+
+def init_evolution(delivery_ids, pop_size, rng=random, seed_routes=None, seed_fraction=0.2):
+    """
+    Bir GA evriminin sürdürülebilir durumunu oluşturur. Durum, nesiller
+    arasında (ve süreçler arasında) taşınabilir bir dict'tir:
+      population, breeders (son elit seçim), rng ve şimdiye kadarki en iyi birey.
+    seed_routes / seed_fraction: bkz. create_initial_population.
+    """
+    return {
+        "population": create_initial_population(
+            delivery_ids, pop_size, rng, seed_routes, seed_fraction
+        ),
+        "pop_size": pop_size,
+        "rng": rng,
+        "breeders": [],
+        "generation": 0,
+        "best_route": None,
+        "best_fitness": -float("inf"),
+        "energy": 0.0,
+        "violations": 0,
+        "completed": 0,
+        "stall": 0,
+        "history": [],
+        "stop_reason": None,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "local_search_moves": 0,
+    }
+
+
+def stop_criteria(time_limit_s=None, stall_generations=None, target_fitness=None):
+    """
+    Erken durdurma ölçütleri (hepsi None ise None döner → her zaman tüm nesiller):
+      - time_limit_s      : şu andan itibaren duvar saati bütçesi (sn); dict'e
+                            mutlak son tarih ("deadline", time.time()) olarak yazılır
+      - stall_generations : en iyi fitness bu kadar nesil iyileşmezse dur
+      - target_fitness    : en iyi fitness bu değere ulaşınca dur
+    Ölçütler her nesil sonunda denetlenir; en az bir nesil her zaman çalışır.
+    """
+    if time_limit_s is None and stall_generations is None and target_fitness is None:
+        return None
+    return {
+        "deadline": time.time() + time_limit_s if time_limit_s is not None else None,
+        "stall_generations": stall_generations,
+        "target_fitness": target_fitness,
+    }
+
+
+def stop_reason(stop, best_fitness, stall):
+    """Durma nedeni ("target", "stall", "time_limit") ya da devam için None."""
+    if stop is None:
+        return None
+    if stop["target_fitness"] is not None and best_fitness >= stop["target_fitness"]:
+        return "target"
+    if stop["stall_generations"] is not None and stall >= stop["stall_generations"]:
+        return "stall"
+    if stop["deadline"] is not None and time.time() >= stop["deadline"]:
+        return "time_limit"
+    return None
+
+
+def share_deadline(stop, remaining_runs):
+    """
+    Sıralı çalışmada kalan süre bütçesini kalan evrimler arasında eşit böler:
+    sıradaki evrimin son tarihi şimdi + kalan süre / remaining_runs olur.
+    """
+    if stop is None or stop["deadline"] is None:
+        return stop
+    now = time.time()
+    return dict(stop, deadline=now + max(0.0, stop["deadline"] - now) / remaining_runs)
+
+
+def population_diversity(population, key=tuple):
+    """Popülasyondaki farklı bireylerin oranı (1.0 → hepsi farklı)."""
+    if not population:
+        return 0.0
+    return len({key(individual) for individual in population}) / len(population)
+
+
+def _score_population(population, drone, evaluator, delta, lineage, cache):
+    """
+    Popülasyonun skorlarını (fitness, energy, violations, completed) döner:
+    (scores, records, evaluated). records yalnızca delta yolunda dolu olan
+    önek kayıtlarıdır; evaluated gerçekten değerlendirilen birey sayısıdır.
+
+    cache (FitnessCache) verilirse önbellekteki rotalar ve aynı nesildeki
+    yinelenen rotalar yeniden değerlendirilmez. Önbellekten gelen bir rotanın
+    önek kaydı, aynı rotaya sahip ebeveyninden (ör. elitin kendisi) alınır.
+    """
+    n = len(population)
+    scores = [None] * n
+    records = [None] * n
+    pending = []      # değerlendirilecek indeksler
+    duplicates = []   # (indeks, aynı rotanın bu nesildeki ilk indeksi)
+    if cache is None:
+        pending = range(n)
+    else:
+        keys = [cache.key(drone["id"], route) for route in population]
+        first = {}
+        for k, key in enumerate(keys):
+            if key in first:
+                duplicates.append((k, first[key]))
+                continue
+            first[key] = k
+            hit = cache.get(key)
+            if hit is None:
+                pending.append(k)
+                continue
+            scores[k] = hit
+            if delta is not None:
+                route = population[k]
+                records[k] = next(
+                    (rec for rec in lineage[k] if rec is not None and rec[0] == route), None
+                )
+
+    if evaluator is not None:
+        if pending:
+            batch = evaluator.evaluate(evaluator.to_matrix([population[k] for k in pending]), drone)
+            for k, score in zip(pending, zip(*(column.tolist() for column in batch))):
+                scores[k] = score
+    else:
+        for k in pending:
+            scores[k], records[k] = delta.evaluate(population[k], lineage[k])
+
+    if cache is not None:
+        for k in pending:
+            cache.put(keys[k], scores[k])
+        for k, j in duplicates:
+            scores[k] = scores[j]
+            records[k] = records[j]
+    return scores, records, len(pending)
+
+
+def run_generations(state, drone, deliveries, no_fly_zones, generations, evaluator=None,
+                    matrices=None, stop=None, fitness_cache=None, local_search=None):
+    """
+    Verilen evrim durumunu en fazla `generations` nesil ilerletir (durum yerinde
+    güncellenir). Her nesil state["history"]'ye {"generation", "best", "mean",
+    "diversity"} eklenir. stop (bkz. stop_criteria) ölçütlerinden biri
+    sağlanırsa state["stop_reason"] yazılır ve evrim orada biter; durmuş bir
+    durum için sonraki çağrılar hiçbir şey yapmaz.
+
+    evaluator verilmezse bireyler `ga.delta.DeltaEvaluator` ile önek durumlu
+    değerlendirilir: elitler yeniden simüle edilmez, çocuklar ebeveynleriyle
+    ortak en uzun önekten devam eder (fitness_function ile aynı sonuçlar).
+    fitness_cache (ga.cache.FitnessCache) verilirse daha önce değerlendirilmiş
+    rotalar önbellekten okunur; state["cache_hits"] / state["cache_misses"]
+    bu dronun önlenen / yapılan değerlendirme sayılarını biriktirir.
+
+    local_search ({"k", "max_evals", "elites"}; bkz. ga.memetic.LocalSearch)
+    verilirse her nesilde seçilen ilk `elites` elit, üremeden önce 2-opt /
+    Or-opt hamleleriyle iyileştirilir; kabul edilen hamleler
+    state["local_search_moves"]'ta birikir. RNG dizisini değiştirmez.
+    """
+    rng = state["rng"]
+    pop_size = state["pop_size"]
+    population = state["population"]
+    # Çift tampon: yeni nesil, iki nesil önceki satırların üzerine yazılır
+    # (nesil başına rota listesi ayrılmaz)
+    spare = [population[0][:] for _ in range(pop_size)] if population else []
+
+    delta = searcher = None
+    if evaluator is None or local_search is not None:
+        from ga.delta import DeltaEvaluator
+        delta = DeltaEvaluator(deliveries, drone, no_fly_zones, matrices)
+    if local_search is not None:
+        from ga.memetic import LocalSearch
+        searcher = LocalSearch(delta, matrices, local_search["k"], local_search["max_evals"])
+    # Her birey için ebeveyn önek kayıtları (ilk nesilde yok)
+    lineage = [()] * len(population)
+
+    for gen in range(1, generations + 1):
+        if state["stop_reason"] is not None:
+            break
+        scores, records, evaluated = _score_population(
+            population, drone, evaluator, delta, lineage, fitness_cache
+        )
+        state["cache_hits"] += len(population) - evaluated
+        state["cache_misses"] += evaluated
+        if delta is not None:
+            prefix_of = {id(route): rec for route, rec in zip(population, records)}
+
+        fitnesses = []
+        improved = False
+        for route, (f_val, te, vio, comp) in zip(population, scores):
+            fitnesses.append(f_val)
+
+            if f_val > state["best_fitness"]:
+                improved = True
+                state["best_fitness"] = f_val
+                state["best_route"] = route[:]
+                state["energy"] = te
+                state["violations"] = vio
+                state["completed"] = comp
+
+        # Elit selection
+        breeders, _ = selection(population, fitnesses, elit_rate=0.2)
+
+        # Memetik aşama: en iyi elitler 2-opt / Or-opt ile yerinde iyileştirilir
+        if searcher is not None:
+            for route in breeders[:local_search["elites"]]:
+                new_route, (f_val, te, vio, comp), rec, moves = searcher.improve(
+                    route, prefix_of.get(id(route))
+                )
+                if not moves:
+                    continue
+                route[:] = new_route
+                prefix_of[id(route)] = rec
+                state["local_search_moves"] += moves
+                if f_val > state["best_fitness"]:
+                    improved = True
+                    state["best_fitness"] = f_val
+                    state["best_route"] = route[:]
+                    state["energy"] = te
+                    state["violations"] = vio
+                    state["completed"] = comp
+
+        state["stall"] = 0 if improved else state["stall"] + 1
+        state["history"].append({
+            "generation": state["generation"] + 1,
+            "best": state["best_fitness"],
+            "mean": sum(fitnesses) / len(fitnesses),
+            "diversity": population_diversity(population),
+        })
+
+        # Yeni popülasyon (elit kopyaları + crossover + mutate) yedek tampona yazılır
+        for k, route in enumerate(breeders):
+            spare[k][:] = route
+        if delta is not None:
+            lineage = [(prefix_of[id(route)],) for route in breeders]
+        for k in range(len(breeders), pop_size):
+            p1, p2 = rng.sample(breeders, 2)
+            child = crossover(p1, p2, rng, out=spare[k])
+            mutate(child, mutation_rate=0.1, rng=rng, inplace=True)
+            if delta is not None:
+                lineage.append((prefix_of[id(p1)], prefix_of[id(p2)]))
+        population, spare = spare, population
+
+        state["breeders"] = breeders
+        state["generation"] += 1
+        state["stop_reason"] = stop_reason(stop, state["best_fitness"], state["stall"])
+
+    state["population"] = population
+    return state
+
+
+def drone_result(drone, state, elapsed):
+    """Evrim durumundan drone_results girdisini üretir."""
+    return {
+        "drone_id": drone["id"],
+        "best_route": state["best_route"],
+        "best_fitness": state["best_fitness"],
+        "energy": state["energy"],
+        "violations": state["violations"],
+        "completed": state["completed"],
+        "time": elapsed,
+        "generations": state["generation"],
+        "stop_reason": state["stop_reason"] or "generations",
+        "history": state["history"],
+        "fitness_cache": cache_stats(state["cache_hits"], state["cache_misses"]),
+        "local_search_moves": state["local_search_moves"]
+    }
+
+
+def cache_stats(hits, misses):
+    """Drone sonucundaki fitness önbelleği özeti."""
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+
+def evolve_drone(drone, deliveries, delivery_ids, no_fly_zones, pop_size, generations,
+                 rng=random, evaluator=None, matrices=None, stop=None, fitness_cache=None,
+                 local_search=None, seed_routes=None, seed_fraction=0.2):
+    """
+    Tek bir drone için GA evrimini çalıştırır ve drone_results girdisini döner:
+      {"drone_id", "best_route", "best_fitness", "energy", "violations",
+       "completed", "time", "generations", "stop_reason", "history",
+       "fitness_cache": {"hits", "misses", "hit_rate"}, "local_search_moves"}
+    """
+    start_time_drone = time.time()
+
+    # Başlangıç popülasyonu + tüm nesiller (ya da erken durma)
+    state = init_evolution(delivery_ids, pop_size, rng, seed_routes, seed_fraction)
+    run_generations(
+        state, drone, deliveries, no_fly_zones, generations, evaluator, matrices, stop,
+        fitness_cache, local_search
+    )
+
+    end_time_drone = time.time()
+    return drone_result(drone, state, end_time_drone - start_time_drone)
+
+
+# Worker süreçlerinde senaryo verisi (initializer ile worker başına bir kez gönderilir)
+_worker_scenario = {}
+
+
+def _init_worker(deliveries, no_fly_zones, pop_size, generations, vectorized, matrices,
+                 stop=None, fitness_cache_size=None, local_search=None, seed_fraction=0.2):
+    zone_index = as_zone_index(no_fly_zones)
+    evaluator = None
+    if vectorized:
+        from ga.batch import BatchEvaluator
+        evaluator = BatchEvaluator(deliveries, zone_index, matrices)
+    _worker_scenario.update(
+        deliveries=deliveries,
+        delivery_ids=[d["id"] for d in deliveries],
+        no_fly_zones=zone_index,
+        pop_size=pop_size,
+        generations=generations,
+        evaluator=evaluator,
+        matrices=matrices,
+        stop=stop,
+        fitness_cache=FitnessCache(fitness_cache_size) if fitness_cache_size else None,
+        local_search=local_search,
+        seed_fraction=seed_fraction,
+    )
+
+
+def _evolve_drone_task(drone, seed, seed_routes=None):
+    sc = _worker_scenario
+    return evolve_drone(
+        drone, sc["deliveries"], sc["delivery_ids"], sc["no_fly_zones"],
+        sc["pop_size"], sc["generations"],
+        rng=drone_rng(seed, drone["id"]), evaluator=sc["evaluator"], matrices=sc["matrices"],
+        stop=sc["stop"], fitness_cache=sc["fitness_cache"], local_search=sc["local_search"],
+        seed_routes=seed_routes, seed_fraction=sc["seed_fraction"]
+    )
+
+
+def genetic_algorithm(deliveries, drones, no_fly_zones, pop_size=20, generations=10,
+                      vectorized=False, workers=None, seed=None,
+                      islands=None, migration_interval=5, migration_size=2,
+                      mode="per_drone", matrices=None,
+                      time_limit_s=None, stall_generations=None, target_fitness=None,
+                      fitness_cache_size=4096, memetic=False, memetic_k=8, memetic_max_evals=64,
+                      memetic_elites=1, seed_routes=None, nearest_neighbour_seed=False,
+                      seed_fraction=0.2):
     """
     Her drone için ayrı ayrı GA çalıştırır. Geri döner:
       - drone_results: her drone’ya ait dict’ler
       - summary: toplam metrikler dict
+
+    vectorized=True ise her nesilde tüm popülasyon `ga.batch.BatchEvaluator`
+    ile tek NumPy geçişinde değerlendirilir (skaler yolla birebir aynı sonuçlar).
+
+    workers > 1 ise droneler bir ProcessPoolExecutor üzerinde paralel evrilir;
+    senaryo verisi worker başına bir kez (initializer ile) gönderilir.
+    seed verilirse her drone `drone_rng(seed, id)` ile kendi RNG'sini kullanır ve
+    sonuçlar worker sayısından bağımsız olarak aynıdır. seed=None ve workers
+    kullanılmıyorsa global `random` akışı (önceki davranış) kullanılır.
+
+    islands > 1 ise her drone `ga.islands` ada modeliyle evrilir: `islands` adet
+    pop_size'lık alt popülasyon, her `migration_interval` nesilde
+    `migration_size` elit rota göç ettirir. workers ile birlikte kullanılırsa
+    droneler sırayla, her dronun adaları paralel çalışır; drone sonuçlarına ada
+    başına yakınsama istatistikleri ("islands") eklenir.
+
+    mode="fleet" ise her dronun tüm teslimatları ayrı ayrı planlaması yerine
+    `ga.fleet.fleet_genetic_algorithm` ile ortak atama + sıralama yapılır
+    (her teslimat tam bir kez; pop_size, generations ve seed kullanılır).
+
+    matrices (core.matrices.ScenarioMatrices) verilirse tüm fitness yolları
+    mesafeleri yeniden hesaplamak yerine bu matrislerden okur.
+
+    Erken durdurma (bkz. stop_criteria): time_limit_s tüm çağrının duvar saati
+    bütçesidir (sıralı modda kalan süre kalan droneler arasında eşit bölünür,
+    paralel modda tüm droneler ortak son tarihe kadar evrilir);
+    stall_generations ve target_fitness her dronun evrimine ayrı uygulanır.
+    Seed'li çalışmada stall/target ile durma deterministiktir: sonuç, aynı
+    seed'le tam çalıştırmanın o nesildeki durumudur. Drone sonuçlarında
+    "generations" (çalışan nesil), "stop_reason" ("generations", "target",
+    "stall", "time_limit") ve nesil başına "history" ({"generation", "best",
+    "mean", "diversity"}) döner.
+
+    fitness_cache_size > 0 ise (drone_id, rota) anahtarlı bir LRU fitness
+    önbelleği (ga.cache.FitnessCache; paralel modda worker başına bir tane)
+    elitlerin ve yinelenen çocukların yeniden değerlendirilmesini önler. Drone
+    sonuçlarındaki "fitness_cache" ({"hits", "misses", "hit_rate"}) önlenen
+    değerlendirme oranını gösterir; None/0 önbelleği kapatır. fleet modunda
+    kullanılmaz.
+
+    memetic=True ise her nesilde en iyi `memetic_elites` elit, üremeden önce
+    ga.memetic.LocalSearch ile 2-opt / Or-opt hamleleriyle iyileştirilir
+    (teslimat başına `memetic_k` komşu, elit başına en fazla
+    `memetic_max_evals` tam değerlendirme). Drone sonuçlarındaki
+    "local_search_moves" kabul edilen hamle sayısıdır.
+
+    Sıcak başlangıç: seed_routes ({drone_id: [rota, ...]}; ör.
+    ga.seeding.seed_routes_from(önceki_plan, greedy_sonuçları)) ve/veya
+    nearest_neighbour_seed=True (drone başlangıcından en yakın komşu rotası)
+    verilirse her dronun başlangıç popülasyonunun ~seed_fraction kadarı bu
+    tohumlardan kurulur (eksik teslimatlar sona eklenir), kalanı rastgeledir.
     """
+    stop = stop_criteria(time_limit_s, stall_generations, target_fitness)
+    local_search = None
+    if memetic:
+        local_search = {"k": memetic_k, "max_evals": memetic_max_evals, "elites": memetic_elites}
+
+    if mode == "fleet":
+        from ga.fleet import fleet_genetic_algorithm
+        return fleet_genetic_algorithm(
+            deliveries, drones, no_fly_zones, pop_size=pop_size, generations=generations,
+            seed=seed, matrices=matrices, stop=stop
+        )
+    if mode != "per_drone":
+        raise ValueError(f"Bilinmeyen GA modu: {mode}")
+
     # Tüm teslimat ID’lerini çıkar
     delivery_ids = [d["id"] for d in deliveries]
 
-    drone_results = []
-    toplam_energy = 0.0
-    toplam_completed = 0
-    toplam_violations = 0
-    start_time_all = time.time()
-
-    for drone in drones:
-        # Başlangıç popülasyonu
-        population = create_initial_population(delivery_ids, pop_size)
-
-        best_for_drone = None
-        best_fitness_for_drone = -float("inf")
-        best_energy = 0.0
-        best_violations = 0
-        best_completed = 0
+    # No-fly geometri indeksi tüm droneler ve nesiller için bir kez kurulur
+    no_fly_zones = as_zone_index(no_fly_zones)
 
-        start_time_drone = time.time()
+    start_time_all = time.time()
 
-        for gen in range(1, generations + 1):
-            fitnesses = []
-            for route in population:
-                f_val, te, vio, comp = fitness_function(
-                    route, deliveries, drone, no_fly_zones
+    # Drone başına tohum rotalar (delivery_ids permütasyonlarına tamamlanmış)
+    drone_seeds = [None] * len(drones)
+    if seed_routes or nearest_neighbour_seed:
+        from ga.seeding import complete_route, nearest_neighbour_route
+        for k, drone in enumerate(drones):
+            routes = list((seed_routes or {}).get(drone["id"], ()))
+            if nearest_neighbour_seed:
+                routes.append(nearest_neighbour_route(drone["start_pos"], deliveries))
+            drone_seeds[k] = [complete_route(route, delivery_ids) for route in routes] or None
+
+    island_mode = islands is not None and islands > 1
+    parallel = workers is not None and workers > 1
+
+    # Paralel/ada yolunda drone başına tohum şarttır; verilmediyse global RNG'den türet
+    if (parallel or island_mode) and seed is None:
+        seed = random.randrange(2 ** 32)
+
+    evaluator = None
+    if vectorized and not parallel:
+        from ga.batch import BatchEvaluator
+        evaluator = BatchEvaluator(deliveries, no_fly_zones, matrices)
+
+    # Paralel modda her worker kendi önbelleğini kullanır (initializer'da kurulur)
+    fitness_cache = None
+    if fitness_cache_size and not parallel:
+        fitness_cache = FitnessCache(fitness_cache_size)
+
+    pool = None
+    if parallel:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(deliveries, no_fly_zones, pop_size, generations, vectorized, matrices,
+                      stop, fitness_cache_size, local_search, seed_fraction),
+        )
+
+    try:
+        if island_mode:
+            from ga.islands import evolve_drone_islands
+            drone_results = [
+                evolve_drone_islands(
+                    drone, deliveries, delivery_ids, no_fly_zones, pop_size, generations,
+                    islands, migration_interval, migration_size, seed,
+                    pool=pool, evaluator=evaluator, matrices=matrices,
+                    stop=share_deadline(stop, len(drones) - k), fitness_cache=fitness_cache,
+                    local_search=local_search, seed_routes=drone_seeds[k],
+                    seed_fraction=seed_fraction
                 )
-                fitnesses.append(f_val)
-
-                if f_val > best_fitness_for_drone:
-                    best_fitness_for_drone = f_val
-                    best_for_drone = route[:]
-                    best_energy = te
-                    best_violations = vio
-                    best_completed = comp
-
-            # Elit selection
-            breeders, _ = selection(population, fitnesses, elit_rate=0.2)
-
-            # Yeni popülasyon (elit + crossover + mutate)
-            new_pop = breeders[:]
-            while len(new_pop) < pop_size:
-                p1, p2 = random.sample(breeders, 2)
-                child = crossover(p1, p2)
-                child = mutate(child, mutation_rate=0.1)
-                new_pop.append(child)
-            population = new_pop
-
-        end_time_drone = time.time()
-        elapsed_drone = end_time_drone - start_time_drone
-
-        drone_results.append({
-            "drone_id": drone["id"],
-            "best_route": best_for_drone,
-            "best_fitness": best_fitness_for_drone,
-            "energy": best_energy,
-            "violations": best_violations,
-            "completed": best_completed,
-            "time": elapsed_drone
-        })
-
-        toplam_energy += best_energy
-        toplam_completed += best_completed
-        toplam_violations += best_violations
+                for k, drone in enumerate(drones)
+            ]
+        elif pool is not None:
+            drone_results = list(pool.map(
+                _evolve_drone_task, drones, [seed] * len(drones), drone_seeds
+            ))
+        else:
+            drone_results = []
+            for k, drone in enumerate(drones):
+                rng = drone_rng(seed, drone["id"]) if seed is not None else random
+                drone_results.append(evolve_drone(
+                    drone, deliveries, delivery_ids, no_fly_zones, pop_size, generations,
+                    rng=rng, evaluator=evaluator, matrices=matrices,
+                    stop=share_deadline(stop, len(drones) - k), fitness_cache=fitness_cache,
+                    local_search=local_search, seed_routes=drone_seeds[k],
+                    seed_fraction=seed_fraction
+                ))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    toplam_energy = sum(r["energy"] for r in drone_results)
+    toplam_completed = sum(r["completed"] for r in drone_results)
+    toplam_violations = sum(r["violations"] for r in drone_results)
 
     end_time_all = time.time()
     elapsed_all = end_time_all - start_time_all
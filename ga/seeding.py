@@ -0,0 +1,58 @@
+# ga/seeding.py
+
+from core.spatial import GridIndex
+
+
+# GA başlangıç popülasyonu için tohum (seed) rotalar: A*–Greedy rotaları, bir
+# önceki plan ya da en yakın komşu kurulumları. Drone başına GA rotası tüm
+# teslimatların bir permütasyonudur; tohumlar complete_route ile bu biçime
+# getirilir (bilinmeyen / tekrarlanan ID'ler atılır, eksikler sona eklenir).
+
+
+def complete_route(route, delivery_ids):
+    """
+    route'u delivery_ids'in bir permütasyonuna tamamlar: route'taki geçerli
+    ID'ler sırasıyla korunur, rotada olmayanlar delivery_ids sırasıyla eklenir.
+    """
+    valid = set(delivery_ids)
+    seen = set()
+    head = []
+    for did in route:
+        if did in valid and did not in seen:
+            seen.add(did)
+            head.append(did)
+    return head + [did for did in delivery_ids if did not in seen]
+
+
+def nearest_neighbour_route(start_pos, deliveries):
+    """
+    Drone başlangıcından itibaren her adımda en yakın ziyaret edilmemiş
+    teslimata giden rota (ID listesi). GridIndex ile ~O(n) sorgu.
+    """
+    ids = [d["id"] for d in deliveries]
+    grid = GridIndex([d["pos"] for d in deliveries])
+    route = []
+    current = start_pos
+    while len(grid):
+        _, i = grid.nearest(current, 1)[0]
+        grid.remove(i)
+        route.append(ids[i])
+        current = grid.points[i]
+    return route
+
+
+def seed_routes_from(*plans):
+    """
+    Plan sonuçlarından (genetic_algorithm ya da greedy_plan drone_results
+    listeleri) drone başına tohum rotalar: {drone_id: [rota, ...]}.
+    GA sonuçlarında "best_route", greedy sonuçlarında "route_ids" kullanılır.
+    """
+    seeds = {}
+    for plan in plans:
+        for result in plan or ():
+            route = result.get("best_route")
+            if route is None:
+                route = result.get("route_ids")
+            if route:
+                seeds.setdefault(result["drone_id"], []).append(list(route))
+    return seeds
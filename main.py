@@ -1,11 +1,18 @@
 # main.py
 
+import os
 import random
 import time
 
-from core.graph import build_graph
 from core.astar import a_star
+from core.matrices import ScenarioMatrices
 from core.csp_constraints import drone_capacity_check, no_fly_violation
+from core.greedy import greedy_plan
+from core import instrument as instrumentation
+from core.instrument import PhaseProfiler
+from core.nofly import NoFlyZoneIndex
+from core.visibility import VisibilityGraph
+from data.scenario import Scenario
 
 # Leaflet tabanlı görselleştirme:
 from core.visualization import generate_leaflet_html
@@ -21,6 +28,7 @@ from data.veriler import (
 )
 
 from ga.optimizer import genetic_algorithm
+from ga.seeding import seed_routes_from
 
 
 def run_scenario(
@@ -30,7 +38,23 @@ def run_scenario(
     no_fly_zones,
     use_astar_demo=True,
     pop_size=20,
-    generations=10
+    generations=10,
+    workers=None,
+    ga_mode="per_drone",
+    ga_time_limit_s=None,
+    ga_stall_generations=None,
+    ga_target_fitness=None,
+    ga_seed_greedy=False,
+    ga_seed_nn=False,
+    ga_seed_fraction=0.2,
+    previous_plan=None,
+    matrix_cache_dir=None,
+    astar_k=None,
+    path_cache_size=1024,
+    path_cache_bucket=5.0,
+    instrument=False,
+    profile=None,
+    profile_dir=None
 ):
     """
     Genel senaryo çalıştırma fonksiyonu:
@@ -38,6 +62,30 @@ def run_scenario(
       - drones, deliveries, no_fly_zones: O senaryoda kullanılacak listeler
       - use_astar_demo: A* demo’su yapılıp yapılmayacağı (True/False)
       - pop_size, generations: GA parametreleri
+      - workers: GA ve A*–Greedy'nin droneleri paralel çalıştıracağı süreç sayısı
+                 (None → sıralı)
+      - ga_mode: "per_drone" (her drone tüm teslimatları planlar) ya da "fleet"
+                 (ortak atama; her teslimat tek bir drone'a)
+      - ga_time_limit_s, ga_stall_generations, ga_target_fitness: GA erken
+                 durdurma ölçütleri (süre bütçesi, iyileşmeyen nesil sayısı,
+                 hedef fitness; None → tüm nesiller çalışır)
+      - ga_seed_greedy, ga_seed_nn, previous_plan: GA sıcak başlangıcı; A*–Greedy
+                 rotaları (greedy GA'dan önce çalıştırılır), en yakın komşu
+                 rotaları ve/veya önceki bir çalıştırmanın GA drone sonuçları
+                 başlangıç popülasyonunun ~ga_seed_fraction kadarını oluşturur
+      - matrix_cache_dir: mesafe matrislerinin diskte önbelleklenip memory-map
+                          ile yükleneceği dizin (None → her çalıştırmada hesapla)
+      - astar_k: verilirse A* tam graf yerine drone kapasitesine göre filtrelenmiş
+                 k-en-yakın-komşu seyrek grafı üzerinde açılır (None → tam graf)
+      - path_cache_size, path_cache_bucket: A*–Greedy döngüsündeki LRU yol
+                 önbelleğinin boyutu ve kalkış zamanı kuantizasyonu (dakika)
+      - instrument: True ise sıcak yol fonksiyonları (A*, heuristic, fitness,
+                 crossover/mutate, geometri...) sayılıp süreleri ölçülür ve
+                 sonda özet tablo yazdırılır (False iken ek maliyet yoktur)
+      - profile: None, "cprofile" ya da "sampling"; her faz (setup, astar_demo,
+                 ga, greedy, visualization) ayrı profillenir
+      - profile_dir: verilirse faz profilleri <profile_dir>/<senaryo>/ altına
+                 yazılır (yoksa raporlar ekrana basılır)
     """
     num_drones = len(drones)
     num_deliveries = len(deliveries)
@@ -47,225 +95,197 @@ def run_scenario(
     print(f"{num_drones} drone, {num_deliveries} teslimat, {num_zones} no-fly zone")
     print("═" * 60)
 
-    # 1) Graf oluştur (adjacency list)
-    graph = build_graph(deliveries)
-    print(" Graf oluşturuldu. (Adjacency-list hazır)")
-
-    # 2) A* demo (ilk drone → ilk delivery)
-    if use_astar_demo and num_drones > 0 and num_deliveries > 0:
-        demo_drone = drones[0]
-        demo_delivery = deliveries[0]
-        astar_route = a_star(
-            demo_drone["start_pos"],
-            demo_delivery["pos"],
-            deliveries,
-            no_fly_zones,
-            demo_drone["max_weight"],
-            demo_drone["speed"]
-        )
-        print(f" A* ile rota (Drone {demo_drone['id']} → Delivery {demo_delivery['id']}): {astar_route}")
-
-    print()
-
-    # 3) GA çalıştır
-    print(" Genetic Algorithm (GA) çalıştırılıyor…\n")
-    start_time_all = time.time()
-    drone_results_ga, summary_ga = genetic_algorithm(
-        deliveries,
-        drones,
-        no_fly_zones,
-        pop_size=pop_size,
-        generations=generations
+    # Ölçüm ve faz profili (ikisi de kapalıyken hiçbir şey yapmaz)
+    scenario_slug = scenario_name.replace(' ', '_').lower()
+    profiler = PhaseProfiler(
+        profile, os.path.join(profile_dir, scenario_slug) if profile_dir else None
     )
-    end_time_all = time.time()
-    elapsed_all = end_time_all - start_time_all
-
-    # 4) Drone sonuçlarını GA için yazdır
-    for dr in drone_results_ga:
-        d_id = dr["drone_id"]
-        route_ids = dr["best_route"]
-        fitness = dr["best_fitness"]
-        energy = dr["energy"]
-        vio = dr["violations"]
-        comp = dr["completed"]
-        t_drone = dr["time"]
-
-        print(f" Drone ID {d_id} (GA) sonuçları:")
-        print(f"   - En İyi Rota (Teslimat ID'leri): {route_ids}")
-        print(f"   - Fitness                    : {fitness:.2f}")
-        print(f"   - Enerji                     : {energy:.2f}")
-        print(f"   - İhlal                      : {vio}")
-        print(f"   - Tamamlanan                 : {comp}/{num_deliveries} ({(comp/num_deliveries)*100:.1f}%)")
-        print(f"   - Çalışma Süresi             : {t_drone:.2f} sn\n")
-
-    # 5) Toplam GA metrikleri
-    total_deliveries = summary_ga["total_deliveries"]
-    total_completed = summary_ga["total_completed"]
-    total_energy = summary_ga["total_energy"]
-    avg_energy = summary_ga["avg_energy_per_drone"]
-    total_violations = summary_ga["total_violations"]
-    total_time = summary_ga["total_time"]
-
-    print("─" * 60)
-    print(f"{scenario_name} (GA) – TOPLAM METRİKLER")
-    print(f"  • Toplam Teslimat Sayısı      : {total_deliveries}")
-    print(f"  • Toplam Tamamlanan           : {total_completed} ({(total_completed/total_deliveries)*100:.1f}%)")
-    print(f"  • Toplam Enerji Tüketimi      : {total_energy:.2f}")
-    print(f"  • Ortalama Enerji/Drone       : {avg_energy:.2f}")
-    print(f"  • Toplam İhlal Sayısı         : {total_violations}")
-    print(f"  • Toplam GA Çalışma Süresi    : {total_time:.2f} sn")
-    print("─" * 60 + "\n")
-
-    # >>> 6) A*–Greedy hesaplamaları (her drone için)
-    print(" A*–Greedy rotaları hesaplanıyor…\n")
-    from shapely.geometry import LineString, Polygon
-    from math import hypot
-
-    # Teslimat ID → obje haritası (kolay erişim)
-    delivery_dict = { d["id"]: d for d in deliveries }
-
-    a_star_results = []  # Her drone için sonuçları tutacak
-
-    for drone in drones:
-        d_id = drone["id"]
-        max_w = drone["max_weight"]
-        speed = drone["speed"]
-        start_pos = drone["start_pos"]
-        current_pos = start_pos
-        current_time = 0.0             # dakika cinsinden
-        remaining_battery = drone["battery"]
-        remaining_deliveries = set(d["id"] for d in deliveries)
-        route_taken = []
-        total_energy_astar = 0.0
-        violations_astar = 0
-        completed_astar = 0
-
-        t0 = time.time()
-        # “En yakın teslimat” greediyle döngü
-        while True:
-            # 1) Ağırlık kapasitesini aşmayan hâli hazırdaki teslimatlar
-            candidates = [
-                delivery_dict[tid] 
-                for tid in remaining_deliveries 
-                if delivery_dict[tid]["weight"] <= max_w
-            ]
-            if not candidates:
-                break
-
-            # 2) Mevcut konumdan en yakın coğrafi konuma sahip teslimatı bul
-            nearest = min(
-                candidates,
-                key=lambda d: ((current_pos[0] - d["pos"][0])**2 + (current_pos[1] - d["pos"][1])**2)
+    if instrument:
+        instrumentation.reset()
+        instrumentation.enable()
+    try:
+        profiler.start("setup")
+
+        # 0) Dizi tabanlı senaryo (teslimat/drone dict'leri yerine sütun dizileri ve
+        #    dict uyumlu satır görünümleri) ve no-fly geometri indeksi
+        scenario = Scenario.from_dicts(deliveries, drones, no_fly_zones)
+        deliveries, drones = scenario.deliveries, scenario.drones
+        no_fly_zones = NoFlyZoneIndex(no_fly_zones)
+
+        # 1) Mesafe / süre matrisleri (tüm planlayıcılar paylaşır)
+        matrices = ScenarioMatrices.from_scenario(deliveries, drones, cache_dir=matrix_cache_dir)
+        print(" Mesafe matrisleri oluşturuldu. (Teslimat ve drone başlangıç satırları hazır)")
+
+        # 2) A* demo (ilk drone → ilk delivery)
+        profiler.start("astar_demo")
+        if use_astar_demo and num_drones > 0 and num_deliveries > 0:
+            demo_drone = drones[0]
+            demo_delivery = deliveries[0]
+            astar_route = a_star(
+                demo_drone["start_pos"],
+                demo_delivery["pos"],
+                deliveries,
+                no_fly_zones,
+                demo_drone["max_weight"],
+                demo_drone["speed"],
+                matrices
             )
-            nearest_id = nearest["id"]
-            nearest_pos = nearest["pos"]
-            weight = nearest["weight"]
-            tw_start, tw_end = nearest["time_window"]
-
-            # 3) A* ile bu noktanın "pos"una giden segment listesini bul
-            path = a_star(
-                current_pos,
-                nearest_pos,
+            print(f" A* ile rota (Drone {demo_drone['id']} → Delivery {demo_delivery['id']}): {astar_route}")
+
+            # Aynı uçlar için zone köşelerinden geçen engelsiz geometrik rota
+            visibility = VisibilityGraph(no_fly_zones)
+            free_route = visibility.shortest_path(demo_drone["start_pos"], demo_delivery["pos"])
+            print(f" Görünürlük grafı ile engelsiz rota: {free_route}")
+
+        print()
+
+        # A*–Greedy planlayıcısı (GA tohumu istenirse GA'dan önce çalışır)
+        def run_greedy():
+            return greedy_plan(
                 deliveries,
+                drones,
                 no_fly_zones,
-                max_w,
-                speed
+                matrices=matrices,
+                astar_k=astar_k,
+                path_cache_size=path_cache_size,
+                path_cache_bucket=path_cache_bucket,
+                workers=workers
             )
-            # Eğer A* hedefe hiç ulaşamadıysa, bu teslimatı listeden çıkar ve döngüyü sürdür
-            if not path:
-                remaining_deliveries.remove(nearest_id)
-                continue
-
-            # 4) Mesafeyi hesapla (yalnızca son segment için)
-            dx = current_pos[0] - nearest_pos[0]
-            dy = current_pos[1] - nearest_pos[1]
-            dist_to = hypot(dx, dy)
-            energy_needed = dist_to * weight
-
-            # Batarya yetersizse 15 dk şarj ekle
-            if energy_needed > remaining_battery:
-                current_time += 15.0
-                remaining_battery = drone["battery"]
-            remaining_battery -= energy_needed
-            total_energy_astar += energy_needed
-
-            # Geçiş süresi (dakika)
-            travel_time = (dist_to / speed) / 60.0
-            new_time = current_time + travel_time
-
-            # Dinamik No-Fly kontrolü (yalnızca son segment)
-            seg_line = LineString([current_pos, nearest_pos])
-            for zone in no_fly_zones:
-                sz, ez = zone["active_time"]
-                if sz <= new_time <= ez:
-                    poly = Polygon(zone["coordinates"])
-                    if seg_line.intersects(poly):
-                        violations_astar += 1
-
-            # Time-window kontrolü
-            if not (tw_start <= new_time <= tw_end):
-                violations_astar += 1
-            else:
-                completed_astar += 1
-
-            # Teslimatı tamamladık: rota listesine ekle, kalan setten çıkar
-            route_taken.append(nearest_id)
-            remaining_deliveries.remove(nearest_id)
-
-            # Konum ve zamanı güncelle
-            current_pos = nearest_pos
-            current_time = new_time
-
-        t1 = time.time()
-        elapsed_astar = t1 - t0
-
-        a_star_results.append({
-            "drone_id": d_id,
-            "route_ids": route_taken,
-            "energy": total_energy_astar,
-            "violations": violations_astar,
-            "completed": completed_astar,
-            "time": elapsed_astar
-        })
-
-    # 7) A*–Greedy sonuçlarını ekrana bas
-    print("──────────── A*–Greedy Sonuçları ────────────")
-    for res in a_star_results:
-        did = res["drone_id"]
-        print(f" Drone ID {did} (A*):")
-        print(f"   - Rota (Teslimat ID'leri) : {res['route_ids']}")
-        print(f"   - Enerji                 : {res['energy']:.2f}")
-        print(f"   - İhlal                  : {res['violations']}")
-        print(f"   - Tamamlanan             : {res['completed']}/{num_deliveries} ({(res['completed']/num_deliveries)*100:.1f}%)")
-        print(f"   - Çalışma Süresi         : {res['time']:.2f} sn\n")
-
-    # 8) A*–Greedy toplam metrikler
-    total_a_completed = sum(r["completed"] for r in a_star_results)
-    total_a_energy = sum(r["energy"] for r in a_star_results)
-    total_a_viol = sum(r["violations"] for r in a_star_results)
-    total_a_time = sum(r["time"] for r in a_star_results)
-
-    print("──────────── A*–Greedy TOPLAM METRİKLER ────────────")
-    print(f"  • Toplam Tamamlanan      : {total_a_completed} ({(total_a_completed/(num_deliveries*num_drones))*100:.1f}%)")
-    print(f"  • Toplam Enerji          : {total_a_energy:.2f}")
-    print(f"  • Toplam İhlal           : {total_a_viol}")
-    print(f"  • Toplam Çalışma Süresi  : {total_a_time:.2f} sn\n")
-
-    # 9) GA toplam metriklere özet (daha önce ekledik–tekrarlamıyoruz)
-    #    … (summary_ga zaten yazıldı)
-
-    # 10) Leaflet için GA rotalarını yaz (mevcut kod)
-    delivery_positions = { d["id"]: d["pos"] for d in deliveries }
-    ga_drone_routes = []
-    for dr in drone_results_ga:
-        coords = [drones[dr["drone_id"] - 1]["start_pos"]]
-        for tid in dr["best_route"]:
-            coords.append(delivery_positions[tid])
-        ga_drone_routes.append(coords)
-
-    html_filename = f"{scenario_name.replace(' ', '_').lower()}_ga_routes.html"
-    output_path = generate_leaflet_html(ga_drone_routes, deliveries, no_fly_zones, html_filename)
-    print(f"🌐 GA Harita dosyası oluşturuldu: {output_path}\n")
+
+        a_star_results = summary_astar = None
+        if ga_seed_greedy:
+            profiler.start("greedy")
+            a_star_results, summary_astar = run_greedy()
+        seed_routes = seed_routes_from(previous_plan, a_star_results)
+
+        # 3) GA çalıştır
+        profiler.start("ga")
+        print(" Genetic Algorithm (GA) çalıştırılıyor…\n")
+        start_time_all = time.time()
+        drone_results_ga, summary_ga = genetic_algorithm(
+            deliveries,
+            drones,
+            no_fly_zones,
+            pop_size=pop_size,
+            generations=generations,
+            workers=workers,
+            mode=ga_mode,
+            matrices=matrices,
+            time_limit_s=ga_time_limit_s,
+            stall_generations=ga_stall_generations,
+            target_fitness=ga_target_fitness,
+            seed_routes=seed_routes,
+            nearest_neighbour_seed=ga_seed_nn,
+            seed_fraction=ga_seed_fraction
+        )
+        end_time_all = time.time()
+        elapsed_all = end_time_all - start_time_all
+
+        # 4) Drone sonuçlarını GA için yazdır
+        for dr in drone_results_ga:
+            d_id = dr["drone_id"]
+            route_ids = dr["best_route"]
+            fitness = dr["best_fitness"]
+            energy = dr["energy"]
+            vio = dr["violations"]
+            comp = dr["completed"]
+            t_drone = dr["time"]
+
+            print(f" Drone ID {d_id} (GA) sonuçları:")
+            print(f"   - En İyi Rota (Teslimat ID'leri): {route_ids}")
+            print(f"   - Fitness                    : {fitness:.2f}")
+            print(f"   - Enerji                     : {energy:.2f}")
+            print(f"   - İhlal                      : {vio}")
+            print(f"   - Tamamlanan                 : {comp}/{num_deliveries} ({(comp/num_deliveries)*100:.1f}%)")
+            if dr["stop_reason"] != "generations":
+                print(f"   - Erken Durma                : {dr['generations']}/{generations} nesil ({dr['stop_reason']})")
+            print(f"   - Çalışma Süresi             : {t_drone:.2f} sn\n")
+
+        # 5) Toplam GA metrikleri
+        total_deliveries = summary_ga["total_deliveries"]
+        total_completed = summary_ga["total_completed"]
+        total_energy = summary_ga["total_energy"]
+        avg_energy = summary_ga["avg_energy_per_drone"]
+        total_violations = summary_ga["total_violations"]
+        total_time = summary_ga["total_time"]
+
+        print("─" * 60)
+        print(f"{scenario_name} (GA) – TOPLAM METRİKLER")
+        print(f"  • Toplam Teslimat Sayısı      : {total_deliveries}")
+        print(f"  • Toplam Tamamlanan           : {total_completed} ({(total_completed/total_deliveries)*100:.1f}%)")
+        print(f"  • Toplam Enerji Tüketimi      : {total_energy:.2f}")
+        print(f"  • Ortalama Enerji/Drone       : {avg_energy:.2f}")
+        print(f"  • Toplam İhlal Sayısı         : {total_violations}")
+        print(f"  • Toplam GA Çalışma Süresi    : {total_time:.2f} sn")
+        print("─" * 60 + "\n")
+
+        # >>> 6) A*–Greedy hesaplamaları (her drone için; GA tohumu için zaten yapıldıysa tekrarlanmaz)
+        print(" A*–Greedy rotaları hesaplanıyor…\n")
+        if a_star_results is None:
+            profiler.start("greedy")
+            a_star_results, summary_astar = run_greedy()
+
+        # 7) A*–Greedy sonuçlarını ekrana bas
+        print("──────────── A*–Greedy Sonuçları ────────────")
+        for res in a_star_results:
+            did = res["drone_id"]
+            print(f" Drone ID {did} (A*):")
+            print(f"   - Rota (Teslimat ID'leri) : {res['route_ids']}")
+            print(f"   - Enerji                 : {res['energy']:.2f}")
+            print(f"   - İhlal                  : {res['violations']}")
+            print(f"   - Tamamlanan             : {res['completed']}/{num_deliveries} ({(res['completed']/num_deliveries)*100:.1f}%)")
+            print(f"   - Çalışma Süresi         : {res['time']:.2f} sn\n")
+
+        # 8) A*–Greedy toplam metrikler
+        total_a_completed = sum(r["completed"] for r in a_star_results)
+        total_a_energy = sum(r["energy"] for r in a_star_results)
+        total_a_viol = sum(r["violations"] for r in a_star_results)
+        total_a_time = sum(r["time"] for r in a_star_results)
+
+        print("──────────── A*–Greedy TOPLAM METRİKLER ────────────")
+        print(f"  • Toplam Tamamlanan      : {total_a_completed} ({(total_a_completed/(num_deliveries*num_drones))*100:.1f}%)")
+        print(f"  • Toplam Enerji          : {total_a_energy:.2f}")
+        print(f"  • Toplam İhlal           : {total_a_viol}")
+        print(f"  • Toplam Çalışma Süresi  : {total_a_time:.2f} sn")
+        cache_stats = summary_astar["path_cache"]
+        print(f"  • A* Yol Önbelleği        : {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} isabet "
+              f"(%{cache_stats['hit_rate'] * 100:.1f}), {cache_stats['evictions']} tahliye\n")
+
+        # 9) GA toplam metriklere özet (daha önce ekledik–tekrarlamıyoruz)
+        #    … (summary_ga zaten yazıldı)
+
+        # 10) Leaflet için GA rotalarını yaz (mevcut kod)
+        profiler.start("visualization")
+        delivery_positions = { d["id"]: d["pos"] for d in deliveries }
+        ga_drone_routes = []
+        for dr in drone_results_ga:
+            coords = [drones[dr["drone_id"] - 1]["start_pos"]]
+            for tid in dr["best_route"]:
+                coords.append(delivery_positions[tid])
+            ga_drone_routes.append(coords)
+
+        html_filename = f"{scenario_slug}_ga_routes.html"
+        output_path = generate_leaflet_html(ga_drone_routes, deliveries, no_fly_zones, html_filename)
+        print(f"🌐 GA Harita dosyası oluşturuldu: {output_path}\n")
+    finally:
+        # Hata durumunda da profil ve ölçüm yamaları kapatılır
+        profiler.stop()
+        if instrument:
+            instrumentation.disable()
+
+    # Ölçüm özeti ve faz profilleri
+    if instrument:
+        print("──────────── Ölçüm Özeti ────────────")
+        print(instrumentation.format_summary())
+        print()
+    for phase in profiler.results:
+        if phase["path"] is not None:
+            print(f" Profil ({phase['name']}): {phase['path']}")
+        else:
+            print(f"──────────── Profil: {phase['name']} ────────────")
+            print(phase["report"])
+    if profiler.results:
+        print()
 
     # 11) Eğer istersen aynı generate_leaflet_html fonksiyonuyla
     #     A* rotalarını da ayrı bir HTML’e yazdırabilirsin:
@@ -281,6 +301,9 @@ def run_scenario(
     # output_path_astar = generate_leaflet_html(a_star_drone_routes, deliveries, no_fly_zones, html_filename_astar)
     # print(f"🌐 A* Harita dosyası oluşturuldu: {output_path_astar}\n")
 
+    # Sonraki bir çalıştırmada previous_plan olarak verilebilir
+    return drone_results_ga, summary_ga
+
 
 if __name__ == "__main__":
     # ======= Senaryo 1: Sabit Veri (5 drone, 20 teslimat, 2 zone) =======
@@ -0,0 +1,76 @@
+# tests/test_delta.py
+
+import random
+
+import pytest
+
+from core.matrices import ScenarioMatrices
+from core.nofly import NoFlyZoneIndex
+from data.veriler import (
+    generate_random_deliveries,
+    generate_random_drones,
+    generate_random_no_fly_zones,
+)
+from ga.delta import DeltaEvaluator
+from ga.optimizer import crossover, fitness_function, mutate
+
+
+def _scenario(seed):
+    random.seed(seed)
+    drones = generate_random_drones(4)
+    deliveries = generate_random_deliveries(40)
+    zones = generate_random_no_fly_zones(4)
+    # Farklı aktiflik pencereleri: ihlal sayısı varış zamanına bağlı olsun
+    for i, zone in enumerate(zones):
+        zone["active_time"] = (i * 10, i * 10 + 40)
+    return drones, deliveries, NoFlyZoneIndex(zones)
+
+
+@pytest.mark.parametrize("use_matrices", [False, True])
+def test_children_match_full_evaluation(use_matrices):
+    drones, deliveries, zone_index = _scenario(7)
+    matrices = ScenarioMatrices.from_scenario(deliveries, drones) if use_matrices else None
+    ids = [d["id"] for d in deliveries]
+    rng = random.Random(1)
+
+    checked = 0
+    for drone in drones:
+        delta = DeltaEvaluator(deliveries, drone, zone_index, matrices)
+        parents = []
+        for _ in range(10):
+            route = rng.sample(ids, len(ids))
+            _, record = delta.evaluate(route)
+            parents.append((route, record))
+
+        for _ in range(5):
+            next_parents = []
+            for _ in range(10):
+                (p1, r1), (p2, r2) = rng.sample(parents, 2)
+                child = crossover(p1, p2, rng)
+                child = mutate(child, 0.1, rng, kind=rng.choice(("swap", "inversion")))
+                scores, record = delta.evaluate(child, (r1, r2))
+                assert scores == fitness_function(child, deliveries, drone, zone_index, matrices)
+                next_parents.append((child, record))
+                checked += 1
+            parents = next_parents
+    assert checked == len(drones) * 50
+
+
+def test_unchanged_and_swapped_children():
+    drones, deliveries, zone_index = _scenario(3)
+    drone = drones[0]
+    delta = DeltaEvaluator(deliveries, drone, zone_index)
+    route = [d["id"] for d in deliveries]
+    _, record = delta.evaluate(route)
+
+    # Değişmeden aktarılan elit yeniden simüle edilmez, skor aynı kalır
+    scores, _ = delta.evaluate(list(route), (record,))
+    assert scores == fitness_function(route, deliveries, drone, zone_index)
+
+    rng = random.Random(5)
+    for _ in range(20):
+        i, j = rng.sample(range(len(route)), 2)
+        child = list(route)
+        child[i], child[j] = child[j], child[i]
+        scores, _ = delta.evaluate(child, (None, record))
+        assert scores == fitness_function(child, deliveries, drone, zone_index)